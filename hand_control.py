@@ -1,51 +1,94 @@
-import cv2
-import mediapipe as mp
-import numpy as np
-import time
-import psutil
-try:
-    from pynvml import nvmlInit, nvmlDeviceGetHandleByIndex, nvmlDeviceGetUtilizationRates, nvmlDeviceGetMemoryInfo, nvmlShutdown, NVMLError
-    NVML_AVAILABLE = True
-except ImportError:
-    NVML_AVAILABLE = False
-    print("NVML not available - GPU monitoring disabled")
-
-# Update imports to use new structure
 import sys
 import os
+import time
+import argparse
+import logging
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.utils.geometry_utils import (
-    smooth_landmarks, 
-    calculate_palm_bbox_norm, 
-    is_right_hand,
-    calculate_distance
-)
-from src.utils.visualizer import (
-    draw_hand_landmarks, 
-    display_info, 
-    draw_joint_bounding_boxes, 
-    draw_fingertip_rois, 
-    draw_3axis_roi_and_graph, 
-    draw_wrist_anchor_point, 
-    draw_tilt_anchor_point, 
-    draw_enhanced_fingertip_rois
-)
-from src.performance.optimized_engine import OptimizedGestureEngine
-from src.core.gesture_state import GestureState
-from src.core.config_manager import get_system_config, get_performance_config
-from src.performance.frame_processor import get_frame_processor, should_process_frame, update_frame_stats, get_optimal_camera_resolution
+from src.performance.startup_profiler import StartupProfiler
+
+parser = argparse.ArgumentParser(description="AzimuthControl hand gesture control")
+parser.add_argument('--profile-startup', action='store_true',
+                    help='Report time spent per import and init step, up to the first gesture')
+parser.add_argument('--headless', action='store_true',
+                    help='No window or overlays; take commands from stdin/socket and report throughput')
+parser.add_argument('--command-port', type=int, help='Accept commands on this localhost TCP port')
+parser.add_argument('--record', action='store_true', help='Record the annotated session to a video file')
+parser.add_argument('--profile', action='store_true', help="Sample stacks from launch ('f' toggles at runtime)")
+parser.add_argument('--track-allocations', action='store_true',
+                    help='Attribute allocations and GC pauses to pipeline stages (tracemalloc, slow)')
+args, _ = parser.parse_known_args()
+startup = StartupProfiler(enabled=args.profile_startup)
+
+# Core imports. MediaPipe, pynvml and the Numba-compiled gesture modules are
+# deferred to the background initialization below.
+with startup.step("import cv2", kind="import"):
+    import cv2
+with startup.step("import numpy/psutil", kind="import"):
+    import numpy as np
+    import psutil
+
+with startup.step("import src modules", kind="import"):
+    from src.utils.overlay_renderer import OverlayRenderer
+    from src.utils.session_recorder import SessionRecorder
+    from src.core.hand_tracker import HandTracker
+    from src.core.clock import ReplayClock, get_clock, set_clock
+    from src.core.calibration_profile import CalibrationProfileStore, make_profile_key
+    from src.core.config_manager import get_system_config, get_performance_config
+    from src.core.command_channel import CommandChannel
+    from src.core.gesture_channel import GestureStateWriter
+    from src.core.landmark_stream import LandmarkStreamServer
+    from src.core.runtime_logging import setup_logging_from_config, shutdown_logging, get_suppressed_count
+    from src.performance.motion_gate import MotionGate
+    from src.performance.presence_monitor import PresenceMonitor
+    from src.performance.model_selector import AdaptiveHandsModel
+    from src.performance.inference_server import InferenceServer
+    from src.performance.thread_budget import get_thread_budget
+    from src.performance.throughput import ThroughputMeter
+    from src.performance.sampling_profiler import SamplingProfiler
+    from src.performance.allocation_tracker import AllocationTracker
+    from src.capture.camera_probe import get_camera_mode, CameraCapabilityCache
+    from src.capture.backends import open_camera, platform_api_preferences
+    from src.performance.frame_processor import get_frame_processor, should_process_frame, update_frame_stats, get_optimal_camera_resolution
 
 # Load configuration
 system_config = get_system_config()
 performance_config = get_performance_config()
 
+# Runtime messages go through a background log writer instead of blocking print()
+setup_logging_from_config(system_config)
+log = logging.getLogger("hand_control")
+
 # Display settings (from config)
 camera_index = system_config.get('camera_index', 0)
 window_width = system_config.get('window_width', 1280)
 window_height = system_config.get('window_height', 720)
 mirror_camera = system_config.get('mirror_camera', False)
+PRIMARY_HAND = system_config.get('primary_hand', 'Right')  # Hand whose gestures drive the HUD, channel and stream
 show_stream_info = system_config.get('show_stream_info', True)
+OVERLAY_DETAIL = system_config.get('overlay_detail', 'full')  # off, minimal, standard, full ('v' cycles)
+OVERLAY_RENDER_FPS = system_config.get('overlay_render_fps', 0)  # 0 = render every processed frame
+HEADLESS = args.headless or system_config.get('headless', False)  # No display work at all
+COMMAND_PORT = args.command_port or system_config.get('command_port')  # Localhost command socket
+RECORDING_DIR = system_config.get('recording_dir')  # Snapshots and session video (default: recordings/)
+RECORD_VIDEO = args.record or system_config.get('record_video', False)  # Annotated session video
+RECORDING_QUEUE_SIZE = system_config.get('recording_queue_size', 32)
+RECORDING_DROP_POLICY = system_config.get('recording_drop_policy', 'drop_newest')  # Never blocks the loop
+DEBUG_SNAPSHOT_FRAME = system_config.get('debug_snapshot_frame')  # Save this raw frame number once
+PROFILER_HZ = system_config.get('sampling_profiler_hz', 100)
+PROFILER_THREADS = system_config.get('sampling_profiler_threads')  # Thread names to sample (default: all)
+PROFILE_OUTPUT_DIR = system_config.get('profile_output_dir')  # Folded stacks (default: profiles/)
+TRACK_ALLOCATIONS = args.track_allocations or system_config.get('allocation_tracking', False)
+GESTURE_CHANNEL_ENABLED = system_config.get('gesture_channel_enabled', False)  # Shared-memory state for games
+GESTURE_CHANNEL_PATH = system_config.get('gesture_channel_path')  # Default: /dev/shm or the temp directory
+LANDMARK_STREAM_PORT = system_config.get('landmark_stream_port')  # UDP port for remote clients (null = off)
+LANDMARK_STREAM_HOST = system_config.get('landmark_stream_host', '127.0.0.1')
+LANDMARK_STREAM_KEYFRAME_INTERVAL = system_config.get('landmark_stream_keyframe_interval', 30)
+replay_source = system_config.get('replay_source')  # Optional video file replayed instead of the camera
+use_camera_cache = system_config.get('use_camera_capability_cache', True)
+camera_backend = system_config.get('camera_backend', 'auto')  # auto, gstreamer, msmf, dshow, v4l2, ...
+camera_buffer_size = system_config.get('camera_buffer_size', 1)
+camera_fps = system_config.get('camera_fps', 30)
 
 print("Configuration loaded:")
 print(f"  Window size: {window_width}x{window_height}")
@@ -54,8 +97,6 @@ print(f"  Mirror camera: {mirror_camera}")
 print(f"  Show stream info: {show_stream_info}")
 
 # Processing settings (separate from display)
-processing_target_width = performance_config.get('processing_target_width', 640)
-processing_target_height = performance_config.get('processing_target_height', 480)
 target_fps = performance_config.get('target_fps', 30)
 
 # MediaPipe settings
@@ -64,6 +105,45 @@ TRACKING_CONFIDENCE = performance_config.get('tracking_confidence', 0.5)
 SMOOTHING_FACTOR = performance_config.get('smoothing_factor', 3)
 FPS_SMOOTHING = performance_config.get('fps_smoothing', 0.9)
 
+# Motion gate settings (skip MediaPipe while the scene is still)
+MOTION_GATE_ENABLED = performance_config.get('motion_gate_enabled', True)
+MOTION_THRESHOLD = performance_config.get('motion_threshold', 3.0)
+MOTION_MAX_SKIP_FRAMES = performance_config.get('motion_max_skip_frames', 4)
+
+# Idle mode settings (throttle inference while no hand is present)
+IDLE_MODE_ENABLED = performance_config.get('idle_mode_enabled', True)
+IDLE_AFTER_EMPTY_FRAMES = performance_config.get('idle_after_empty_frames', 30)
+IDLE_INFERENCE_INTERVAL = performance_config.get('idle_inference_interval', 6)
+IDLE_PROCESSING_SCALE = performance_config.get('idle_processing_scale', 0.5)
+
+# Model complexity settings (switch to the lite model when over the latency budget)
+MODEL_COMPLEXITY = performance_config.get('model_complexity', 1)
+ADAPTIVE_MODEL_COMPLEXITY = performance_config.get('adaptive_model_complexity', True)
+INFERENCE_LATENCY_BUDGET_MS = performance_config.get('inference_latency_budget_ms',
+                                                     performance_config.get('max_processing_time_ms', 20))
+
+# Landmark prediction for frames without inference
+MIN_PREDICTION_CONFIDENCE = performance_config.get('min_prediction_confidence', 0.3)
+
+# Two-hand tracking: each hand gets its own engine, gesture state and calibration
+MAX_NUM_HANDS = performance_config.get('max_num_hands', 2)
+HAND_TRACK_MAX_JUMP = performance_config.get('hand_track_max_jump', 0.15)  # Normalized centre movement per frame
+HAND_TRACK_MAX_MISSED_FRAMES = performance_config.get('hand_track_max_missed_frames', 5)
+HAND_TRACK_LABEL_PATIENCE = performance_config.get('hand_track_label_patience', 1)  # Label flicker frames absorbed
+
+# Out-of-process inference: MediaPipe runs in a supervised worker fed through shared memory
+INFERENCE_PROCESS = performance_config.get('inference_process', False)
+INFERENCE_SLOTS = performance_config.get('inference_slots', 2)
+INFERENCE_TIMEOUT = performance_config.get('inference_timeout_s', 5.0)
+INFERENCE_HEARTBEAT_TIMEOUT = performance_config.get('inference_heartbeat_timeout_s', 5.0)
+INFERENCE_MAX_RESTARTS = performance_config.get('inference_max_restarts', 5)
+INFERENCE_RESTART_WINDOW = performance_config.get('inference_restart_window_s', 300.0)  # Restart budget window
+
+# One thread budget for OpenCV, Numba, MediaPipe and background workers
+thread_budget = get_thread_budget()
+thread_budget.apply()
+thread_budget.print_layout()
+
 # Colors (BGR format)
 COLORS = {
     "PALM_COLOR": (0, 100, 0),       # Dark Green
@@ -93,15 +173,86 @@ camera_index = system_config.get('camera_index', 0)
 window_width = system_config.get('window_width', 1280)
 window_height = system_config.get('window_height', 720)
 
-# Initialize enhanced frame processor - SIMPLIFIED
-frame_processor = None
-try:
-    from src.performance.frame_processor import get_frame_processor
-    frame_processor = get_frame_processor()
-    print("Enhanced frame processor loaded successfully")
-except Exception as e:
-    print(f"Frame processor disabled due to error: {e}")
-    frame_processor = None
+# Replays drive time from frame timestamps so unpaced runs are deterministic
+clock = set_clock(ReplayClock()) if replay_source else get_clock()
+
+# --- Background initialization ---
+# Model load, JIT warm-up, the C++ loader and GPU monitoring run on background
+# threads while the main thread opens and negotiates the camera
+def init_mediapipe():
+    """Import MediaPipe and build the Hands model (in-process or in the inference worker), warmed up with a blank frame."""
+    with startup.step("import mediapipe", kind="import"):
+        import mediapipe as mp
+    mp_hands = mp.solutions.hands
+
+    def create_hands(model_complexity):
+        """Create a MediaPipe Hands instance with the configured confidences."""
+        return mp_hands.Hands(
+            model_complexity=model_complexity,
+            max_num_hands=MAX_NUM_HANDS,
+            min_detection_confidence=DETECTION_CONFIDENCE,
+            min_tracking_confidence=TRACKING_CONFIDENCE)
+
+    inference_server = None
+    if INFERENCE_PROCESS:
+        # If the worker keeps dying, the server falls back to in-process Hands instead of raising
+        inference_server = InferenceServer({'max_num_hands': MAX_NUM_HANDS, 'model_complexity': MODEL_COMPLEXITY,
+                                            'min_detection_confidence': DETECTION_CONFIDENCE,
+                                            'min_tracking_confidence': TRACKING_CONFIDENCE},
+                                           INFERENCE_SLOTS, window_width, window_height, INFERENCE_TIMEOUT,
+                                           INFERENCE_HEARTBEAT_TIMEOUT, INFERENCE_MAX_RESTARTS,
+                                           restart_window=INFERENCE_RESTART_WINDOW, fallback_factory=create_hands)
+        with startup.step("inference worker start"):
+            inference_server.start()
+        # Remote handles return (label, landmarks) detections instead of MediaPipe results
+        create_hands = inference_server.model
+
+    hands_model = AdaptiveHandsModel(create_hands, INFERENCE_LATENCY_BUDGET_MS, MODEL_COMPLEXITY,
+                                     enabled=ADAPTIVE_MODEL_COMPLEXITY, clock=clock)
+    with startup.step("Hands warm-up"):
+        hands_model.warmup(np.zeros((240, 320, 3), dtype=np.uint8))
+    return mp_hands, hands_model, inference_server
+
+def init_gesture_engine():
+    """Import the Numba-compiled gesture modules and compile them before the first frame."""
+    with startup.step("import gesture engine", kind="import"):
+        from src.performance.optimized_engine import OptimizedGestureEngine
+    engine = OptimizedGestureEngine(clock=clock)
+    with startup.step("JIT warm-up"):
+        thread_budget.apply_numba()  # Numba is imported by now; keeps it off the startup path
+        engine.warmup()
+    return engine
+
+def init_frame_processor():
+    """Load the enhanced (C++) frame processor."""
+    try:
+        processor = get_frame_processor()
+        print("Enhanced frame processor loaded successfully")
+        return processor
+    except Exception as e:
+        print(f"Frame processor disabled due to error: {e}")
+        return None
+
+def init_gpu_monitoring():
+    """Initialize NVML for GPU monitoring; returns (pynvml, handle) or (None, None)."""
+    try:
+        import pynvml
+    except ImportError:
+        print("NVML not available - GPU monitoring disabled")
+        return None, None
+    try:
+        pynvml.nvmlInit()
+        handle = pynvml.nvmlDeviceGetHandleByIndex(0)  # Assuming single GPU
+        print("GPU monitoring initialized")
+        return pynvml, handle
+    except Exception as error:
+        print(f"NVML Initialization Error: {error}")
+        return None, None
+
+startup.run_in_background("mediapipe", init_mediapipe)
+startup.run_in_background("gesture engine", init_gesture_engine)
+startup.run_in_background("frame processor", init_frame_processor)
+startup.run_in_background("gpu monitoring", init_gpu_monitoring)
 
 # Configure the MediaPipe processing callback
 def mediapipe_processing_callback(frame: np.ndarray):
@@ -118,70 +269,61 @@ def mediapipe_processing_callback(frame: np.ndarray):
 
 print(f"🚀 Enhanced startup mode: Incremental resolution scaling enabled")
 
-# Initialize MediaPipe
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
-
-print(f"Initializing camera {camera_index}...")
-cap = cv2.VideoCapture(camera_index, cv2.CAP_MSMF)
-
-if not cap.isOpened():
-    print(f"Failed to open camera {camera_index}, trying camera 1...")
-    camera_index = 1
-    cap = cv2.VideoCapture(camera_index, cv2.CAP_MSMF)
+camera_start = time.perf_counter()
+camera_mode = None
+if replay_source:
+    print(f"Replaying recording {replay_source} (time driven by frame timestamps)...")
+    cap = open_camera(camera_index, window_width, window_height, camera_fps, replay_source=replay_source)
+else:
+    # Best known mode for this device: probed once, then reused from the capability cache
+    if use_camera_cache:
+        camera_mode = get_camera_mode(camera_index, window_width, window_height, platform_api_preferences()[0])
+    print(f"Initializing camera {camera_index} ({camera_backend} backend)...")
+    cap = open_camera(camera_index, window_width, window_height, camera_fps,
+                      camera_backend, camera_buffer_size, camera_mode)
+    
+    if cap is None:
+        print(f"Failed to open camera {camera_index}, trying camera 1...")
+        camera_index = 1
+        camera_mode = None
+        cap = open_camera(camera_index, window_width, window_height, camera_fps,
+                          camera_backend, camera_buffer_size)
+    
+    if cap is not None and camera_mode and (cap.mode.width, cap.mode.height) != (camera_mode['width'], camera_mode['height']):
+        print("⚠️  Cached camera mode no longer applies - it will be re-probed on next start")
+        CameraCapabilityCache().invalidate(camera_mode['identity'])
 
-if not cap.isOpened():
+if cap is None or not cap.isOpened():
     print("❌ ERROR: No camera found")
     exit(1)
 
-# Get the camera's default/native resolution first
-default_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-default_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-print(f"📺 Camera default resolution: {default_width}x{default_height}")
-
-# Try to set the desired resolution from config, but use safe fallbacks
-target_width, target_height = window_width, window_height
-print(f"Attempting to set camera resolution to: {target_width}x{target_height} (from config)")
+window_width, window_height = cap.mode.width, cap.mode.height
+print(f"✅ Camera mode: {cap.mode}")
 
-try:
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, target_width)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, target_height)
-    
-    # Verify what resolution we actually got
-    actual_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    actual_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    print(f"📺 Actual camera resolution: {actual_width}x{actual_height}")
-    
-    # Test reading a frame to make sure it works
-    ret, test_frame = cap.read()
-    if not ret or test_frame is None:
-        raise RuntimeError("Failed to read test frame")
-    
-    print(f"✅ Camera resolution test successful: {test_frame.shape}")
-    window_width, window_height = actual_width, actual_height
-    
-except Exception as e:
-    print(f"⚠️  Resolution {target_width}x{target_height} failed: {e}")
-    print(f"   Falling back to default resolution: {default_width}x{default_height}")
-    
-    # Reset to default resolution
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, default_width)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, default_height)
-    window_width, window_height = default_width, default_height
-
-# Set basic camera properties for stable operation
-print("Configuring camera properties...")
-cap.set(cv2.CAP_PROP_FPS, 30)  # Standard 30fps for better stability
-
-# Try to disable any automatic adjustments that might cause issues
-try:
-    cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.75)  # Reduce auto exposure
-    print("✅ Camera auto-exposure configured")
-except Exception as e:
-    print(f"⚠️  Some camera properties not supported: {e}")
+if not replay_source:
+    # Try to disable any automatic adjustments that might cause issues
+    try:
+        cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.75)  # Reduce auto exposure
+        print("✅ Camera auto-exposure configured")
+    except Exception as e:
+        print(f"⚠️  Some camera properties not supported: {e}")
 
 print("✅ Camera ready - using actual supported resolution")
+startup.record("camera open and negotiation", camera_start)
+
+# Join background initialization
+frame_processor = startup.result("frame processor")
+mp_hands, hands_model, inference_server = startup.result("mediapipe")
+gesture_engine = startup.result("gesture engine")
+if frame_processor:
+    # One latency signal, two controllers: resolution is cut first and restored last,
+    # the model is downgraded only on the bottom rung and upgraded before it climbs
+    hands_model.can_switch = lambda: frame_processor.governor.at_floor
+    frame_processor.governor.can_increase = lambda: hands_model.complexity >= MODEL_COMPLEXITY or not hands_model.enabled
+nvml, handle = startup.result("gpu monitoring")
+gpu_initialized = nvml is not None
+startup.shutdown()
+startup.mark("initialized")
 
 # Update display settings to match actual camera resolution
 # The C++ frame processor will handle internal downscaling for performance optimization
@@ -196,128 +338,188 @@ print(f"ℹ️  Show stream info: {show_stream_info}")
 fps = 0
 frame_count = 0
 start_time = time.time()
-landmark_history = []
-gesture_state = GestureState()
-gesture_engine = OptimizedGestureEngine()  # New optimized engine
-neutral_area = 0.0
-neutral_distances = None
-is_calibrated = False
-
-# Initialize NVML for GPU monitoring
-gpu_initialized = False
-handle = None
-if NVML_AVAILABLE:
-    try:
-        nvmlInit()
-        handle = nvmlDeviceGetHandleByIndex(0)  # Assuming single GPU
-        gpu_initialized = True
-        print("GPU monitoring initialized")
-    except Exception as error:
-        print(f"NVML Initialization Error: {error}")
-        gpu_initialized = False
-else:
-    print("NVML not available - GPU monitoring disabled")
+# One session per hand; the primary hand reuses the warmed-up engine, the other
+# shares its config, validator and C++ extension but keeps its own state
+hand_tracker = HandTracker(lambda label: gesture_engine if label == PRIMARY_HAND else gesture_engine.spawn(),
+                           SMOOTHING_FACTOR, mirror_camera, HAND_TRACK_MAX_JUMP, HAND_TRACK_MAX_MISSED_FRAMES,
+                           HAND_TRACK_LABEL_PATIENCE, clock=clock)
+primary_hand = hand_tracker.session(PRIMARY_HAND)
+
+def sample_system_load():
+    """CPU and memory load for the gesture engines, sampled once per frame."""
+    return psutil.cpu_percent(), psutil.virtual_memory().percent
+
+# Load persisted calibration profiles so gestures work from the first frame.
+# The primary hand keeps the original key; the other hand gets a suffixed one.
+profile_store = CalibrationProfileStore(system_config.get('calibration_profile_path'))
+profile_key = make_profile_key(camera_index, system_config.get('profile_user'))
+for hand in hand_tracker.load_profiles(profile_store, profile_key, PRIMARY_HAND):
+    print(f"✅ Calibration profile '{hand.profile_key}' loaded (neutral area: {hand.neutral_area:.4f}) - press 'c' to recalibrate")
+if not primary_hand.is_calibrated:
+    print(f"ℹ️  No calibration profile for '{primary_hand.profile_key}' - clench fist and press 'c' to calibrate")
 
 # --- Main Loop ---
-with mp_hands.Hands(
-    model_complexity=1,
-    min_detection_confidence=DETECTION_CONFIDENCE,
-    min_tracking_confidence=TRACKING_CONFIDENCE) as hands:
+with hands_model as hands:
 
     last_resolution_update = time.time()
+    last_gate_report = time.time()
+    last_governor_decision = 0
     processing_times = []
+    
+    motion_gate = MotionGate(MOTION_THRESHOLD, MOTION_MAX_SKIP_FRAMES) if MOTION_GATE_ENABLED else None
+    presence_monitor = PresenceMonitor(IDLE_AFTER_EMPTY_FRAMES, IDLE_INFERENCE_INTERVAL,
+                                       IDLE_PROCESSING_SCALE, clock=clock) if IDLE_MODE_ENABLED else None
+    overlay = None if HEADLESS else OverlayRenderer(COLORS, mp_hands.HAND_CONNECTIONS, OVERLAY_DETAIL, OVERLAY_RENDER_FPS)
+    # Headless runs take calibrate/quit/stats commands on stdin (and optionally a socket)
+    commands = CommandChannel(use_stdin=HEADLESS, port=COMMAND_PORT) if HEADLESS or COMMAND_PORT else None
+    throughput = ThroughputMeter()
+    # Snapshots and session video are encoded on a writer thread, dropping frames rather than blocking
+    recorder = SessionRecorder(RECORDING_DIR, RECORDING_QUEUE_SIZE, RECORDING_DROP_POLICY, camera_fps)
+    frames_read = 0
+    display_image = None
+    # Stack sampler, off unless --profile; 'f' toggles it and writes a report when stopped
+    profiler = SamplingProfiler(PROFILER_HZ, PROFILE_OUTPUT_DIR, PROFILER_THREADS)
+    if args.profile:
+        profiler.start()
+        print(f"🔥 Sampling profiler running at {PROFILER_HZ} Hz - press 'f' to stop and save")
+    # Per-stage allocation/GC instrumentation; every mark() is a no-op unless enabled
+    alloc_tracker = AllocationTracker(TRACK_ALLOCATIONS)
+    # Gesture state published every frame for other local processes (seqlock-protected mmap)
+    gesture_channel = None
+    if GESTURE_CHANNEL_ENABLED:
+        try:
+            gesture_channel = GestureStateWriter(GESTURE_CHANNEL_PATH)
+            print(f"📡 Publishing gesture state to {gesture_channel.path}")
+        except OSError as e:
+            print(f"⚠️  Gesture channel disabled: {e}")
+    # Quantized landmarks and gesture transitions over UDP for a game on another machine
+    landmark_stream = None
+    if LANDMARK_STREAM_PORT:
+        try:
+            landmark_stream = LandmarkStreamServer(LANDMARK_STREAM_HOST, LANDMARK_STREAM_PORT,
+                                                   LANDMARK_STREAM_KEYFRAME_INTERVAL)
+            print(f"📡 Streaming landmarks on udp://{LANDMARK_STREAM_HOST}:{LANDMARK_STREAM_PORT}")
+        except OSError as e:
+            print(f"⚠️  Landmark stream disabled: {e}")
+    last_inference_ms = 0.0
+    if TRACK_ALLOCATIONS:
+        print("🧮 Allocation tracking enabled (tracemalloc) - expect lower FPS, report at exit")
+    if HEADLESS:
+        print("🖥️  Headless mode: commands 'calibrate', 'stats', 'snapshot', 'profile', 'quit' on stdin"
+              + (f" or port {COMMAND_PORT}" if COMMAND_PORT else ""))
+    results = None
+    hand_roi = None  # Last hand ROI (normalized, raw camera orientation) for the motion gate
 
     while cap.isOpened():
         frame_start_time = time.time()
         
-        # Initialize status variables for each frame
-        movement_status = 'NEUTRAL'
-        action_status = 'NEUTRAL'
-        camera_status = 'NEUTRAL'
-        navigation_status = 'NEUTRAL'
-        hand_detected = False
-        hand_landmarks = None
-        
+        alloc_tracker.mark("capture")
         success, image = cap.read()
         if not success:
-            print("Ignoring empty camera frame.")
+            if replay_source:
+                print("Replay finished.")
+                break
+            log.warning("Ignoring empty camera frame.")
             continue
+        startup.mark("first frame")
+        processing_start = time.perf_counter()
+        frames_read += 1
+        
+        if replay_source:
+            frame_timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if frame_timestamp > clock.now():
+                clock.set_time(frame_timestamp)
+            else:
+                clock.advance(1.0 / target_fps)
 
         # DEBUG: Save a raw frame to check if camera itself is flipped
-        if frame_count == 30:  # Save frame 30 for debugging
-            cv2.imwrite('e:\\AzimuthControl\\debug_raw_camera.jpg', image)
-            print("DEBUG: Saved raw camera frame to debug_raw_camera.jpg")
+        if frames_read == DEBUG_SNAPSHOT_FRAME:
+            recorder.snapshot(image, "debug_raw_camera")
 
         # Prepare processing frame (always use original for MediaPipe)
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb_image)
+        alloc_tracker.mark("inference")
+        # Skip inference while nothing moves, reusing the previous results
+        run_inference = motion_gate is None or motion_gate.should_infer(image, hand_roi)
+        if presence_monitor:
+            motion_detected = motion_gate is not None and motion_gate.last_motion_score >= motion_gate.threshold
+            run_inference = presence_monitor.should_infer(run_inference, motion_detected)
         
-        # Prepare display frame - respect mirror_camera config
-        if mirror_camera:
-            display_image = cv2.flip(image, 1)  # Horizontal flip if config says so
-        else:
-            display_image = image.copy()  # No mirroring, just copy to avoid reference issues
+        if run_inference:
+            inference_start = time.perf_counter()
+            
+            # Processing resolution from the governor, further reduced while idle
+            # (aspect ratio preserved, landmarks are normalized so no remapping needed)
+            scale = presence_monitor.processing_scale if presence_monitor else 1.0
+            if frame_processor:
+                downscale, scaled_width, _ = frame_processor.should_downscale_frame(image.shape[1], image.shape[0])
+                if downscale:
+                    scale *= scaled_width / image.shape[1]
+            inference_image = image
+            if scale < 1.0:
+                inference_image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+            if inference_server:
+                # Convert straight into the worker's shared-memory frame slot
+                rgb_image = cv2.cvtColor(inference_image, cv2.COLOR_BGR2RGB,
+                                         dst=inference_server.frame_buffer(*inference_image.shape[:2]))
+            else:
+                rgb_image = cv2.cvtColor(inference_image, cv2.COLOR_BGR2RGB)
+            # Idle-mode frames (extra downscale) stay out of both latency controllers
+            measured = not (presence_monitor and presence_monitor.is_idle)
+            results = hands.process(rgb_image, measured)
+            startup.mark("first inference")
+            
+            inference_ms = (time.perf_counter() - inference_start) * 1000
+            last_inference_ms = inference_ms
+            if motion_gate:
+                motion_gate.record_inference(inference_ms)
+            if frame_processor and measured:
+                update_frame_stats(inference_ms)  # Closed-loop resolution governor
         
         # Process hand landmarks if available
-        # FIX: Account for camera mirroring - if camera is mirrored, hand detection is inverted
-        hand_detected = False
-        hand_landmarks = None
-        if results and hasattr(results, 'multi_hand_landmarks') and results.multi_hand_landmarks:
-            if mirror_camera:
-                # Camera is mirrored, so "Left" detection = actual right hand
-                for i, handedness in enumerate(results.multi_handedness):
-                    if handedness.classification[0].label == 'Left':
-                        hand_detected = True
-                        hand_landmarks = results.multi_hand_landmarks[i]
-                        break
-            else:
-                # Camera not mirrored, use normal right hand detection
-                hand_detected = is_right_hand(results.multi_handedness)
-                if hand_detected:
-                    hand_landmarks = results.multi_hand_landmarks[0]
+        alloc_tracker.mark("landmarks")
+        # Every detected hand goes to its own session (engine, gesture state, smoothing, calibration)
+        if run_inference:
+            hands_present = (hand_tracker.observe_detections(results) if inference_server
+                             else hand_tracker.observe(results))
+        else:
+            # Inference skipped: extrapolate landmarks instead of reusing stale ones
+            hands_present = hand_tracker.predict(MIN_PREDICTION_CONFIDENCE)
+        hand_roi = hand_tracker.roi()
         
-        if hand_detected and hand_landmarks:
-            current_landmarks = np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark])
-            
-            # FIX: If camera is mirrored, flip the X coordinates to match display
-            if mirror_camera:
-                for i in range(len(current_landmarks)):
-                    current_landmarks[i][0] = 1.0 - current_landmarks[i][0]  # Flip X coordinate
-            
-            smoothed_landmark_proto, landmark_history = smooth_landmarks(landmark_history, current_landmarks, SMOOTHING_FACTOR)
-            palm_bbox = calculate_palm_bbox_norm(smoothed_landmark_proto)
-
-            # IMMEDIATE calibration when 'c' is pressed with hand present  
-            # Note: key will be checked after display
-            
-            if is_calibrated:
-                # Use optimized gesture engine
-                cpu_usage = psutil.cpu_percent()
-                mem_usage = psutil.virtual_memory().percent
-                
-                gesture_results = gesture_engine.process_frame(
-                    smoothed_landmark_proto, palm_bbox, neutral_area, neutral_distances,
-                    cpu_usage, mem_usage
-                )
-                
-                movement_status = gesture_results.get('movement', 'NEUTRAL')
-                action_status = gesture_results.get('action', 'NEUTRAL')
-                camera_status = gesture_results.get('camera', 'NEUTRAL')
-                navigation_status = gesture_results.get('navigation', 'NEUTRAL')
-
-                gesture_state.update(movement_status, action_status, camera_status, navigation_status)
-                active_gesture = gesture_state.get_active_gesture()
-
-                # Drawing logic here, using display_image instead of image
-                draw_hand_landmarks(display_image, smoothed_landmark_proto, palm_bbox, mp_hands, COLORS)
-                draw_joint_bounding_boxes(display_image, smoothed_landmark_proto, mp_hands, COLORS)
-                draw_fingertip_rois(display_image, smoothed_landmark_proto, mp_hands, COLORS)
-                draw_3axis_roi_and_graph(display_image, smoothed_landmark_proto, mp_hands, COLORS)
-                draw_wrist_anchor_point(display_image, smoothed_landmark_proto, mp_hands, COLORS)
-                draw_tilt_anchor_point(display_image, smoothed_landmark_proto, palm_bbox, mp_hands, COLORS)
-                draw_enhanced_fingertip_rois(display_image, smoothed_landmark_proto, mp_hands, COLORS)
+        alloc_tracker.mark("gestures")
+        # System load is sampled once per frame and shared by both hands' engines
+        hand_tracker.process(sample_system_load)
+        if any(hand.is_calibrated for hand in hands_present):
+            startup.mark("first gesture")
+            if startup.enabled and not startup.reported:
+                startup.print_report()
+        
+        # The primary hand drives the HUD, the gesture channel and the landmark stream
+        hand_detected = primary_hand.present
+        is_calibrated = primary_hand.is_calibrated
+        statuses = primary_hand.statuses
+        palm_bbox = primary_hand.palm_bbox
+        
+        if presence_monitor:
+            presence_monitor.update(bool(hands_present), run_inference)
+        
+        if gesture_channel:
+            analog = {'fps': fps, 'inference_ms': last_inference_ms}
+            if hand_detected and palm_bbox:
+                neutral_area = primary_hand.neutral_area
+                analog.update(palm_x=palm_bbox['center_x'], palm_y=palm_bbox['center_y'],
+                              palm_width=palm_bbox['width'], palm_height=palm_bbox['height'],
+                              area_ratio=palm_bbox['width'] * palm_bbox['height'] / neutral_area if neutral_area else 0.0)
+            gesture_channel.publish(dict(statuses, active=primary_hand.active_gesture),
+                                    hand_present=hand_detected, calibrated=is_calibrated, analog=analog)
+        
+        if landmark_stream:
+            # Display-oriented landmarks, as the overlay and gesture engine see them
+            landmark_stream.publish_frame(frames_read, primary_hand.landmarks if hand_detected else None,
+                                          dict(statuses, active=primary_hand.active_gesture))
 
         # UI and Info Display
+        alloc_tracker.mark("display")
         frame_count += 1
         elapsed_time = time.time() - start_time
         if elapsed_time > 1:
@@ -328,81 +530,109 @@ with mp_hands.Hands(
 
         cpu_usage = psutil.cpu_percent()
         mem_usage = psutil.virtual_memory().percent
+        hands.update_system_load(cpu_usage)
 
-        gpu_utilization = 0
-        gpu_memory_usage = 0
-        if gpu_initialized and handle:
-            try:
-                util = nvmlDeviceGetUtilizationRates(handle)
-                gpu_utilization = util.gpu
-                mem_info = nvmlDeviceGetMemoryInfo(handle)
-                gpu_memory_usage = float(mem_info.used) / float(mem_info.total) * 100
-            except Exception as error:
-                print(f"NVML Error: {error}")
-                gpu_utilization = 0
-                gpu_memory_usage = 0
-
-        # Get C++ stream processing info
-        if show_stream_info:
-            if frame_processor:
-                processing_width, processing_height = get_optimal_camera_resolution()
-                processing_scale = frame_processor.get_scale_factor()
-                is_startup_complete = frame_processor.is_startup_complete()
-                
-                # FORCE startup completion after 90 frames (3 seconds) if it's stuck
-                if frame_count > 90:
-                    is_startup_complete = True
+        # Display runs at its own (possibly lower) rate than processing
+        if overlay and overlay.should_render():
+            # Prepare display frame - respect mirror_camera config
+            if mirror_camera:
+                display_image = cv2.flip(image, 1)  # Horizontal flip if config says so
             else:
-                processing_width, processing_height = actual_width, actual_height
-                processing_scale = 1.0
-                is_startup_complete = True
+                display_image = image.copy()  # No mirroring, just copy to avoid reference issues
             
-            stream_info = {
-                'processing_resolution': f"{processing_width}x{processing_height}",
-                'processing_scale': f"{processing_scale:.2f}x",
-                'startup_complete': is_startup_complete,
-                'display_resolution': f"{window_width}x{window_height}"
-            }
-        else:
-            stream_info = None
-
-        display_info(display_image, fps, cpu_usage, mem_usage, gpu_utilization, gpu_memory_usage, is_calibrated, neutral_area, movement_status, action_status, camera_status, navigation_status, COLORS, stream_info)
-
-        cv2.imshow('3D Control', display_image)
-        
-        # Handle key input AFTER display (better responsiveness)
-        key = cv2.waitKey(1) & 0xFF
-        
-        # Handle calibration if hand is present and 'c' is pressed
-        if (key == ord('c') and not is_calibrated and hand_detected and hand_landmarks):
+            for hand in hands_present:
+                if hand.is_calibrated:
+                    overlay.draw_hand(display_image, hand.smoothed_array, hand.palm_bbox)
+            other_hands = [(hand.label, hand.active_gesture) for hand in hands_present
+                           if hand is not primary_hand and hand.is_calibrated]
             
-            # Get hand landmarks for calibration
-            current_landmarks = np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark])
+            gpu_utilization = 0
+            gpu_memory_usage = 0
+            if gpu_initialized and handle:
+                try:
+                    util = nvml.nvmlDeviceGetUtilizationRates(handle)
+                    gpu_utilization = util.gpu
+                    mem_info = nvml.nvmlDeviceGetMemoryInfo(handle)
+                    gpu_memory_usage = float(mem_info.used) / float(mem_info.total) * 100
+                except Exception as error:
+                    log.warning("NVML Error: %s", error)
+                    gpu_utilization = 0
+                    gpu_memory_usage = 0
             
-            # FIX: If camera is mirrored, flip the X coordinates for calibration too
-            if mirror_camera:
-                for i in range(len(current_landmarks)):
-                    current_landmarks[i][0] = 1.0 - current_landmarks[i][0]  # Flip X coordinate
+            # Get C++ stream processing info
+            if show_stream_info:
+                if frame_processor:
+                    processing_width, processing_height = get_optimal_camera_resolution()
+                    processing_scale = frame_processor.get_scale_factor()
+                    is_startup_complete = frame_processor.is_startup_complete()
+                else:
+                    processing_width, processing_height = window_width, window_height
+                    processing_scale = 1.0
+                    is_startup_complete = True
+                
+                stream_info = {
+                    'processing_resolution': f"{processing_width}x{processing_height}",
+                    'processing_scale': f"{processing_scale:.2f}x",
+                    'startup_complete': is_startup_complete,
+                    'display_resolution': f"{window_width}x{window_height}"
+                }
+            else:
+                stream_info = None
             
-            cal_smoothed_landmarks, _ = smooth_landmarks(landmark_history, current_landmarks, SMOOTHING_FACTOR)
-            cal_palm_bbox = calculate_palm_bbox_norm(cal_smoothed_landmarks)
+            overlay.draw_hud(display_image,
+                             {'fps': fps, 'cpu': cpu_usage, 'mem': mem_usage,
+                              'gpu': gpu_utilization, 'gpu_mem': gpu_memory_usage},
+                             is_calibrated, statuses, stream_info, other_hands)
             
-            neutral_area = cal_palm_bbox['width'] * cal_palm_bbox['height']
-            neutral_distances = {
-                'x_dist': calculate_distance(cal_smoothed_landmarks.landmark[12].x, cal_smoothed_landmarks.landmark[12].y, cal_smoothed_landmarks.landmark[5].x, cal_smoothed_landmarks.landmark[5].y),
-                'y_dist': calculate_distance(cal_smoothed_landmarks.landmark[8].x, cal_smoothed_landmarks.landmark[8].y, cal_smoothed_landmarks.landmark[5].x, cal_smoothed_landmarks.landmark[5].y),
-                'z_dist': calculate_distance(cal_smoothed_landmarks.landmark[4].x, cal_smoothed_landmarks.landmark[4].y, cal_smoothed_landmarks.landmark[5].x, cal_smoothed_landmarks.landmark[5].y),
-                'tilt_dist': calculate_distance(cal_palm_bbox['center_x'], cal_palm_bbox['center_y'], cal_smoothed_landmarks.landmark[10].x, cal_smoothed_landmarks.landmark[10].y)
-            }
-            is_calibrated = True
-            print("*** CALIBRATION COMPLETE! ***")
+            cv2.imshow('3D Control', display_image)
+        
+        if RECORD_VIDEO:
+            # What the window shows: the last rendered overlay frame, or the raw frame when headless
+            recorder.write_frame(display_image if display_image is not None else image)
+        
+        # Handle key input AFTER display (better responsiveness); commands map onto the same keys
+        key = 0xFF
+        if not HEADLESS:
+            key = cv2.waitKey(1) & 0xFF
+        if key == 0xFF and commands:
+            key = commands.poll_key()
+        
+        # Handle (re)calibration of every hand in view when 'c' is pressed
+        if key == ord('c') and hands_present:
+            for hand in hand_tracker.calibrate(profile_store):
+                print(f"*** CALIBRATION COMPLETE ({hand.label} hand)! ***")
+                print(f"Calibration profile saved as '{hand.profile_key}'")
             print("You can now use hand gestures!")
             continue  # Skip to next frame
+        elif key == ord('c'):
+            print("⚠️  Calibration needs a detected hand - hold a fist in view and retry")
+        
+        if key == ord('v') and overlay:
+            print(f"🖼️  Overlay detail: {overlay.cycle_detail_level()}")
+        
+        if key == ord('s'):
+            print(f"📊 Throughput: {ThroughputMeter.format(throughput.total())}")
+            print(f"✋ Gesture stage: {hand_tracker.format_stats()}")
+            if inference_server:
+                print(f"🧠 Inference worker: {inference_server.format_stats()}")
+            recorder.print_stats()
+        
+        if key == ord('p'):
+            recorder.snapshot(display_image if display_image is not None else image)
+        
+        if key == ord('f'):
+            if profiler.toggle():
+                print(f"🔥 Sampling profiler started at {PROFILER_HZ} Hz - press 'f' again to stop and save")
+            else:
+                profiler.save()
+                profiler.reset()
         
         if key == ord('q'):
             break
 
         # === Enhanced Frame Processing Updates ===
+        alloc_tracker.mark("bookkeeping")
+        throughput.record(time.perf_counter() - processing_start, run_inference)
         frame_end_time = time.time()
         total_processing_time = (frame_end_time - frame_start_time) * 1000  # milliseconds
         processing_times.append(total_processing_time)
@@ -411,36 +641,40 @@ with mp_hands.Hands(
         if len(processing_times) > 30:
             processing_times.pop(0)
         
-        # Update frame processor with performance stats - TRIGGER STARTUP COMPLETION
-        if frame_processor:
-            update_frame_stats(total_processing_time)
-            
-            # AGGRESSIVE startup completion trigger - call stats update multiple times early on
-            if frame_count <= 100 and not frame_processor.is_startup_complete():
-                # Force additional stat updates with good performance times to trigger startup
-                for i in range(3):
-                    frame_processor.update_processing_stats(8.0)  # Good performance time
-            
-            # FORCE startup completion after 60 frames if it's still stuck
-            if frame_count > 60 and not frame_processor.is_startup_complete():
-                try:
-                    # Force multiple stat updates with good performance to trigger startup completion
-                    for i in range(20):
-                        frame_processor.update_processing_stats(6.0)  # Excellent performance time
-                    print("🚀 FORCED C++ startup completion after 60 frames")
-                except Exception as e:
-                    print(f"Error forcing startup completion: {e}")
-            
-            # Call optimize function to ensure the C++ processor gets proper updates
-            if frame_count % 10 == 0:  # Every 10 frames
-                frame_processor.optimize_for_system_load(cpu_usage, mem_usage)
+        # Keep the C++ processor informed about system load
+        if frame_processor and frame_count % 10 == 0:  # Every 10 frames
+            frame_processor.optimize_for_system_load(cpu_usage, mem_usage)
+        
+        # Periodic motion gate / idle mode report
+        if time.time() - last_gate_report > 5.0:
+            if motion_gate:
+                gate_stats = motion_gate.get_stats()
+                log.info("🎯 Motion gate: skip rate %.1f%% | inference %.1fms | CPU saved %.1fs",
+                         gate_stats['skip_rate'] * 100, gate_stats['avg_inference_ms'], gate_stats['cpu_saved_ms'] / 1000,
+                         extra={'report': 'motion_gate'})
+            if presence_monitor:
+                presence_stats = presence_monitor.get_stats()
+                log.info("💤 Presence: %s | idle %.0fs (%.0f%%) | idle frames skipped %d",
+                         presence_stats['state'], presence_stats['idle_time_s'], presence_stats['idle_ratio'] * 100,
+                         presence_stats['idle_frames_skipped'], extra={'report': 'presence'})
+            if HEADLESS:
+                log.info("📊 Throughput: %s", ThroughputMeter.format(throughput.window()), extra={'report': 'throughput'})
+            if alloc_tracker.enabled:
+                log.info("🧮 Allocations: %s", alloc_tracker.format_summary(), extra={'report': 'allocations'})
+            last_gate_report = time.time()
         
         # Check internal processing optimization (but NEVER change camera resolution!)
         if frame_processor and time.time() - last_resolution_update > 2.0:  # Check every 2 seconds
             current_width, current_height = get_optimal_camera_resolution()
             
             # This is ONLY for internal processing info - camera stays at full resolution!
-            print(f"🔧 C++ internal processing resolution: {current_width}x{current_height}")
+            for decision in frame_processor.get_governor_trace():
+                if decision['seq'] > last_governor_decision:
+                    latency = decision['latency_ms'] or 0.0
+                    log.info("🔧 Governor: %dx%d → %dx%d (%s, %.1fms)", decision['from'][0], decision['from'][1],
+                             decision['to'][0], decision['to'][1], decision['reason'], latency,
+                             extra={'report': 'governor'})
+                    last_governor_decision = decision['seq']
             
             # Optimize for system load
             frame_processor.optimize_for_system_load(cpu_usage, mem_usage)
@@ -449,12 +683,49 @@ with mp_hands.Hands(
             # Show startup progress - but stop showing after it's complete
             if not frame_processor.is_startup_complete():
                 progress = frame_processor.get_startup_progress() * 100
-                print(f"🚀 Startup progress: {progress:.1f}% - Internal processing: {current_width}x{current_height}")
-                print(f"📺 Display remains FULL SIZE: {window_width}x{window_height}")
+                log.info("🚀 Startup progress: %.1f%% - Internal processing: %dx%d | Display remains FULL SIZE: %dx%d",
+                         progress, current_width, current_height, window_width, window_height)
             elif frame_count == 35:  # Show completion message once
-                print(f"✅ C++ Engine READY - Processing: {current_width}x{current_height} | Display: {window_width}x{window_height}")
+                log.info("✅ C++ Engine READY - Processing: %dx%d | Display: %dx%d",
+                         current_width, current_height, window_width, window_height)
+        
+        alloc_tracker.end_frame()
+
+# Persist the background-refined calibration of each hand for the next launch
+hand_tracker.save_profiles(profile_store)
+
+print(f"📊 Session throughput: {ThroughputMeter.format(throughput.total())}")
+print(f"✋ Gesture stage: {hand_tracker.format_stats()}")
+if inference_server:
+    print(f"🧠 Inference worker: {inference_server.format_stats()}")
+    inference_server.close()
+recorder.close()
+recorder.print_stats()
+if profiler.running:
+    profiler.stop()
+    profiler.save()
+if alloc_tracker.enabled:
+    alloc_tracker.print_report()
+    alloc_tracker.stop()
+if gesture_channel:
+    gesture_channel.close()
+if landmark_stream:
+    stream_stats = landmark_stream.get_stats()
+    print(f"📡 Landmark stream: {stream_stats['datagrams']} datagrams, avg {stream_stats['avg_datagram_bytes']:.0f} B, "
+          f"{stream_stats['gesture_events']} gesture events")
+    landmark_stream.close()
+if commands:
+    commands.close()
+thread_budget.print_layout()
+if startup.enabled and not startup.reported:
+    startup.print_report()
 
 cap.release()
 if gpu_initialized:
-    nvmlShutdown()
-cv2.destroyAllWindows()
\ No newline at end of file
+    nvml.nvmlShutdown()
+if not HEADLESS:
+    cv2.destroyAllWindows()
+suppressed = get_suppressed_count()
+if suppressed:
+    log.info("🔇 %d repeated log message(s) were rate limited", suppressed)
+shutdown_logging()
\ No newline at end of file
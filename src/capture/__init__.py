@@ -0,0 +1,14 @@
+"""
+Camera capture for AzimuthControl.
+
+This module provides capture backends, camera probing and capability caching.
+"""
+
+from .backends import CaptureMode, CameraBackend, OpenCVCameraBackend, GStreamerCameraBackend, FileCameraBackend, open_camera
+from .camera_probe import probe_cameras, get_camera_mode, CameraCapabilityCache
+
+__all__ = [
+    'CaptureMode', 'CameraBackend', 'OpenCVCameraBackend', 'GStreamerCameraBackend',
+    'FileCameraBackend', 'open_camera',
+    'probe_cameras', 'get_camera_mode', 'CameraCapabilityCache'
+]
@@ -0,0 +1,261 @@
+"""
+Camera capture backends for AzimuthControl.
+
+Chooses the capture API per platform (MSMF/DirectShow on Windows, V4L2 or a
+GStreamer pipeline on Linux, AVFoundation on macOS), negotiates MJPEG vs raw
+formats and the driver buffer count for the lowest latency at the requested
+resolution, and reports which mode was actually obtained. FileCameraBackend
+replays a video file behind the same interface for replays and tests.
+
+Backends expose the subset of the cv2.VideoCapture interface used by the
+pipeline (isOpened, read, get, set, release), so they are drop-in replacements.
+"""
+
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict, Any, Tuple
+
+import cv2
+import numpy as np
+
+from .camera_probe import decode_fourcc
+
+# Raw formats saturate USB 2.0 above 640x480@30, so MJPEG is preferred there
+MJPEG_MIN_PIXELS = 640 * 480
+FORMAT_PREFERENCE = ["MJPG", "YUYV"]
+
+
+@dataclass
+class CaptureMode:
+    """Mode a backend actually obtained from the device."""
+    width: int
+    height: int
+    fps: float
+    fourcc: str
+    backend: str
+    buffer_size: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def __str__(self) -> str:
+        buffers = f", {self.buffer_size} buffer(s)" if self.buffer_size else ""
+        return f"{self.width}x{self.height} {self.fourcc or 'default'} @ {self.fps:.0f} FPS via {self.backend}{buffers}"
+
+
+def platform_api_preferences() -> List[int]:
+    """OpenCV capture APIs to try on this platform, best first."""
+    if sys.platform.startswith("win"):
+        return [cv2.CAP_MSMF, cv2.CAP_DSHOW]
+    if sys.platform.startswith("linux"):
+        return [cv2.CAP_V4L2, cv2.CAP_ANY]
+    if sys.platform == "darwin":
+        return [cv2.CAP_AVFOUNDATION]
+    return [cv2.CAP_ANY]
+
+
+def gstreamer_available() -> bool:
+    """Whether this OpenCV build can open GStreamer pipelines."""
+    for line in cv2.getBuildInformation().splitlines():
+        if "GStreamer" in line:
+            return "YES" in line
+    return False
+
+
+def format_preference(width: int, height: int) -> List[str]:
+    """FOURCCs to negotiate, in order, for a resolution."""
+    if width * height > MJPEG_MIN_PIXELS:
+        return list(FORMAT_PREFERENCE)
+    return list(reversed(FORMAT_PREFERENCE))  # Raw avoids decode cost when bandwidth allows
+
+
+class CameraBackend:
+    """Base class: wraps a cv2.VideoCapture-like object and records the obtained mode."""
+
+    name = "base"
+
+    def __init__(self):
+        self.cap = None
+        self.mode: Optional[CaptureMode] = None
+
+    def isOpened(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.cap is None:
+            return False, None
+        return self.cap.read()
+
+    def get(self, prop: int) -> float:
+        return self.cap.get(prop) if self.cap is not None else 0.0
+
+    def set(self, prop: int, value) -> bool:
+        return self.cap.set(prop, value) if self.cap is not None else False
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class OpenCVCameraBackend(CameraBackend):
+    """Device capture through an OpenCV API (MSMF, DirectShow, V4L2, AVFoundation)."""
+
+    def __init__(self, api_preference: int = cv2.CAP_ANY, buffer_size: int = 1):
+        super().__init__()
+        self.api_preference = api_preference
+        self.buffer_size = buffer_size
+        self.name = "opencv"
+
+    def open(self, index: int, width: int, height: int, fps: float = 30,
+             mode_hint: Optional[Dict[str, Any]] = None) -> bool:
+        """Open a device and negotiate format, resolution, frame rate and buffering."""
+        self.cap = cv2.VideoCapture(index, self.api_preference)
+        if not self.cap.isOpened():
+            self.release()
+            return False
+        self.name = self.cap.getBackendName()
+
+        # Fewer queued buffers means fresher frames; not every driver honors it
+        buffer_size = None
+        if self.buffer_size and self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size):
+            buffer_size = int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)) or self.buffer_size
+
+        candidates = []
+        if mode_hint:
+            candidates.append((mode_hint['width'], mode_hint['height'], mode_hint.get('fourcc')))
+        candidates += [(width, height, fourcc) for fourcc in format_preference(width, height)]
+        candidates.append((width, height, None))  # Driver default format
+
+        for cand_width, cand_height, fourcc in candidates:
+            if self._try_mode(cand_width, cand_height, fps, fourcc):
+                break
+        else:
+            # Nothing matched exactly; keep whatever the device delivers
+            if not self.cap.read()[0]:
+                self.release()
+                return False
+
+        self.mode = CaptureMode(
+            width=int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=self.cap.get(cv2.CAP_PROP_FPS) or fps,
+            fourcc=decode_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            backend=self.name,
+            buffer_size=buffer_size
+        )
+        return True
+
+    def _try_mode(self, width: int, height: int, fps: float, fourcc: Optional[str]) -> bool:
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+
+        ret, frame = self.cap.read()
+        if not ret or frame is None or frame.shape[1] != width or frame.shape[0] != height:
+            return False
+        obtained = decode_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC))
+        # Some drivers report no FOURCC at all; accept the mode if frames match
+        return fourcc is None or not obtained or obtained == fourcc
+
+
+class GStreamerCameraBackend(CameraBackend):
+    """Linux V4L2 capture through a GStreamer pipeline with a single-buffer, dropping appsink."""
+
+    name = "gstreamer"
+
+    def open(self, index: int, width: int, height: int, fps: float = 30,
+             mode_hint: Optional[Dict[str, Any]] = None) -> bool:
+        if not gstreamer_available():
+            return False
+        for fourcc in format_preference(width, height):
+            if fourcc == "MJPG":
+                caps = f"image/jpeg,width={width},height={height},framerate={int(fps)}/1 ! jpegdec"
+            else:
+                caps = f"video/x-raw,format=YUY2,width={width},height={height},framerate={int(fps)}/1"
+            pipeline = (f"v4l2src device=/dev/video{index} io-mode=2 ! {caps} ! videoconvert ! "
+                        f"video/x-raw,format=BGR ! appsink drop=true max-buffers=1 sync=false")
+            self.cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+            if self.cap.isOpened() and self.cap.read()[0]:
+                self.mode = CaptureMode(width, height, fps, fourcc, self.name, buffer_size=1)
+                return True
+            self.release()
+        return False
+
+
+class FileCameraBackend(CameraBackend):
+    """
+    File-backed fake camera. Replays a video file as if it were a device,
+    optionally paced to the file's frame rate and looped.
+    """
+
+    name = "file"
+
+    def __init__(self, path: str, paced: bool = False, loop: bool = False):
+        super().__init__()
+        self.path = path
+        self.paced = paced
+        self.loop = loop
+        self._next_frame_time = None
+
+    def open(self, index: int = 0, width: int = 0, height: int = 0, fps: float = 30,
+             mode_hint: Optional[Dict[str, Any]] = None) -> bool:
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            self.release()
+            return False
+        self.mode = CaptureMode(
+            width=int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=self.cap.get(cv2.CAP_PROP_FPS) or fps,
+            fourcc=decode_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            backend=self.name
+        )
+        return True
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        ret, frame = super().read()
+        if not ret and self.loop and self.cap is not None:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if ret and self.paced and self.mode.fps > 0:
+            now = time.perf_counter()
+            if self._next_frame_time is not None and now < self._next_frame_time:
+                time.sleep(self._next_frame_time - now)
+            self._next_frame_time = max(now, self._next_frame_time or now) + 1.0 / self.mode.fps
+        return ret, frame
+
+
+def open_camera(index: int, width: int, height: int, fps: float = 30, backend: str = "auto",
+                buffer_size: int = 1, mode_hint: Optional[Dict[str, Any]] = None,
+                replay_source: Optional[str] = None, paced: bool = False,
+                loop: bool = False) -> Optional[CameraBackend]:
+    """
+    Open a camera with the best backend for this platform.
+    backend: "auto", "gstreamer", or an OpenCV API name such as "msmf", "dshow", "v4l2".
+    replay_source: video file to replay through FileCameraBackend instead of a device.
+    """
+    if replay_source:
+        camera = FileCameraBackend(replay_source, paced=paced, loop=loop)
+        return camera if camera.open(index, width, height, fps) else None
+
+    if backend == "gstreamer" or (backend == "auto" and sys.platform.startswith("linux") and gstreamer_available()):
+        camera = GStreamerCameraBackend()
+        if camera.open(index, width, height, fps, mode_hint):
+            return camera
+        if backend == "gstreamer":
+            return None
+
+    if backend in ("auto", "gstreamer"):
+        apis = platform_api_preferences()
+    else:
+        apis = [getattr(cv2, f"CAP_{backend.upper()}", cv2.CAP_ANY)]
+
+    for api in apis:
+        camera = OpenCVCameraBackend(api, buffer_size)
+        if camera.open(index, width, height, fps, mode_hint):
+            return camera
+    return None
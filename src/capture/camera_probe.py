@@ -0,0 +1,299 @@
+"""
+Parallel camera probe with a cached capability database.
+
+Devices are probed concurrently, each on its own daemon thread with a timeout
+so a hung driver cannot stall the rest. At the timeout, probes are cancelled:
+each stops between modes and releases its capture, and the caller waits for
+that (up to release_timeout) so the device is free before it is reopened. A
+full probe measures which
+resolution/FOURCC combinations each device accepts and the frame rate it
+really delivers in that mode. Results are cached in
+config/camera_capabilities.json keyed by device identity, so startup can
+apply the best known mode directly instead of trial-and-error cap.set calls.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Iterable
+
+import cv2
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / "config" / "camera_capabilities.json"
+
+# Candidate modes tried by a full probe (the requested resolution is added on top)
+PROBE_RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+PROBE_FOURCCS = ["MJPG", "YUYV"]
+
+
+def decode_fourcc(value: float) -> str:
+    """CAP_PROP_FOURCC value -> 4-character code."""
+    code = int(value)
+    chars = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+    return chars if chars.isprintable() and code else ""
+
+
+@lru_cache(maxsize=1)
+def _device_names() -> Tuple[str, ...]:
+    """
+    Video input names in capture-index order, listed once per process.
+    Windows: DirectShow friendly names (pygrabber, if installed, else the PnP
+    camera list); macOS: system_profiler's camera list (AVFoundation order).
+    Empty when the platform or the listing is unavailable.
+    """
+    try:
+        if sys.platform == "win32":
+            try:
+                from pygrabber.dshow_graph import FilterGraph
+                return tuple(FilterGraph().get_input_devices())
+            except ImportError:
+                pass
+            output = subprocess.run(
+                ["powershell", "-NoProfile", "-Command",
+                 "Get-CimInstance Win32_PnPEntity -Filter \"PNPClass='Camera' OR PNPClass='Image'\" "
+                 "| Select-Object -ExpandProperty Name"],
+                capture_output=True, text=True, timeout=5.0).stdout
+            return tuple(line.strip() for line in output.splitlines() if line.strip())
+        if sys.platform == "darwin":
+            output = subprocess.run(["system_profiler", "-json", "SPCameraDataType"],
+                                    capture_output=True, text=True, timeout=5.0).stdout
+            return tuple(camera.get('_name', '') for camera in json.loads(output).get('SPCameraDataType', []))
+    except (OSError, subprocess.SubprocessError, ValueError, AttributeError):
+        pass
+    return ()
+
+
+def device_identity(index: int) -> str:
+    """
+    Stable identity for a camera index, so the cache follows the device rather
+    than the index. On Linux this includes the V4L2 device name and USB
+    vendor/product ids; on Windows and macOS the device's friendly name.
+    """
+    identity = f"camera{index}"
+    if sys.platform in ("win32", "darwin"):
+        names = _device_names()
+        if index < len(names) and names[index]:
+            identity += ":" + names[index]
+    elif sys.platform.startswith("linux"):
+        sysfs = Path(f"/sys/class/video4linux/video{index}")
+        try:
+            identity += ":" + (sysfs / "name").read_text().strip()
+            usb = (sysfs / "device").resolve().parent
+            vendor = (usb / "idVendor").read_text().strip()
+            product = (usb / "idProduct").read_text().strip()
+            identity += f":{vendor}:{product}"
+        except OSError:
+            pass
+    return identity
+
+
+def _measure_fps(cap, frames: int = 10, warmup: int = 3) -> Optional[float]:
+    """Frame rate actually delivered by an open capture."""
+    for _ in range(warmup):
+        if not cap.read()[0]:
+            return None
+    start = time.perf_counter()
+    for _ in range(frames):
+        if not cap.read()[0]:
+            return None
+    elapsed = time.perf_counter() - start
+    return frames / elapsed if elapsed > 0 else None
+
+
+def probe_camera(index: int, api_preference: int = cv2.CAP_ANY, full: bool = True,
+                 resolutions: Optional[Iterable[Tuple[int, int]]] = None,
+                 fourccs: Optional[Iterable[str]] = None, fps_frames: int = 10,
+                 cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """
+    Probe one device.
+    full=False only checks that it opens and delivers a frame at its default mode.
+    Setting cancel stops a full probe after the current mode; the modes measured so
+    far are returned with 'cancelled' set, and the capture is always released.
+    """
+    result = {
+        'index': index,
+        'identity': device_identity(index),
+        'available': False,
+        'default_resolution': None,
+        'modes': [],
+        'probed_at': time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+    start = time.perf_counter()
+    cap = cv2.VideoCapture(index, api_preference)
+    try:
+        if not cap.isOpened():
+            return result
+        ret, frame = cap.read()
+        result['open_ms'] = (time.perf_counter() - start) * 1000
+        if not ret or frame is None:
+            return result
+
+        result['available'] = True
+        result['backend'] = cap.getBackendName()
+        result['default_resolution'] = [frame.shape[1], frame.shape[0]]
+        result['default_fourcc'] = decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC))
+        if not full:
+            return result
+
+        seen = set()
+        for width, height in resolutions or PROBE_RESOLUTIONS:
+            for fourcc in fourccs or PROBE_FOURCCS:
+                if cancel is not None and cancel.is_set():
+                    result['cancelled'] = True
+                    return result
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                actual = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                          int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                          decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)) or fourcc)
+                if actual in seen:
+                    continue
+                seen.add(actual)
+                fps = _measure_fps(cap, fps_frames)
+                if fps is not None:
+                    result['modes'].append({'width': actual[0], 'height': actual[1],
+                                            'fourcc': actual[2], 'fps': round(fps, 1)})
+    except cv2.error as e:
+        result['error'] = str(e)
+    finally:
+        cap.release()
+    return result
+
+
+def probe_cameras(indices: Iterable[int] = range(10), timeout: float = 5.0,
+                  api_preference: int = cv2.CAP_ANY, full: bool = False,
+                  resolutions: Optional[Iterable[Tuple[int, int]]] = None,
+                  release_timeout: float = 2.0) -> List[Dict[str, Any]]:
+    """
+    Probe devices concurrently. Probes that do not finish within timeout are
+    cancelled and given release_timeout to release their capture; they are
+    reported as timed out (with any modes measured before the cancel). Only a
+    probe stuck inside the driver is abandoned, still holding its device.
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    resolutions = list(resolutions) if resolutions else None
+    cancel = threading.Event()
+
+    def worker(index):
+        results[index] = probe_camera(index, api_preference, full, resolutions, cancel=cancel)
+
+    threads = []
+    for index in indices:
+        thread = threading.Thread(target=worker, args=(index,), name=f"CameraProbe{index}", daemon=True)
+        thread.start()
+        threads.append((index, thread))
+
+    deadline = time.perf_counter() + timeout
+    for _, thread in threads:
+        thread.join(max(0.0, deadline - time.perf_counter()))
+    if any(thread.is_alive() for _, thread in threads):
+        cancel.set()
+        deadline = time.perf_counter() + release_timeout
+        for _, thread in threads:
+            thread.join(max(0.0, deadline - time.perf_counter()))
+
+    probed = []
+    for index, thread in threads:
+        if thread.is_alive():
+            print(f"⚠️  Camera {index} probe is stuck in the driver and may still hold the device")
+            probed.append({'index': index, 'identity': device_identity(index),
+                           'available': False, 'timed_out': True, 'modes': []})
+        else:
+            result = results[index]
+            if result.get('cancelled'):
+                result['timed_out'] = True
+            probed.append(result)
+    return probed
+
+
+def select_best_mode(modes: List[Dict[str, Any]], width: int, height: int,
+                     min_fps: float = 0.0) -> Optional[Dict[str, Any]]:
+    """
+    Best mode for a requested resolution: exact match first, otherwise the
+    closest resolution; among equals, the highest delivered frame rate.
+    """
+    candidates = [m for m in modes if m.get('fps', 0) >= min_fps] or modes
+    if not candidates:
+        return None
+    return min(candidates, key=lambda m: (abs(m['width'] * m['height'] - width * height), -m.get('fps', 0)))
+
+
+class CameraCapabilityCache:
+    """JSON file of probe results keyed by device identity."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self._devices: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load_all(self) -> Dict[str, Dict[str, Any]]:
+        if self._devices is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self._devices = json.load(f).get('devices', {})
+            except FileNotFoundError:
+                self._devices = {}
+            except (json.JSONDecodeError, AttributeError) as e:
+                print(f"⚠️  Ignoring unreadable camera capabilities in {self.path}: {e}")
+                self._devices = {}
+        return self._devices
+
+    def get(self, identity: str) -> Optional[Dict[str, Any]]:
+        return self._load_all().get(identity)
+
+    def put(self, result: Dict[str, Any]) -> bool:
+        """Store a probe result. Returns True on success."""
+        self._load_all()[result['identity']] = result
+        return self._save()
+
+    def invalidate(self, identity: str) -> bool:
+        """Forget a device, e.g. when its cached mode no longer applies."""
+        if self._load_all().pop(identity, None) is None:
+            return False
+        return self._save()
+
+    def _save(self) -> bool:
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({'devices': self._load_all()}, f, indent=2)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            print(f"⚠️  Could not save camera capabilities: {e}")
+            return False
+
+
+def get_camera_mode(index: int, width: int, height: int, api_preference: int = cv2.CAP_ANY,
+                    cache: Optional[CameraCapabilityCache] = None, timeout: float = 5.0,
+                    reprobe: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Best known mode for a device at the requested resolution. Uses the cache
+    when the device has been probed before, otherwise runs a full probe of
+    that one device (once) and caches the result.
+    """
+    cache = cache or CameraCapabilityCache()
+    identity = device_identity(index)
+    entry = None if reprobe else cache.get(identity)
+
+    if not entry or not entry.get('modes'):
+        print(f"🔍 Probing camera {index} capabilities (cached for next start)...")
+        resolutions = [(width, height)] + [r for r in PROBE_RESOLUTIONS if r != (width, height)]
+        entry = probe_cameras([index], timeout, api_preference, full=True, resolutions=resolutions)[0]
+        if not entry.get('available'):
+            return None
+        if not entry.get('timed_out'):
+            cache.put(entry)  # A partial probe is used for this start only and re-run next time
+
+    mode = select_best_mode(entry['modes'], width, height)
+    if mode:
+        mode = dict(mode, identity=identity)
+    return mode
+
@@ -15,7 +15,7 @@ Gaming Requirements:
 - Priority: Navigation > Camera > Movement > Action
 """
 
-import time
+from ..core.clock import get_clock
 from ..core.gesture_definitions import get_fixed_gesture_definitions
 from ..core.config_manager import get_controls_config
 
@@ -44,7 +44,9 @@ class ActionControlEngine:
     - Gaming-specific latency optimization
     """
     
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else get_clock()
+        
         # Load configuration
         self.config = get_controls_config().get("ActionControl", {})
         self.enabled = self.config.get("enabled", True)
@@ -64,7 +66,7 @@ class ActionControlEngine:
         # Check if action control is enabled
         if not self.enabled:
             return "NEUTRAL"
-        current_time = time.time() * 1000  # Convert to milliseconds
+        current_time = self.clock.now() * 1000  # Convert to milliseconds
         
         # Get gesture definitions
         action_definitions = get_fixed_gesture_definitions()["ActionControl"]
@@ -1,7 +1,12 @@
 from ..core.gesture_definitions import get_fixed_gesture_definitions
 from ..core.config_manager import get_controls_config
+from ..core.calibration_profile import CalibrationProfile, StreamingCalibrator, hand_scale_from_array
+from ..utils.streaming_stats import RollingMean
+import logging
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 class MovementController:
     """
     Enhanced movement controller with depth-based forward/backward detection
@@ -19,12 +24,12 @@ class MovementController:
             for gesture in self.config["gestures"]:
                 self.enabled_gestures[gesture["name"]] = gesture.get("enabled", True)
         
-        # Calibration for depth-based movement detection
+        # Calibration for depth-based movement detection (streaming, no sample buffer)
         self.neutral_area = None
-        self.calibration_samples = []
         self.calibration_complete = False
         self.sample_count = 0
-        self.required_samples = 30  # Samples needed for calibration
+        self.required_samples = 5  # Samples before the streaming estimate is trusted
+        self.calibrator = StreamingCalibrator(min_samples=self.required_samples)
         
         # Depth detection thresholds (author-calibrated)
         self.forward_threshold = 1.15   # 15% larger area = forward
@@ -32,46 +37,69 @@ class MovementController:
         self.deadzone_multiplier = 0.05 # 5% deadzone around neutral
         
         # Smoothing for area calculations
-        self.area_history = []
         self.history_size = 5
+        self.area_history = RollingMean(self.history_size)
         
         # State tracking for hysteresis deadzone
         self.last_movement_state = "NEUTRAL"
         
-    def calibrate_neutral_area(self, palm_bbox):
+    def calibrate_neutral_area(self, palm_bbox, hand_scale=None):
         """
-        Calibrate the neutral palm area by sampling during rest position.
-        Call this when hand is in neutral position for stable calibration.
+        Fold a rest-position sample into the streaming neutral area estimate.
+        The estimate is usable after a few samples and keeps refining afterwards.
         """
         current_area = palm_bbox['width'] * palm_bbox['height']
         
         # Only accept reasonable palm areas for calibration
         if 0.01 < current_area < 0.5:  # Reasonable palm area range
-            self.calibration_samples.append(current_area)
+            self.calibrator.observe(current_area, hand_scale=hand_scale)
             self.sample_count += 1
+            self.neutral_area = self.calibrator.profile.neutral_area
             
-            if self.sample_count >= self.required_samples:
-                # Calculate neutral area as median of samples (more robust than mean)
-                self.neutral_area = np.median(self.calibration_samples)
+            if not self.calibration_complete and self.calibrator.is_ready:
                 self.calibration_complete = True
-                print(f"Movement calibration complete! Neutral area: {self.neutral_area:.4f}")
+                logger.info("Movement calibration complete, neutral area: %.4f", self.neutral_area)
                 return True
         
-        return False
+        return self.calibration_complete
+    
+    def apply_profile(self, profile: CalibrationProfile):
+        """Start from a persisted calibration profile; refinement continues in the background."""
+        self.calibrator = StreamingCalibrator(profile, min_samples=self.required_samples)
+        self.neutral_area = profile.neutral_area
+        self.sample_count = profile.sample_count
+        self.calibration_complete = profile.is_valid
+        self.area_history.reset()
+        self.last_movement_state = "NEUTRAL"
+    
+    def get_profile(self) -> CalibrationProfile:
+        """Get the current (refined) calibration profile."""
+        return self.calibrator.profile
+    
+    def _is_near_neutral_area(self, palm_bbox, hand_scale=None):
+        """
+        True when the palm sits at the neutral depth, safe for refinement. With a
+        reference hand size the check uses the hand-size ratio squared (an area
+        ratio that does not depend on the estimate being refined); otherwise the
+        palm area ratio.
+        """
+        if self.neutral_area is None or self.last_movement_state != "NEUTRAL":
+            return False
+        scale_ratio = self.calibrator.profile.scale_ratio(hand_scale)
+        if scale_ratio is not None:
+            area_ratio = scale_ratio * scale_ratio
+        else:
+            area_ratio = (palm_bbox['width'] * palm_bbox['height']) / self.neutral_area
+        return abs(area_ratio - 1.0) <= self.deadzone_multiplier
     
-    def get_smoothed_area(self, palm_bbox):
-        """Get smoothed palm area using rolling average."""
+    def get_smoothed_area(self, palm_bbox, predicted=False):
+        """Get smoothed palm area using rolling average (predicted frames are not stored)."""
         current_area = palm_bbox['width'] * palm_bbox['height']
-        
-        # Add to history
-        self.area_history.append(current_area)
-        if len(self.area_history) > self.history_size:
-            self.area_history.pop(0)
-        
-        # Return smoothed area
-        return np.mean(self.area_history)
+        if predicted:
+            return self.area_history.peek(current_area)
+        return self.area_history.update(current_area)
     
-    def detect_depth_movement(self, palm_bbox):
+    def detect_depth_movement(self, palm_bbox, predicted=False):
         """
         Detect forward/backward movement based on PBB size changes.
         Returns: 'FORWARD', 'BACKWARD', or 'NEUTRAL'
@@ -84,7 +112,7 @@ class MovementController:
         if not self.calibration_complete or self.neutral_area is None:
             return 'NEUTRAL'
         
-        smoothed_area = self.get_smoothed_area(palm_bbox)
+        smoothed_area = self.get_smoothed_area(palm_bbox, predicted)
         area_ratio = smoothed_area / self.neutral_area
         
         # Calculate hysteresis thresholds
@@ -147,7 +175,7 @@ class MovementController:
             return (palm_bbox['min_x'] <= tip_x <= palm_bbox['max_x'] and
                     palm_bbox['min_y'] <= tip_y <= palm_bbox['max_y'])
         except (IndexError, KeyError) as e:
-            print(f"Error checking ring finger position: {e}")
+            logger.warning("Error checking ring finger position: %s", e)
             return False
     
     def is_gesture_enabled(self, gesture_name):
@@ -156,11 +184,12 @@ class MovementController:
             return False
         return self.enabled_gestures.get(gesture_name, True)
     
-    def determine_movement_status(self, landmarks, palm_bbox):
+    def determine_movement_status(self, landmarks, palm_bbox, predicted=False):
         """
         Determines the movement status with enhanced depth detection.
         Handles both MediaPipe landmark objects and numpy arrays.
         Respects config-based gesture enabling/disabling.
+        Predicted (extrapolated) landmarks never refine the calibration.
         """
         try:
             # Check if movement control is enabled
@@ -175,18 +204,20 @@ class MovementController:
                 # Already numpy array format
                 landmarks_array = landmarks
             else:
-                print(f"Error: Unknown landmarks format: {type(landmarks)}")
+                logger.warning("Unknown landmarks format: %s", type(landmarks))
                 return "NEUTRAL"
             
-            # Check if we need calibration (when hand appears to be in neutral position)
-            if not self.calibration_complete:
-                # Attempt calibration if ring finger is in palm (neutral indicator)
-                if self.is_ring_finger_in_palm_numpy(landmarks_array, palm_bbox):
-                    self.calibrate_neutral_area(palm_bbox)
+            # Calibrate / refine when hand appears to be in neutral position
+            # (ring finger in palm). Once calibrated, only refine inside the
+            # neutral deadzone so forward/backward poses don't drag the estimate.
+            if not predicted and self.is_ring_finger_in_palm_numpy(landmarks_array, palm_bbox):
+                hand_scale = hand_scale_from_array(landmarks_array)
+                if not self.calibration_complete or self._is_near_neutral_area(palm_bbox, hand_scale):
+                    self.calibrate_neutral_area(palm_bbox, hand_scale)
             
             # Get depth-based movement first (if enabled)
             if self.is_gesture_enabled("FORWARD") or self.is_gesture_enabled("BACKWARD"):
-                depth_movement = self.detect_depth_movement(palm_bbox)
+                depth_movement = self.detect_depth_movement(palm_bbox, predicted)
                 
                 # For FORWARD/BACKWARD, use our depth detection
                 if depth_movement == "FORWARD" and self.is_gesture_enabled("FORWARD"):
@@ -216,7 +247,7 @@ class MovementController:
             return "NEUTRAL"
             
         except Exception as e:
-            print(f"Error processing movement: {e}")
+            logger.warning("Error processing movement: %s", e)
             return "NEUTRAL"
     
     def _check_thumb_extended_numpy(self, landmarks_array, palm_bbox):
@@ -291,16 +322,20 @@ class MovementController:
         except (IndexError, KeyError):
             return False
 
-# Global controller instance
-_movement_controller = MovementController()
+# Default controller for the legacy function interface and the diagnostics.
+# Created on first use; gesture engines and sessions own their own controllers.
+_movement_controller = None
 
 def determine_movement_status(landmarks, palm_bbox):
     """
     Legacy interface for compatibility.
     Uses enhanced movement controller with depth detection.
     """
-    return _movement_controller.determine_movement_status(landmarks, palm_bbox)
+    return get_movement_controller().determine_movement_status(landmarks, palm_bbox)
 
 def get_movement_controller():
-    """Get the movement controller instance for manual calibration."""
+    """Get the default movement controller instance for manual calibration."""
+    global _movement_controller
+    if _movement_controller is None:
+        _movement_controller = MovementController()
     return _movement_controller
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Persistent calibration profiles for AzimuthControl.
+
+A calibration profile holds the neutral palm area, the neutral finger
+distances and the reference hand size measured for one user on one camera.
+Profiles are stored in a small JSON file so the engine can start from a known
+calibration on the first frame, and are refined while running by a streaming
+estimator instead of a blocking sample phase.
+"""
+
+import getpass
+import json
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..utils.geometry_utils import HandLandmark, calculate_distance
+from ..utils.streaming_stats import ewma_weight
+
+# Default profile store lives next to controls.json
+DEFAULT_PROFILE_PATH = Path(__file__).parent.parent.parent / "config" / "calibration_profiles.json"
+
+def make_profile_key(camera_index: int = 0, user: Optional[str] = None) -> str:
+    """Build the profile key for a user/camera pair."""
+    if not user:
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = "default"
+    return f"{user}@camera{camera_index}"
+
+
+def measure_hand_scale(landmarks) -> float:
+    """Reference hand size: wrist to middle finger MCP distance (normalized coords)."""
+    wrist = landmarks.landmark[HandLandmark.WRIST]
+    middle_mcp = landmarks.landmark[HandLandmark.MIDDLE_FINGER_MCP]
+    return calculate_distance(wrist.x, wrist.y, middle_mcp.x, middle_mcp.y)
+
+
+def hand_scale_from_array(landmarks_array) -> float:
+    """measure_hand_scale for a (21, 2+) numpy array of normalized landmarks."""
+    wrist = landmarks_array[HandLandmark.WRIST]
+    middle_mcp = landmarks_array[HandLandmark.MIDDLE_FINGER_MCP]
+    return calculate_distance(wrist[0], wrist[1], middle_mcp[0], middle_mcp[1])
+
+
+def measure_calibration(landmarks, palm_bbox) -> Dict[str, Any]:
+    """
+    Take one calibration measurement from smoothed landmarks.
+    Returns a dict with neutral_area, neutral_distances and hand_scale.
+    """
+    lm = landmarks.landmark
+    return {
+        'neutral_area': palm_bbox['width'] * palm_bbox['height'],
+        'neutral_distances': {
+            'x_dist': calculate_distance(lm[12].x, lm[12].y, lm[5].x, lm[5].y),
+            'y_dist': calculate_distance(lm[8].x, lm[8].y, lm[5].x, lm[5].y),
+            'z_dist': calculate_distance(lm[4].x, lm[4].y, lm[5].x, lm[5].y),
+            'tilt_dist': calculate_distance(palm_bbox['center_x'], palm_bbox['center_y'], lm[10].x, lm[10].y)
+        },
+        'hand_scale': measure_hand_scale(landmarks)
+    }
+
+
+@dataclass
+class CalibrationProfile:
+    """Calibration values for one user/camera pair."""
+    neutral_area: float = 0.0
+    neutral_distances: Dict[str, float] = field(default_factory=dict)
+    hand_scale: float = 0.0
+    sample_count: int = 0
+    updated_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CalibrationProfile':
+        return cls(
+            neutral_area=float(data.get('neutral_area', 0.0)),
+            neutral_distances={k: float(v) for k, v in data.get('neutral_distances', {}).items()},
+            hand_scale=float(data.get('hand_scale', 0.0)),
+            sample_count=int(data.get('sample_count', 0)),
+            updated_at=float(data.get('updated_at', 0.0))
+        )
+
+    @classmethod
+    def from_measurement(cls, measurement: Dict[str, Any]) -> 'CalibrationProfile':
+        return cls(
+            neutral_area=measurement['neutral_area'],
+            neutral_distances=dict(measurement.get('neutral_distances') or {}),
+            hand_scale=measurement.get('hand_scale') or 0.0,
+            sample_count=1,
+            updated_at=time.time()
+        )
+
+    @property
+    def is_valid(self) -> bool:
+        """A profile is usable once it has a plausible neutral palm area."""
+        return 0.01 < self.neutral_area < 0.5
+
+    def scale_ratio(self, hand_scale: Optional[float]) -> Optional[float]:
+        """Current hand size relative to the reference hand size, or None if either is unknown."""
+        if not hand_scale or self.hand_scale <= 0:
+            return None
+        return hand_scale / self.hand_scale
+
+    def distances_at_scale(self, hand_scale: Optional[float]) -> Dict[str, float]:
+        """Neutral distances rescaled to the current hand size, so distance thresholds follow depth."""
+        ratio = self.scale_ratio(hand_scale)
+        if ratio is None:
+            return dict(self.neutral_distances)
+        return {k: v * ratio for k, v in self.neutral_distances.items()}
+
+
+class CalibrationProfileStore:
+    """JSON file of calibration profiles keyed by user/camera."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else DEFAULT_PROFILE_PATH
+        self._profiles: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load_all(self) -> Dict[str, Dict[str, Any]]:
+        if self._profiles is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self._profiles = json.load(f).get('profiles', {})
+            except FileNotFoundError:
+                self._profiles = {}
+            except (json.JSONDecodeError, AttributeError) as e:
+                print(f"⚠️  Ignoring unreadable calibration profiles in {self.path}: {e}")
+                self._profiles = {}
+        return self._profiles
+
+    def load(self, key: str) -> Optional[CalibrationProfile]:
+        """Load a profile, or None if missing or implausible."""
+        data = self._load_all().get(key)
+        if not data:
+            return None
+        profile = CalibrationProfile.from_dict(data)
+        return profile if profile.is_valid else None
+
+    def save(self, key: str, profile: CalibrationProfile) -> bool:
+        """Persist a profile atomically. Returns True on success."""
+        profiles = self._load_all()
+        profiles[key] = profile.to_dict()
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({'profiles': profiles}, f, indent=2)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            print(f"⚠️  Could not save calibration profile '{key}': {e}")
+            return False
+
+
+class StreamingCalibrator:
+    """
+    Incremental calibration estimator.
+
+    Uses a cumulative mean for the first samples (so a fresh calibration is
+    usable after a handful of frames) and an exponentially weighted mean
+    afterwards so a loaded profile slowly tracks lighting, posture and camera
+    placement drift without ever storing samples.
+    """
+
+    def __init__(self, profile: Optional[CalibrationProfile] = None,
+                 alpha: float = 0.02, min_samples: int = 5):
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.profile = profile if profile is not None else CalibrationProfile()
+        self.samples_since_save = 0  # Refinements not yet persisted
+
+    @property
+    def is_ready(self) -> bool:
+        return self.profile.sample_count >= self.min_samples and self.profile.is_valid
+
+    def _blend(self, current: float, sample: float) -> float:
+        return current + ewma_weight(self.profile.sample_count, self.alpha) * (sample - current)
+
+    def observe(self, neutral_area: float, neutral_distances: Optional[Dict[str, float]] = None,
+                hand_scale: Optional[float] = None) -> CalibrationProfile:
+        """Fold one neutral-pose measurement into the profile."""
+        profile = self.profile
+        profile.sample_count += 1
+        profile.neutral_area = self._blend(profile.neutral_area, neutral_area)
+        if hand_scale:
+            profile.hand_scale = self._blend(profile.hand_scale, hand_scale) if profile.hand_scale else hand_scale
+        if neutral_distances:
+            for key, value in neutral_distances.items():
+                current = profile.neutral_distances.get(key)
+                profile.neutral_distances[key] = value if current is None else self._blend(current, value)
+        profile.updated_at = time.time()
+        self.samples_since_save += 1
+        return profile
+
+    @property
+    def has_unsaved_samples(self) -> bool:
+        return self.samples_since_save > 0
+
+    def mark_saved(self):
+        self.samples_since_save = 0
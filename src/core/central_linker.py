@@ -3,8 +3,11 @@ Fixed CentralLinker with consistent status checking and proper gesture routing.
 """
 
 import json
+import logging
 from .gesture_determinator import OrderedGestureDeterminator
 
+logger = logging.getLogger(__name__)
+
 class FixedCentralLinker:
     """
     Enhanced CentralLinker that properly implements README specifications
@@ -55,7 +58,7 @@ class FixedCentralLinker:
             with open(path, 'r') as f:
                 return json.load(f)
         except Exception as e:
-            print(f"Warning: Could not load gesture definitions from {path}: {e}")
+            logger.warning("Could not load gesture definitions from %s: %s", path, e)
             return None
     
     def process_gestures_enhanced(self, landmarks, palm_bbox, neutral_area=None, neutral_distances=None):
@@ -86,25 +89,25 @@ class FixedCentralLinker:
         
         # Navigation Control (Highest Priority)
         if navigation_status != "NEUTRAL":  # Fixed: was "NONE"
-            print(f"Navigation Gesture Detected: {navigation_status}")
+            logger.info("Navigation Gesture Detected: %s", navigation_status, extra={'gesture': navigation_status})
             self._execute_gesture_action("NAVIGATION", navigation_status)
             return
         
         # Camera Control
         if camera_status != "NEUTRAL":  # Fixed: was "NONE"
-            print(f"Camera Gesture Detected: {camera_status}")
+            logger.info("Camera Gesture Detected: %s", camera_status, extra={'gesture': camera_status})
             self._execute_gesture_action("CAMERA", camera_status)
             return
         
         # Movement Control
         if movement_status != "NEUTRAL":
-            print(f"Movement Gesture Detected: {movement_status}")
+            logger.info("Movement Gesture Detected: %s", movement_status, extra={'gesture': movement_status})
             self._execute_gesture_action("MOVEMENT", movement_status)
             return
         
         # Action Control (Lowest Priority)
         if action_status != "NEUTRAL":  # Fixed: was "NONE"
-            print(f"Action Gesture Detected: {action_status}")
+            logger.info("Action Gesture Detected: %s", action_status, extra={'gesture': action_status})
             self._execute_gesture_action("ACTION", action_status)
     
     def _execute_gesture_action(self, gesture_type, gesture_name):
@@ -116,88 +119,88 @@ class FixedCentralLinker:
             try:
                 handler()
             except Exception as e:
-                print(f"Error executing {gesture_type}:{gesture_name} - {e}")
+                logger.exception("Error executing %s:%s - %s", gesture_type, gesture_name, e)
         else:
-            print(f"No handler found for {gesture_type}:{gesture_name}")
+            logger.warning("No handler found for %s:%s", gesture_type, gesture_name)
     
     # Action Control Handlers
     def _handle_attack(self):
-        print("ACTION: Attack/LMB triggered")
+        logger.info("ACTION: Attack/LMB triggered")
         # TODO: Implement actual game input (mouse click, keyboard, etc.)
     
     def _handle_skill_1(self):
-        print("ACTION: Skill 1/Key E triggered")
+        logger.info("ACTION: Skill 1/Key E triggered")
         # TODO: Implement skill 1 activation
     
     def _handle_skill_2(self):
-        print("ACTION: Skill 2/Key R triggered")
+        logger.info("ACTION: Skill 2/Key R triggered")
         # TODO: Implement skill 2 activation
     
     def _handle_skill_3(self):
-        print("ACTION: Skill 3/Key Q triggered")
+        logger.info("ACTION: Skill 3/Key Q triggered")
         # TODO: Implement skill 3 activation
     
     def _handle_utility(self):
-        print("ACTION: Utility/Key T triggered")
+        logger.info("ACTION: Utility/Key T triggered")
         # TODO: Implement utility activation
     
     # Movement Control Handlers
     def _handle_move_forward(self):
-        print("MOVEMENT: Forward/W triggered")
+        logger.info("MOVEMENT: Forward/W triggered")
         # TODO: Implement forward movement
     
     def _handle_move_backward(self):
-        print("MOVEMENT: Backward/S triggered")
+        logger.info("MOVEMENT: Backward/S triggered")
         # TODO: Implement backward movement
     
     def _handle_move_left(self):
-        print("MOVEMENT: Left/A triggered")
+        logger.info("MOVEMENT: Left/A triggered")
         # TODO: Implement left movement
     
     def _handle_move_right(self):
-        print("MOVEMENT: Right/D triggered")
+        logger.info("MOVEMENT: Right/D triggered")
         # TODO: Implement right movement
     
     def _handle_shift(self):
-        print("MOVEMENT: Shift/Sprint/Crouch triggered")
+        logger.info("MOVEMENT: Shift/Sprint/Crouch triggered")
         # TODO: Implement shift functionality
     
     def _handle_jump(self):
-        print("MOVEMENT: Jump/Space triggered")
+        logger.info("MOVEMENT: Jump/Space triggered")
         # TODO: Implement jump functionality
     
     # Camera Control Handlers
     def _handle_camera_pan_up(self):
-        print("CAMERA: Pan Up triggered")
+        logger.info("CAMERA: Pan Up triggered")
         # TODO: Implement camera pan up
     
     def _handle_camera_pan_down(self):
-        print("CAMERA: Pan Down triggered")
+        logger.info("CAMERA: Pan Down triggered")
         # TODO: Implement camera pan down
     
     def _handle_camera_pan_left(self):
-        print("CAMERA: Pan Left triggered")
+        logger.info("CAMERA: Pan Left triggered")
         # TODO: Implement camera pan left
     
     def _handle_camera_pan_right(self):
-        print("CAMERA: Pan Right triggered")
+        logger.info("CAMERA: Pan Right triggered")
         # TODO: Implement camera pan right
     
     def _handle_camera_lock(self):
-        print("CAMERA: Lock/Middle Click triggered")
+        logger.info("CAMERA: Lock/Middle Click triggered")
         # TODO: Implement camera lock
     
     # Navigation Control Handlers
     def _handle_navigation_ok(self):
-        print("NAVIGATION: OK/Confirmation/Enter triggered")
+        logger.info("NAVIGATION: OK/Confirmation/Enter triggered")
         # TODO: Implement confirmation action
     
     def _handle_navigation_f(self):
-        print("NAVIGATION: F/Interact triggered")
+        logger.info("NAVIGATION: F/Interact triggered")
         # TODO: Implement interaction
     
     def _handle_navigation_esc(self):
-        print("NAVIGATION: ESC/Cancel triggered")
+        logger.info("NAVIGATION: ESC/Cancel triggered")
         # TODO: Implement cancel/escape action
     
     def get_gesture_status_summary(self, landmarks, palm_bbox, neutral_area=None, neutral_distances=None):
@@ -0,0 +1,62 @@
+"""
+Clock abstraction for AzimuthControl.
+
+Time-dependent components (gesture hold/re-engagement timing, frame
+throttling, anti-spam cooldowns, gesture cache expiry) read time from a clock
+object instead of calling time.time() directly. Live runs use SystemClock;
+replays use ReplayClock driven by frame timestamps, so a recording processed
+faster than real time produces the same gestures as when it was captured.
+"""
+
+import time
+
+
+class SystemClock:
+    """Wall-clock time in seconds."""
+
+    def now(self) -> float:
+        return time.time()
+
+    @property
+    def is_replay(self) -> bool:
+        return False
+
+
+class ReplayClock:
+    """Clock driven explicitly by the caller (e.g. from recorded frame timestamps)."""
+
+    def __init__(self, start_time: float = 0.0):
+        self._now = start_time
+
+    def now(self) -> float:
+        return self._now
+
+    def set_time(self, timestamp: float):
+        """Move the clock to a frame timestamp (never backwards)."""
+        if timestamp > self._now:
+            self._now = timestamp
+
+    def advance(self, seconds: float):
+        """Advance the clock by a fixed step (e.g. 1/fps for unstamped frames)."""
+        if seconds > 0:
+            self._now += seconds
+
+    @property
+    def is_replay(self) -> bool:
+        return True
+
+
+# Global clock instance, replaced for replays before components are created
+_clock = SystemClock()
+
+
+def get_clock():
+    """Get the process-wide clock."""
+    return _clock
+
+
+def set_clock(clock):
+    """Install a process-wide clock (call before constructing engines)."""
+    global _clock
+    _clock = clock
+    return _clock
@@ -0,0 +1,103 @@
+"""
+Runtime command channel for AzimuthControl.
+
+Headless runs have no window to receive key presses, so commands such as
+calibrate or quit arrive as text lines on stdin and/or a localhost TCP socket.
+Reader threads push them onto a queue that the main loop polls once per
+frame without blocking.
+
+Commands (one per line): calibrate (c), quit (q), stats (s), overlay (v),
+snapshot (p), profile (f).
+"""
+
+import queue
+import socket
+import sys
+import threading
+from typing import Optional
+
+# Command name -> the key the windowed UI uses for the same action
+COMMAND_KEYS = {
+    'calibrate': 'c',
+    'quit': 'q',
+    'stats': 's',
+    'overlay': 'v',
+    'snapshot': 'p',
+    'profile': 'f',
+}
+_ALIASES = {key: name for name, key in COMMAND_KEYS.items()}
+
+
+def parse_command(line: str) -> Optional[str]:
+    """Normalize a command line to its name, or None if unknown."""
+    word = line.strip().lower()
+    if word in COMMAND_KEYS:
+        return word
+    return _ALIASES.get(word)
+
+
+class CommandChannel:
+    """Collects commands from stdin and/or a localhost socket."""
+
+    def __init__(self, use_stdin: bool = True, port: Optional[int] = None, host: str = "127.0.0.1"):
+        self.commands = queue.SimpleQueue()
+        self.port = port
+        self.host = host
+        self._server = None
+        self._running = True
+
+        if use_stdin and sys.stdin is not None:
+            threading.Thread(target=self._read_stdin, name="CommandStdin", daemon=True).start()
+        if port:
+            self._server = socket.create_server((host, port))
+            self._server.settimeout(0.5)
+            threading.Thread(target=self._serve, name="CommandSocket", daemon=True).start()
+            print(f"📡 Accepting commands on {host}:{port}")
+
+    def _read_stdin(self):
+        for line in sys.stdin:
+            self._submit(line)
+            if not self._running:
+                break
+
+    def _serve(self):
+        while self._running:
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._handle_client, args=(conn,), name="CommandClient", daemon=True).start()
+
+    def _handle_client(self, conn: socket.socket):
+        with conn, conn.makefile('r', encoding='utf-8') as lines:
+            try:
+                for line in lines:
+                    conn.sendall(b"ok\n" if self._submit(line) else b"unknown command\n")
+            except OSError:
+                pass  # Client went away
+
+    def _submit(self, line: str) -> bool:
+        command = parse_command(line)
+        if command:
+            self.commands.put(command)
+        return command is not None
+
+    def poll(self) -> Optional[str]:
+        """Next pending command, or None."""
+        try:
+            return self.commands.get_nowait()
+        except queue.Empty:
+            return None
+
+    def poll_key(self) -> int:
+        """Next pending command as the key code the windowed UI would see (255 if none)."""
+        command = self.poll()
+        return ord(COMMAND_KEYS[command]) if command else 0xFF
+
+    def close(self):
+        self._running = False
+        if self._server is not None:
+            self._server.close()
+            self._server = None
@@ -8,6 +8,9 @@ import os
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+# Machine-specific overrides written by the autotuner (src/performance/autotuner.py)
+PERFORMANCE_PROFILE_FILENAME = "performance_profile.json"
+
 
 class ConfigManager:
     """Centralized configuration management for AzimuthControl."""
@@ -71,9 +74,29 @@ class ConfigManager:
                     "cache_duration_ms": 100,
                     "enable_jit_compilation": True
                 }
+            
+            if self._performance_config.get('use_performance_profile', True):
+                self._performance_config.update(self.load_performance_profile())
         
         return self._performance_config
     
+    def load_performance_profile(self) -> Dict[str, Any]:
+        """Load autotuned performance_settings overrides, if a profile exists."""
+        profile_path = self.config_dir / PERFORMANCE_PROFILE_FILENAME
+        try:
+            with open(profile_path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            print(f"⚠️ Ignoring invalid performance profile {profile_path}: {e}")
+            return {}
+        
+        overrides = data.get('performance_settings', {})
+        if overrides:
+            print(f"⚙️ Using performance profile from {data.get('generated_at', 'unknown date')}: {overrides}")
+        return overrides
+    
     def load_system_config(self) -> Dict[str, Any]:
         """Load system configuration settings."""
         if self._system_config is None:
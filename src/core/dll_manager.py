@@ -1,182 +1,334 @@
 """
 DLL Management System for AzimuthControl
 
-This module manages DLL loading and prevents conflicts when multiple DLLs exist.
-It ensures only the correct version is loaded and provides fallback mechanisms.
+This module manages native library loading and prevents conflicts when
+multiple builds exist. It ensures only the correct version is loaded and
+provides fallback mechanisms.
+
+Libraries are registered by stem and resolved per platform, relative to the
+package rather than the working directory: res_balancer.dll on Windows,
+libres_balancer.so/.dylib (or res_balancer.so/.dylib, or a setup.py
+extension build) elsewhere. Verification reads only the binary header to get
+the architecture (the library is never test-loaded), hashes only when a hash
+is expected, and caches both by (size, mtime). Each library is loaded once,
+on first use, and the resolve/verify/load timings are kept for get_timings().
 """
 
 import ctypes
+import hashlib
+import importlib.machinery
+import logging
 import os
+import platform
+import struct
 import sys
-import hashlib
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any
-import logging
+from typing import Optional, Dict, Any, List, Sequence, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Repository root (src/core/dll_manager.py -> ../..); native builds live under resBalancer/
+PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+NATIVE_DIR = PACKAGE_ROOT / "resBalancer"
+
+if sys.platform == "win32":
+    LIBRARY_SUFFIX = ".dll"
+elif sys.platform == "darwin":
+    LIBRARY_SUFFIX = ".dylib"
+else:
+    LIBRARY_SUFFIX = ".so"
+
+# Header machine codes -> architecture names used in the registry
+_PE_MACHINES = {0x8664: "x64", 0x014C: "x86", 0xAA64: "arm64"}
+_ELF_MACHINES = {62: "x64", 3: "x86", 183: "arm64"}
+_MACHO_CPUS = {0x01000007: "x64", 0x00000007: "x86", 0x0100000C: "arm64"}
+
+
+def host_architecture() -> str:
+    """Architecture of this Python process, in registry naming."""
+    machine = platform.machine().lower()
+    if machine in ("arm64", "aarch64"):
+        return "arm64"
+    if struct.calcsize("P") == 4:
+        return "x86"
+    return "x64" if machine in ("amd64", "x86_64", "x64", "") else machine
+
+
+def library_candidates(stem: str, directories: Sequence[Path]) -> List[Path]:
+    """Platform file names for a library stem, in search order."""
+    if sys.platform == "win32":
+        names = [f"{stem}.dll"]
+    else:
+        names = [f"lib{stem}{LIBRARY_SUFFIX}", f"{stem}{LIBRARY_SUFFIX}"]
+    # setup.py builds the same sources as a Python extension module
+    names += [f"{stem}{suffix}" for suffix in importlib.machinery.EXTENSION_SUFFIXES if suffix not in names]
+    candidates = []
+    for directory in directories:
+        for name in dict.fromkeys(names):
+            candidates.append(Path(directory) / name)
+    return candidates
+
+
+def read_architecture(path: Union[str, Path]) -> str:
+    """Architecture from the PE, ELF or Mach-O header; 'unknown' if unrecognised."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(64)
+            if header[:2] == b"MZ" and len(header) >= 64:
+                f.seek(struct.unpack_from("<I", header, 0x3C)[0])
+                pe = f.read(6)
+                if pe[:4] == b"PE\0\0":
+                    return _PE_MACHINES.get(struct.unpack_from("<H", pe, 4)[0], "unknown")
+            elif header[:4] == b"\x7fELF" and len(header) >= 20:
+                order = "<" if header[5] == 1 else ">"
+                return _ELF_MACHINES.get(struct.unpack_from(f"{order}H", header, 18)[0], "unknown")
+            elif header[:4] in (b"\xcf\xfa\xed\xfe", b"\xce\xfa\xed\xfe"):
+                return _MACHO_CPUS.get(struct.unpack_from("<I", header, 4)[0], "unknown")
+            elif header[:4] == b"\xca\xfe\xba\xbe":
+                return "universal"
+    except (OSError, struct.error) as e:
+        logger.error(f"Failed to read header of {path}: {e}")
+    return "unknown"
+
+
 class DLLManager:
-    """Manages DLL loading with conflict resolution"""
-    
+    """Manages native library loading with conflict resolution"""
+
     def __init__(self):
         self.loaded_dlls: Dict[str, ctypes.CDLL] = {}
         self.dll_registry: Dict[str, Dict[str, Any]] = {}
-        
-    def register_dll(self, name: str, path: str, expected_hash: Optional[str] = None, 
-                    architecture: str = "x64", priority: int = 0):
-        """Register a DLL with metadata"""
-        self.dll_registry[name] = {
-            'path': path,
-            'expected_hash': expected_hash,
-            'architecture': architecture,
-            'priority': priority,
-            'loaded': False
-        }
-        
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._verified: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}  # path -> ((size, mtime), result)
+        self._failed: Dict[str, str] = {}  # name -> reason, so failed loads are not retried every call
+        self._lock = threading.RLock()
+
+    def register_dll(self, name: str, path: Union[str, Sequence[str], None] = None, expected_hash: Optional[str] = None,
+                    architecture: Optional[str] = None, priority: int = 0, stem: Optional[str] = None,
+                    directories: Optional[Sequence[Union[str, Path]]] = None):
+        """Register a library by explicit path(s) or by stem (resolved per platform).
+
+        Relative paths and directories are taken relative to the package root.
+        architecture defaults to the host architecture.
+        """
+        paths = [path] if isinstance(path, (str, Path)) else list(path or [])
+        candidates = [self._resolve(p) for p in paths]
+        if stem:
+            candidates += library_candidates(stem, [self._resolve(d) for d in (directories or [NATIVE_DIR])])
+        with self._lock:
+            self.dll_registry[name] = {
+                'path': str(candidates[0]) if candidates else None,
+                'candidates': candidates,
+                'expected_hash': expected_hash,
+                'architecture': architecture or host_architecture(),
+                'priority': priority,
+                'loaded': False
+            }
+            self._failed.pop(name, None)
+
+    @staticmethod
+    def _resolve(path: Union[str, Path]) -> Path:
+        path = Path(path)
+        return path if path.is_absolute() else PACKAGE_ROOT / path
+
     def get_dll_hash(self, dll_path: str) -> str:
-        """Calculate SHA256 hash of DLL file"""
+        """Calculate SHA256 hash of a library file (streamed)"""
         try:
+            digest = hashlib.sha256()
             with open(dll_path, 'rb') as f:
-                return hashlib.sha256(f.read()).hexdigest()
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
         except Exception as e:
             logger.error(f"Failed to calculate hash for {dll_path}: {e}")
             return ""
-            
+
     def verify_dll_architecture(self, dll_path: str) -> str:
-        """Verify DLL architecture (simplified check)"""
-        try:
-            # Try loading to check compatibility
-            test_dll = ctypes.CDLL(dll_path)
-            return "x64"  # If it loads on 64-bit Python, assume x64
-        except OSError as e:
-            if "193" in str(e):  # Invalid Win32 application
-                return "x86"
-            return "unknown"
-            
+        """Architecture of a library file, read from its header (without loading it)"""
+        return self._verify(dll_path)['architecture']
+
+    def _verify(self, dll_path: Union[str, Path], with_hash: bool = False) -> Dict[str, Any]:
+        """Header architecture (and optionally hash) of a file, cached by (size, mtime)."""
+        key = str(dll_path)
+        stat = os.stat(key)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._verified.get(key)
+            if cached is not None and cached[0] == signature and (not with_hash or 'hash' in cached[1]):
+                return cached[1]
+            result = dict(cached[1]) if cached is not None and cached[0] == signature else {}
+        if 'architecture' not in result:
+            result['architecture'] = read_architecture(key)
+        if with_hash and 'hash' not in result:
+            result['hash'] = self.get_dll_hash(key)
+        result['file_size'] = stat.st_size
+        with self._lock:
+            self._verified[key] = (signature, result)
+        return result
+
     def find_best_dll(self, name: str) -> Optional[str]:
-        """Find the best DLL version based on priority and architecture"""
+        """First candidate that exists and matches the expected architecture (and hash, if given)"""
         if name not in self.dll_registry:
             return None
-            
+
         dll_info = self.dll_registry[name]
-        dll_path = dll_info['path']
-        
-        # Check if file exists
-        if not os.path.exists(dll_path):
-            logger.warning(f"DLL not found: {dll_path}")
-            return None
-            
-        # Verify architecture
-        actual_arch = self.verify_dll_architecture(dll_path)
         expected_arch = dll_info['architecture']
-        
-        if actual_arch != expected_arch and actual_arch != "unknown":
-            logger.warning(f"Architecture mismatch for {name}: expected {expected_arch}, got {actual_arch}")
-            
-        # Verify hash if provided
-        if dll_info['expected_hash']:
-            actual_hash = self.get_dll_hash(dll_path)
-            if actual_hash != dll_info['expected_hash']:
-                logger.warning(f"Hash mismatch for {name}")
-                
-        return dll_path
-        
+        for candidate in dll_info['candidates']:
+            if not candidate.is_file():
+                continue
+            verified = self._verify(candidate, with_hash=bool(dll_info['expected_hash']))
+            actual_arch = verified['architecture']
+            if actual_arch not in (expected_arch, "unknown", "universal"):
+                logger.warning(f"Architecture mismatch for {name}: expected {expected_arch}, "
+                               f"got {actual_arch} ({candidate})")
+                continue
+            if dll_info['expected_hash'] and verified['hash'] != dll_info['expected_hash']:
+                logger.warning(f"Hash mismatch for {name} ({candidate})")
+            return str(candidate)
+
+        logger.warning(f"DLL not found for {name} (looked for: {', '.join(c.name for c in dll_info['candidates'])})")
+        return None
+
     def load_dll(self, name: str, force_reload: bool = False) -> Optional[ctypes.CDLL]:
-        """Load DLL with conflict resolution"""
-        if name in self.loaded_dlls and not force_reload:
-            return self.loaded_dlls[name]
-            
-        dll_path = self.find_best_dll(name)
-        if not dll_path:
-            logger.error(f"No suitable DLL found for {name}")
-            return None
-            
-        try:
-            dll = ctypes.CDLL(dll_path)
+        """Load a library once, on first use; later calls return the cached handle (or cached failure)"""
+        with self._lock:
+            if not force_reload:
+                if name in self.loaded_dlls:
+                    return self.loaded_dlls[name]
+                if name in self._failed:
+                    return None
+
+            timings = self.timings.setdefault(name, {})
+            start = time.perf_counter()
+            dll_path = self.find_best_dll(name)
+            timings['resolve_ms'] = (time.perf_counter() - start) * 1000
+            if not dll_path:
+                logger.error(f"No suitable DLL found for {name}")
+                self._failed[name] = "not found"
+                return None
+
+            start = time.perf_counter()
+            try:
+                dll = ctypes.CDLL(dll_path)
+            except Exception as e:
+                timings['load_ms'] = (time.perf_counter() - start) * 1000
+                logger.error(f"Failed to load DLL {name} from {dll_path}: {e}")
+                self._failed[name] = str(e)
+                return None
+            timings['load_ms'] = (time.perf_counter() - start) * 1000
+
             self.loaded_dlls[name] = dll
             self.dll_registry[name]['loaded'] = True
-            logger.info(f"Successfully loaded DLL: {name} from {dll_path}")
+            self.dll_registry[name]['path'] = dll_path
+            self._failed.pop(name, None)
+            logger.info(f"Successfully loaded DLL: {name} from {dll_path} "
+                        f"(resolve {timings['resolve_ms']:.1f}ms, load {timings['load_ms']:.1f}ms)")
             return dll
-            
-        except Exception as e:
-            logger.error(f"Failed to load DLL {name} from {dll_path}: {e}")
-            return None
-            
+
     def unload_dll(self, name: str):
         """Unload a DLL (note: Windows doesn't actually unload DLLs)"""
-        if name in self.loaded_dlls:
-            del self.loaded_dlls[name]
-            self.dll_registry[name]['loaded'] = False
-            logger.info(f"Unloaded DLL: {name}")
-            
-    def cleanup_old_dlls(self, directory: str, keep_pattern: str = "res_balancer*.dll"):
-        """Clean up old DLL files"""
+        with self._lock:
+            if name in self.loaded_dlls:
+                del self.loaded_dlls[name]
+                self.dll_registry[name]['loaded'] = False
+                logger.info(f"Unloaded DLL: {name}")
+
+    def cleanup_old_dlls(self, directory: str, keep_prefixes: Sequence[str] = ("res_balancer", "libres_balancer", "cudart"),
+                         dry_run: bool = True) -> List[Path]:
+        """Find (and with dry_run=False, delete) stale native libraries in a directory.
+
+        Never called implicitly; returns the stale files found.
+        """
+        stale = []
         try:
-            dll_dir = Path(directory)
+            dll_dir = self._resolve(directory)
             if not dll_dir.exists():
-                return
-                
-            for dll_file in dll_dir.glob("*.dll"):
-                # Keep CUDA DLL, regular DLL, and CUDA runtime
-                if (dll_file.name.startswith("res_balancer") or 
-                    dll_file.name.startswith("cudart") or
-                    dll_file.name == keep_pattern):
-                    continue  # Keep these DLLs
+                return stale
+
+            for dll_file in dll_dir.glob(f"*{LIBRARY_SUFFIX}"):
+                # Keep CUDA build, regular build, and CUDA runtime
+                if dll_file.name.startswith(tuple(keep_prefixes)):
+                    continue
+                stale.append(dll_file)
+                if dry_run:
+                    continue
                 try:
                     dll_file.unlink()
                     logger.info(f"Cleaned up old DLL: {dll_file}")
                 except Exception as e:
                     logger.warning(f"Could not remove {dll_file}: {e}")
-                        
+
         except Exception as e:
             logger.error(f"Error during DLL cleanup: {e}")
-            
-    def get_dll_info(self, name: str) -> Dict[str, Any]:
-        """Get information about a registered DLL"""
+        return stale
+
+    def get_dll_info(self, name: str, include_hash: bool = False) -> Dict[str, Any]:
+        """Get information about a registered library (cached verification, no loading)"""
         if name not in self.dll_registry:
             return {}
-            
+
         info = self.dll_registry[name].copy()
-        if os.path.exists(info['path']):
-            info['actual_hash'] = self.get_dll_hash(info['path'])
-            info['actual_architecture'] = self.verify_dll_architecture(info['path'])
-            info['file_size'] = os.path.getsize(info['path'])
+        info['candidates'] = [str(c) for c in info['candidates']]
+        path = info['path']
+        if path and os.path.exists(path):
+            verified = self._verify(path, with_hash=include_hash or bool(info['expected_hash']))
+            info['exists'] = True
+            info['actual_architecture'] = verified['architecture']
+            info['file_size'] = verified['file_size']
+            if 'hash' in verified:
+                info['actual_hash'] = verified['hash']
         else:
             info['exists'] = False
-            
+        info['error'] = self._failed.get(name)
+        info['timings'] = dict(self.timings.get(name, {}))
         return info
 
+    def get_timings(self) -> Dict[str, Dict[str, float]]:
+        """Resolve/load milliseconds per library loaded (or attempted) so far"""
+        with self._lock:
+            return {name: dict(timings) for name, timings in self.timings.items()}
+
 # Global DLL manager instance
 dll_manager = DLLManager()
 
-# Register the enhanced frame processor DLL
+# Register the enhanced (CUDA) frame processor build
 dll_manager.register_dll(
     name="frame_processor",
-    path="./resBalancer/res_balancer_cuda.dll",
-    architecture="x64", 
+    stem="res_balancer_cuda",
     priority=1
 )
 
-# Fallback registration for legacy DLL
+# Fallback registration for the standard build (resBalancer/ or a setup.py build in the package root)
 dll_manager.register_dll(
     name="frame_processor_legacy",
-    path="./resBalancer/res_balancer.dll",
-    architecture="x64",
+    stem="res_balancer",
+    directories=[NATIVE_DIR, PACKAGE_ROOT],
     priority=2
 )
 
+# Alternative enhanced build without CUDA
+dll_manager.register_dll(
+    name="frame_processor_enhanced",
+    stem="res_balancer_enhanced",
+    priority=3
+)
+
 def get_frame_processor_dll() -> Optional[ctypes.CDLL]:
     """Get the frame processor DLL with conflict resolution"""
     # Try enhanced CUDA DLL first
     dll = dll_manager.load_dll("frame_processor")
     if dll:
         return dll
-    
+
     # Fallback to legacy DLL
     return dll_manager.load_dll("frame_processor_legacy")
 
-def cleanup_dll_conflicts():
-    """Clean up potential DLL conflicts"""
-    dll_manager.cleanup_old_dlls("./resBalancer/")
-    dll_manager.cleanup_old_dlls("./build/")
-    dll_manager.cleanup_old_dlls("./")  # Clean root directory
+def cleanup_dll_conflicts(dry_run: bool = True) -> List[Path]:
+    """Report (or with dry_run=False, remove) stale native libraries next to the builds"""
+    stale = []
+    for directory in (NATIVE_DIR, PACKAGE_ROOT / "build"):
+        stale += dll_manager.cleanup_old_dlls(str(directory), dry_run=dry_run)
+    for path in stale:
+        logger.warning(f"Stale native library{'' if dry_run else ' removed'}: {path}")
+    return stale
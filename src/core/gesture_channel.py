@@ -0,0 +1,309 @@
+"""
+Shared-memory gesture state channel for AzimuthControl.
+
+The main loop publishes the current gesture state every frame into a small
+memory-mapped file with a fixed little-endian layout. Any local process (a
+game plugin, an overlay, a test harness) maps the same file and reads the
+latest state with plain memory loads - no sockets, pipes or syscalls per read.
+
+Consistency uses a seqlock: the writer makes the sequence number odd, writes
+the payload, then makes it even again. A reader copies the payload between
+two reads of the sequence number and retries if they differ or are odd.
+(CPython on x86/x64 keeps the stores in order; on weakly ordered CPUs a
+native reader should add acquire fences around the payload copy.)
+
+Layout (256 bytes, little-endian):
+
+    offset  size  field
+    0       4     magic "AZGS"
+    4       2     layout version (1)
+    6       2     payload size in bytes
+    8       8     u64 sequence (odd while a write is in progress)
+    16      8     u64 frame id
+    24      8     i64 wall clock, time.time_ns()
+    32      8     i64 monotonic, time.perf_counter_ns() (same clock across processes)
+    40      1     u8  hand present
+    41      1     u8  calibrated
+    42      2     padding
+    44      16    char[16] movement status (NUL padded ASCII)
+    60      16    char[16] action status
+    76      16    char[16] camera status
+    92      16    char[16] navigation status
+    108     16    char[16] active (debounced) gesture
+    124     32    f32[8]   analog values, see ANALOG_FIELDS
+
+Run `python -m src.core.gesture_channel --bench` for a two-process latency test.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+MAGIC = b"AZGS"
+LAYOUT_VERSION = 1
+FILE_SIZE = 256
+
+_HEADER = struct.Struct("<4sHH")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 8
+_PAYLOAD = struct.Struct("<QqqBB2x16s16s16s16s16s8f")
+_PAYLOAD_OFFSET = 16
+
+STATUS_FIELDS = ('movement', 'action', 'camera', 'navigation', 'active')
+ANALOG_FIELDS = ('palm_x', 'palm_y', 'palm_width', 'palm_height', 'area_ratio', 'fps', 'inference_ms', 'reserved')
+
+
+def default_channel_path() -> Path:
+    """RAM-backed location where available (/dev/shm), otherwise the temp directory."""
+    shm = Path("/dev/shm")
+    base = shm if sys.platform.startswith("linux") and shm.is_dir() else Path(tempfile.gettempdir())
+    return base / "azimuth_gesture_state"
+
+
+def _encode(text: Optional[str]) -> bytes:
+    return (text or "NEUTRAL").encode("ascii", "replace")[:16]
+
+
+def _decode(raw: bytes) -> str:
+    return raw.split(b"\0", 1)[0].decode("ascii", "replace")
+
+
+@dataclass
+class GestureSnapshot:
+    """One consistent copy of the published state."""
+    sequence: int
+    frame_id: int
+    wall_time_ns: int
+    monotonic_ns: int
+    hand_present: bool
+    calibrated: bool
+    statuses: Dict[str, str] = field(default_factory=dict)
+    analog: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def age_ms(self) -> float:
+        """Time since the writer published this state."""
+        return (time.perf_counter_ns() - self.monotonic_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'sequence': self.sequence, 'frame_id': self.frame_id,
+            'wall_time_ns': self.wall_time_ns, 'monotonic_ns': self.monotonic_ns,
+            'hand_present': self.hand_present, 'calibrated': self.calibrated,
+            **self.statuses, **self.analog
+        }
+
+
+class GestureStateWriter:
+    """Single writer; creates (or reuses) the mapped file."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else default_channel_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+b")
+        self._file.truncate(FILE_SIZE)
+        self._mm = mmap.mmap(self._file.fileno(), FILE_SIZE)
+        # Keep the sequence monotonic across writer restarts so readers never see it go back
+        previous = _SEQ.unpack_from(self._mm, _SEQ_OFFSET)[0] if self._mm[:4] == MAGIC else 0
+        self.sequence = previous + (previous & 1)
+        _HEADER.pack_into(self._mm, 0, MAGIC, LAYOUT_VERSION, _PAYLOAD.size)
+        _SEQ.pack_into(self._mm, _SEQ_OFFSET, self.sequence)
+        self.frame_id = 0
+
+    def publish(self, statuses: Dict[str, str], hand_present: bool = False, calibrated: bool = False,
+                analog: Optional[Dict[str, float]] = None, frame_id: Optional[int] = None):
+        """Write one frame's state. statuses/analog are keyed by STATUS_FIELDS/ANALOG_FIELDS."""
+        self.frame_id = self.frame_id + 1 if frame_id is None else frame_id
+        analog = analog or {}
+        mm = self._mm
+
+        self.sequence += 1  # Odd: write in progress
+        _SEQ.pack_into(mm, _SEQ_OFFSET, self.sequence)
+        _PAYLOAD.pack_into(
+            mm, _PAYLOAD_OFFSET,
+            self.frame_id, time.time_ns(), time.perf_counter_ns(),
+            1 if hand_present else 0, 1 if calibrated else 0,
+            *(_encode(statuses.get(name)) for name in STATUS_FIELDS),
+            *(float(analog.get(name, 0.0)) for name in ANALOG_FIELDS))
+        self.sequence += 1  # Even: consistent
+        _SEQ.pack_into(mm, _SEQ_OFFSET, self.sequence)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+
+class GestureStateReader:
+    """Maps the channel read-only and returns consistent snapshots."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else default_channel_path()
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), FILE_SIZE, access=mmap.ACCESS_READ)
+        magic, version, payload_size = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION or payload_size != _PAYLOAD.size:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {LAYOUT_VERSION} gesture channel")
+        self.retries = 0  # Reads that raced a write and had to be repeated
+
+    @property
+    def sequence(self) -> int:
+        """Current sequence number (cheap change check without copying the payload)."""
+        return _SEQ.unpack_from(self._mm, _SEQ_OFFSET)[0]
+
+    def read(self, max_retries: int = 1000) -> Optional[GestureSnapshot]:
+        """Latest consistent state, or None if nothing has been published yet."""
+        mm = self._mm
+        end = _PAYLOAD_OFFSET + _PAYLOAD.size
+        for _ in range(max_retries):
+            before = _SEQ.unpack_from(mm, _SEQ_OFFSET)[0]
+            if before & 1:
+                self.retries += 1
+                continue
+            payload = mm[_PAYLOAD_OFFSET:end]
+            if _SEQ.unpack_from(mm, _SEQ_OFFSET)[0] != before:
+                self.retries += 1
+                continue
+            if before == 0:
+                return None
+            values = _PAYLOAD.unpack(payload)
+            return GestureSnapshot(
+                sequence=before, frame_id=values[0], wall_time_ns=values[1], monotonic_ns=values[2],
+                hand_present=bool(values[3]), calibrated=bool(values[4]),
+                statuses={name: _decode(raw) for name, raw in zip(STATUS_FIELDS, values[5:10])},
+                analog=dict(zip(ANALOG_FIELDS, values[10:18])))
+        return None
+
+    def wait_for_update(self, last_sequence: int, timeout: float = 1.0,
+                        spin: bool = True) -> Optional[GestureSnapshot]:
+        """Poll until the sequence moves past last_sequence (busy-spin or 0.1ms sleeps)."""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            sequence = self.sequence
+            if sequence != last_sequence and not sequence & 1:
+                return self.read()
+            if not spin:
+                time.sleep(0.0001)
+        return None
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+
+# --- Two-process latency test ---
+
+def _bench_writer(path: str, rate_hz: float, duration: float):
+    writer = GestureStateWriter(path)
+    interval = 1.0 / rate_hz
+    statuses = {'movement': 'FORWARD', 'action': 'NEUTRAL', 'camera': 'NEUTRAL',
+                'navigation': 'NEUTRAL', 'active': 'FORWARD'}
+    end = time.perf_counter() + duration
+    next_write = time.perf_counter()
+    while time.perf_counter() < end:
+        writer.publish(statuses, hand_present=True, calibrated=True, analog={'fps': rate_hz})
+        next_write += interval
+        delay = next_write - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    writer.close()
+
+
+def run_latency_benchmark(rate_hz: float = 500.0, duration: float = 3.0, spin: bool = True,
+                          path: Optional[str] = None) -> Dict[str, Any]:
+    """Writer in a child process, reader here; measures publish-to-read latency and read cost."""
+    import multiprocessing
+    from ..utils.streaming_stats import RunningStats, P2Quantile
+
+    path = str(path or default_channel_path().with_name("azimuth_gesture_bench"))
+    GestureStateWriter(path).close()  # Create the file before the reader maps it
+    reader = GestureStateReader(path)
+
+    process = multiprocessing.Process(target=_bench_writer, args=(path, rate_hz, duration), daemon=True)
+    process.start()
+
+    latency = RunningStats()
+    p50, p99 = P2Quantile(0.5), P2Quantile(0.99)
+    read_cost = RunningStats()
+    last_sequence = reader.sequence
+    last_frame = None
+    missed = 0
+    deadline = time.perf_counter() + duration + 2.0
+    while time.perf_counter() < deadline and (process.is_alive() or last_frame is None):
+        snapshot = reader.wait_for_update(last_sequence, timeout=0.5, spin=spin)
+        if snapshot is None:
+            continue
+        latency_us = (time.perf_counter_ns() - snapshot.monotonic_ns) / 1000
+        latency.update(latency_us)
+        p50.update(latency_us)
+        p99.update(latency_us)
+        if last_frame is not None and snapshot.frame_id > last_frame + 1:
+            missed += snapshot.frame_id - last_frame - 1
+        last_frame = snapshot.frame_id
+        last_sequence = snapshot.sequence
+
+    start = time.perf_counter_ns()
+    for _ in range(10000):
+        reader.read()
+    read_cost.update((time.perf_counter_ns() - start) / 10000 / 1000)
+
+    process.join()
+    reader.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    return {
+        'updates_seen': latency.count,
+        'updates_missed': missed,
+        'latency_mean_us': latency.mean,
+        'latency_p50_us': p50.value,
+        'latency_p99_us': p99.value,
+        'latency_max_us': latency.max if latency.count else None,
+        'read_cost_us': read_cost.mean,
+        'read_retries': reader.retries
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gesture state channel reader / latency test")
+    parser.add_argument("--bench", action="store_true", help="Run a two-process latency test")
+    parser.add_argument("--rate", type=float, default=500.0, help="Writer rate for --bench (Hz)")
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--sleep", action="store_true", help="Poll with short sleeps instead of spinning")
+    parser.add_argument("--path", help="Channel file (default: %s)" % default_channel_path())
+    args = parser.parse_args()
+
+    if args.bench:
+        result = run_latency_benchmark(args.rate, args.duration, not args.sleep, args.path)
+        print(f"📡 Gesture channel latency ({args.rate:.0f} Hz writer, {'sleep' if args.sleep else 'spin'} polling):")
+        print(f"   updates seen {result['updates_seen']}, missed {result['updates_missed']}")
+        print(f"   latency mean {result['latency_mean_us']:.1f}us | p50 {result['latency_p50_us']:.1f}us | "
+              f"p99 {result['latency_p99_us']:.1f}us | max {result['latency_max_us']:.1f}us")
+        print(f"   read() cost {result['read_cost_us']:.2f}us, {result['read_retries']} seqlock retries")
+    else:
+        channel = GestureStateReader(args.path)
+        last = 0
+        print(f"Reading {channel.path} (Ctrl+C to stop)")
+        try:
+            while True:
+                snapshot = channel.wait_for_update(last, timeout=1.0, spin=False)
+                if snapshot:
+                    last = snapshot.sequence
+                    print(f"#{snapshot.frame_id} {snapshot.statuses['active']:<10} hand={snapshot.hand_present} "
+                          f"age {snapshot.age_ms:.2f}ms {snapshot.statuses}")
+        except KeyboardInterrupt:
+            pass
+        channel.close()
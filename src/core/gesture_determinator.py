@@ -230,18 +230,26 @@ class OrderedGestureDeterminator:
         
         return result
 
-# Global instance for backward compatibility
-_determinator = OrderedGestureDeterminator()
+# Default instance for backward compatibility, created on first use
+# (CentralLinker and sessions construct their own determinators)
+_determinator = None
+
+def get_determinator():
+    """Get the default determinator used by the individual functions below."""
+    global _determinator
+    if _determinator is None:
+        _determinator = OrderedGestureDeterminator()
+    return _determinator
 
 # Fixed individual functions for existing code compatibility
 def determine_action_status(landmarks, palm_bbox):
-    return _determinator.determine_action_status(landmarks, palm_bbox)
+    return get_determinator().determine_action_status(landmarks, palm_bbox)
 
 def determine_movement_status(landmarks, palm_bbox, neutral_area, neutral_distances):
-    return _determinator.determine_movement_status(landmarks, palm_bbox, neutral_area, neutral_distances)
+    return get_determinator().determine_movement_status(landmarks, palm_bbox, neutral_area, neutral_distances)
 
 def determine_camera_status(landmarks, palm_bbox, neutral_distances):
-    return _determinator.determine_camera_status(landmarks, palm_bbox, neutral_distances)
+    return get_determinator().determine_camera_status(landmarks, palm_bbox, neutral_distances)
 
 def determine_navigation_status(landmarks, palm_bbox):
-    return _determinator.determine_navigation_status(landmarks, palm_bbox)
+    return get_determinator().determine_navigation_status(landmarks, palm_bbox)
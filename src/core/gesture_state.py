@@ -1,7 +1,8 @@
-import time
+from .clock import get_clock
 
 class GestureState:
-    def __init__(self, gesture_duration=0.3, reengagement_delay=0.2):
+    def __init__(self, gesture_duration=0.3, reengagement_delay=0.2, clock=None):
+        self.clock = clock if clock is not None else get_clock()
         self.gesture_duration = gesture_duration
         self.reengagement_delay = reengagement_delay
         self.current_gesture = None
@@ -22,7 +23,7 @@ class GestureState:
         else:
             detected_gesture = "NEUTRAL"
 
-        current_time = time.time()
+        current_time = self.clock.now()
 
         if detected_gesture == self.last_detected_gesture:
             if current_time - self.last_detection_time >= self.gesture_duration:
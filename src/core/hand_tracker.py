@@ -0,0 +1,417 @@
+"""
+Two-hand tracking for AzimuthControl.
+
+MediaPipe returns up to max_num_hands detections per frame, each with a
+handedness label. HandTracker routes every detection to a persistent
+HandSession keyed by handedness. Each session has its own gesture engine, and
+through it its own MovementController, landmark predictor and stability
+filter. It also has its own GestureState, smoothing history and calibration,
+so nothing per-hand is shared between the two hands.
+
+Detections are matched to sessions by tracking continuity first (distance of
+the hand centre from where the session last saw its hand, up to max_jump)
+and by label second. MediaPipe's label can flicker for a frame, and both hands
+can briefly get the same label, so a label mismatch only costs a penalty
+smaller than starting a new track. That is absorbed for label_patience
+consecutive frames; a disagreement that persists longer is a real handedness
+change, and the detection starts a new track under its own label.
+
+The per-hand work is only smoothing, the palm box, the engine and the gesture
+state, all on numpy arrays; the MediaPipe landmark list is built only for
+calibration. Inference, system load sampling and the engine's config, validator and
+C++ extension are shared. HandTracker times the gesture stage by the number of
+hands processed, so the cost of the second hand can be checked at runtime
+('s') and with the benchmark below.
+"""
+
+import time
+from itertools import permutations
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .calibration_profile import CalibrationProfile, measure_calibration, hand_scale_from_array
+from .gesture_state import GestureState
+from ..utils.geometry_utils import landmarks_to_proto, calculate_palm_bbox_array
+from ..utils.streaming_stats import RunningStats
+
+HAND_LABELS = ('Right', 'Left')
+GESTURE_TYPES = ('movement', 'action', 'camera', 'navigation')
+
+
+def detections_from_results(results) -> List[Tuple[str, np.ndarray]]:
+    """(MediaPipe handedness label, (21, 3) landmarks) for each hand in a Hands result."""
+    detections = []
+    if results and getattr(results, 'multi_hand_landmarks', None):
+        for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+            detections.append((handedness.classification[0].label,
+                               np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark])))
+    return detections
+
+
+class HandSession:
+    """Everything that belongs to one physical hand: engine, gesture state, smoothing and calibration."""
+
+    def __init__(self, label: str, engine, clock=None):
+        self.label = label
+        self.engine = engine
+        self.gesture_state = GestureState(clock=clock)
+        self.landmark_history = []
+
+        # Calibration (the owner loads and saves profiles under profile_key)
+        self.profile_key = None
+        self.neutral_area = 0.0
+        self.neutral_distances = None
+        self.hand_scale = 0.0        # Current wrist to middle MCP distance (smoothed)
+        self.is_calibrated = False
+
+        # Track continuity
+        self.tracked = False
+        self.missed_frames = 0
+        self.center = None
+        self.label_disagreements = 0  # Consecutive detections routed here against their label
+
+        # Per-frame results
+        self.present = False
+        self.predicted = False       # Landmarks extrapolated this frame (no inference)
+        self.raw_landmarks = None    # (21, 3) raw camera orientation
+        self.landmarks = None        # (21, 3) display orientation, unsmoothed
+        self.smoothed_array = None   # (21, 3) smoothed, display orientation
+        self._smoothed_proto = None
+        self.palm_bbox = None
+        self.statuses = dict.fromkeys(GESTURE_TYPES, 'NEUTRAL')
+
+    @property
+    def movement_controller(self):
+        return self.engine.movement_controller
+
+    @property
+    def smoothed(self):
+        """Smoothed landmarks as a MediaPipe landmark list, built only when asked for (calibration)."""
+        if self._smoothed_proto is None and self.smoothed_array is not None:
+            self._smoothed_proto = landmarks_to_proto(self.smoothed_array)
+        return self._smoothed_proto
+
+    @property
+    def active_gesture(self):
+        return self.gesture_state.get_active_gesture()
+
+    def apply_profile(self, profile):
+        """Start from a calibration profile (loaded, or measured with 'c')."""
+        self.movement_controller.apply_profile(profile)
+        self.neutral_area = profile.neutral_area
+        self.neutral_distances = dict(profile.neutral_distances) or None
+        self.is_calibrated = True
+
+    def start_track(self):
+        """A hand that may not be the one seen before: drop smoothing and prediction state."""
+        self.landmark_history = []
+        self.engine.reset_prediction()
+
+    def smooth(self, smoothing_factor: int, mirrored: bool):
+        landmarks = self.raw_landmarks.copy()
+        if mirrored:
+            landmarks[:, 0] = 1.0 - landmarks[:, 0]  # Flip X to match the mirrored display
+        self.landmarks = landmarks
+
+        # Moving average over the last smoothing_factor frames (as smooth_landmarks), kept
+        # as an array: the engine and the palm box need no MediaPipe landmark list
+        history = self.landmark_history
+        if len(history) >= smoothing_factor:
+            history.pop(0)
+        history.append(landmarks)
+        self.smoothed_array = np.mean(history, axis=0)
+        self._smoothed_proto = None
+        self.palm_bbox = calculate_palm_bbox_array(self.smoothed_array)
+        self.hand_scale = hand_scale_from_array(self.smoothed_array)
+
+    def process_gestures(self, cpu_usage: float = 0.0, mem_usage: float = 0.0) -> Dict[str, str]:
+        # Distance thresholds follow the hand's current size (its depth) relative to calibration
+        neutral_distances = self.neutral_distances
+        if neutral_distances:
+            profile = self.movement_controller.get_profile()
+            neutral_distances = profile.distances_at_scale(self.hand_scale) or neutral_distances
+        results = self.engine.process_frame(self.smoothed_array, self.palm_bbox, self.neutral_area,
+                                            neutral_distances, cpu_usage, mem_usage, self.predicted)
+        # Movement controller refines the neutral area in the background
+        if self.movement_controller.neutral_area:
+            self.neutral_area = self.movement_controller.neutral_area
+
+        statuses = self.statuses
+        for name in GESTURE_TYPES:
+            statuses[name] = results.get(name, 'NEUTRAL')
+        self.gesture_state.update(statuses['movement'], statuses['action'], statuses['camera'], statuses['navigation'])
+        return statuses
+
+
+class HandTracker:
+    """Routes each detected hand to its own HandSession, by continuity and handedness."""
+
+    def __init__(self, engine_factory: Callable[[str], Any], smoothing_factor: int = 3, mirrored: bool = False,
+                 max_jump: float = 0.15, max_missed_frames: int = 5, label_patience: int = 1, clock=None):
+        self.engine_factory = engine_factory
+        self.smoothing_factor = smoothing_factor
+        self.mirrored = mirrored
+        self.max_jump = max_jump  # Largest centre movement (normalized) that still continues a track
+        self.label_penalty = max_jump / 2  # Cheaper than a new track, dearer than a small jump
+        self.label_patience = label_patience  # Disagreeing frames continuity may absorb before handedness wins
+        self.max_missed_frames = max_missed_frames
+        self.clock = clock
+
+        self.sessions: Dict[str, HandSession] = {}
+        self.label_flips = 0  # Detections routed against their MediaPipe label
+        self.new_tracks = 0
+        self.gesture_time = {1: RunningStats(), 2: RunningStats()}  # ms per frame, by hands processed
+
+    def session(self, label: str) -> HandSession:
+        """The session for a handedness label, created (with its engine) on first use."""
+        session = self.sessions.get(label)
+        if session is None:
+            session = self.sessions[label] = HandSession(label, self.engine_factory(label), clock=self.clock)
+        return session
+
+    @property
+    def present(self) -> List[HandSession]:
+        return [session for session in self.sessions.values() if session.present]
+
+    def _begin_frame(self):
+        for session in self.sessions.values():
+            session.present = False
+            session.statuses.update(dict.fromkeys(GESTURE_TYPES, 'NEUTRAL'))
+
+    # --- Detection routing ---
+
+    def observe(self, results) -> List[HandSession]:
+        """Route a MediaPipe result's hands to their sessions (frames with inference)."""
+        return self.observe_detections(detections_from_results(results))
+
+    def observe_detections(self, detections: List[Tuple[str, np.ndarray]]) -> List[HandSession]:
+        """Route MediaPipe-labelled (label, landmarks) detections, e.g. from an inference worker."""
+        if self.mirrored:
+            # Camera is mirrored, so "Left" detection = actual right hand
+            detections = [('Left' if label == 'Right' else 'Right', landmarks) for label, landmarks in detections]
+        return self.assign(detections)
+
+    def _match_cost(self, session: Optional[HandSession], label: str, session_label: str,
+                    center: np.ndarray) -> Tuple[float, bool]:
+        """(cost, continues_track) of giving a detection labelled `label` to `session_label`."""
+        mismatch = self.label_penalty if label != session_label else 0.0
+        # A label that keeps disagreeing is a real handedness change, not a flicker: no continuity
+        absorbed = not mismatch or (session is not None and session.label_disagreements < self.label_patience)
+        if absorbed and session is not None and session.tracked and session.center is not None:
+            distance = float(np.hypot(*(center - session.center)))
+            if distance <= self.max_jump:
+                return distance + mismatch, True
+        return self.max_jump + mismatch, False
+
+    def assign(self, detections: List[Tuple[str, np.ndarray]]) -> List[HandSession]:
+        """Assign (label, (21, 3) raw landmarks) detections to sessions; returns the present sessions."""
+        self._begin_frame()
+        detections = detections[:len(HAND_LABELS)]
+        centers = [landmarks[:, :2].mean(axis=0) for _, landmarks in detections]
+
+        best, best_cost = (), float('inf')
+        for labels in permutations(HAND_LABELS, len(detections)):
+            matches = [self._match_cost(self.sessions.get(session_label), label, session_label, center)
+                       for (label, _), session_label, center in zip(detections, labels, centers)]
+            cost = sum(match[0] for match in matches)
+            if cost < best_cost:
+                best, best_cost = tuple(zip(labels, matches)), cost
+
+        for (label, landmarks), center, (session_label, (_, continues)) in zip(detections, centers, best):
+            session = self.session(session_label)
+            if label != session_label:
+                self.label_flips += 1
+                session.label_disagreements += 1
+            else:
+                session.label_disagreements = 0
+            if not continues:
+                session.start_track()
+                self.new_tracks += 1
+            session.tracked = True
+            session.missed_frames = 0
+            session.center = center
+            session.raw_landmarks = landmarks
+            session.present = True
+            session.predicted = False
+            session.engine.observe_landmarks(landmarks)
+
+        for session in self.sessions.values():
+            if session.present:
+                continue
+            session.engine.reset_prediction()
+            if session.tracked:
+                session.missed_frames += 1
+                if session.missed_frames > self.max_missed_frames:
+                    session.tracked = False
+                    session.label_disagreements = 0
+        return self.present
+
+    def predict(self, min_confidence: float) -> List[HandSession]:
+        """Extrapolate the hands seen at the last inference (frames without inference)."""
+        self._begin_frame()
+        for session in self.sessions.values():
+            if not session.tracked or session.missed_frames:
+                continue
+            prediction = session.engine.predict_landmarks()
+            if prediction is not None and prediction[1] >= min_confidence:
+                session.raw_landmarks = prediction[0]
+                session.present = True
+                session.predicted = True
+        return self.present
+
+    def roi(self) -> Optional[Tuple[float, float, float, float]]:
+        """Normalized box around all present hands (raw camera orientation), for the motion gate."""
+        hands = [session.raw_landmarks for session in self.present]
+        if not hands:
+            return None
+        points = np.concatenate(hands)
+        return (points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max())
+
+    # --- Calibration profiles ---
+
+    def load_profiles(self, store, profile_key: str, primary_label: str) -> List[HandSession]:
+        """
+        Give every hand its profile key (the primary hand keeps profile_key, the
+        other gets a handedness suffix) and apply saved profiles. Returns the
+        hands that had one.
+        """
+        loaded = []
+        for label in HAND_LABELS:
+            session = self.session(label)
+            session.profile_key = profile_key if label == primary_label else f"{profile_key}:{label.lower()}"
+            profile = store.load(session.profile_key)
+            if profile:
+                session.apply_profile(profile)
+                loaded.append(session)
+        return loaded
+
+    def calibrate(self, store, hands: Optional[List[HandSession]] = None) -> List[HandSession]:
+        """Calibrate hands (default: all present) from their current smoothed pose and save the profiles."""
+        hands = self.present if hands is None else hands
+        for session in hands:
+            profile = CalibrationProfile.from_measurement(measure_calibration(session.smoothed, session.palm_bbox))
+            session.apply_profile(profile)
+            store.save(session.profile_key, profile)
+        return hands
+
+    def save_profiles(self, store):
+        """Persist the background-refined calibration of each calibrated hand that changed since its last save."""
+        for session in self.sessions.values():
+            calibrator = session.movement_controller.calibrator
+            if not session.is_calibrated or not calibrator.has_unsaved_samples:
+                continue
+            refined_profile = calibrator.profile
+            if refined_profile.is_valid:
+                if session.neutral_distances and not refined_profile.neutral_distances:
+                    refined_profile.neutral_distances = dict(session.neutral_distances)
+                if store.save(session.profile_key, refined_profile):
+                    calibrator.mark_saved()
+
+    # --- Per-hand processing ---
+
+    def process(self, system_load: Optional[Callable[[], Tuple[float, float]]] = None) -> List[HandSession]:
+        """
+        Smooth every present hand and run the gesture engine for the calibrated
+        ones. system_load() -> (cpu %, memory %) is sampled once per frame and
+        shared by all hands.
+        """
+        start = time.perf_counter()
+        hands = self.present
+        calibrated = [session for session in hands if session.is_calibrated]
+        cpu_usage, mem_usage = system_load() if system_load and calibrated else (0.0, 0.0)
+        for session in hands:
+            session.smooth(self.smoothing_factor, self.mirrored)
+            if session.is_calibrated:
+                session.process_gestures(cpu_usage, mem_usage)
+        if len(calibrated) in self.gesture_time:
+            self.gesture_time[len(calibrated)].update((time.perf_counter() - start) * 1000)
+        return hands
+
+    def get_stats(self) -> Dict[str, Any]:
+        one, two = self.gesture_time[1], self.gesture_time[2]
+        return {
+            'sessions': sorted(self.sessions),
+            'one_hand_ms': one.mean if one.count else None,
+            'two_hands_ms': two.mean if two.count else None,
+            'second_hand_ratio': two.mean / one.mean if one.count and two.count and one.mean > 0 else None,
+            'label_flips': self.label_flips,
+            'new_tracks': self.new_tracks
+        }
+
+    def format_stats(self) -> str:
+        stats = self.get_stats()
+        parts = []
+        if stats['one_hand_ms'] is not None:
+            parts.append(f"1 hand {stats['one_hand_ms']:.2f}ms")
+        if stats['two_hands_ms'] is not None:
+            parts.append(f"2 hands {stats['two_hands_ms']:.2f}ms")
+        if stats['second_hand_ratio'] is not None:
+            parts.append(f"ratio {stats['second_hand_ratio']:.2f}x")
+        parts.append(f"{stats['label_flips']} label flips, {stats['new_tracks']} new tracks")
+        return " | ".join(parts)
+
+
+def _synthetic_hand(center_x: float, rng: np.random.Generator, jitter: float = 0.004) -> np.ndarray:
+    """Open-palm landmarks around center_x with per-frame jitter (benchmark input)."""
+    wrist = np.array([center_x, 0.75, 0.0])
+    points = [wrist]
+    for finger, spread in enumerate((-0.09, -0.04, 0.0, 0.04, 0.08)):
+        base_y = 0.62 if finger else 0.68
+        for joint in range(4):
+            points.append(wrist + (spread * (1 + 0.2 * joint), base_y - 0.75 - 0.045 * joint, -0.01 * joint))
+    hand = np.array(points)
+    return hand + rng.normal(0.0, jitter, hand.shape)
+
+
+def run_gesture_benchmark(frames: int = 600, seed: int = 0) -> Dict[str, Any]:
+    """Gesture-stage time per frame with one and with two calibrated hands (needs MediaPipe and Numba)."""
+    from .clock import ReplayClock
+    from .calibration_profile import CalibrationProfile
+    import psutil
+    from ..performance.optimized_engine import OptimizedGestureEngine
+
+    clock = ReplayClock()
+    engine = OptimizedGestureEngine(clock=clock)
+    engine.warmup()
+    tracker = HandTracker(lambda label: engine if label == HAND_LABELS[0] else engine.spawn(), clock=clock)
+    for label in HAND_LABELS:
+        # One profile per hand: refinement on one hand must not move the other's calibration
+        tracker.session(label).apply_profile(CalibrationProfile(neutral_area=0.02, sample_count=5))
+
+    rng = np.random.default_rng(seed)
+    results = {}
+    for hands in (1, 2):
+        timing = RunningStats()
+        for frame in range(frames):
+            clock.advance(1.0 / 30)
+            detections = [('Right', _synthetic_hand(0.3, rng))]
+            if hands == 2:
+                detections.append(('Left', _synthetic_hand(0.7, rng)))
+            tracker.assign(detections)
+            start = time.perf_counter()
+            tracker.process(lambda: (psutil.cpu_percent(), psutil.virtual_memory().percent))
+            if frame >= frames // 10:  # Skip warm-up frames
+                timing.update((time.perf_counter() - start) * 1000)
+        results[hands] = timing
+
+    return {
+        'frames': frames,
+        'one_hand_ms': results[1].mean,
+        'two_hands_ms': results[2].mean,
+        'second_hand_ratio': results[2].mean / results[1].mean if results[1].mean > 0 else None,
+        'label_flips': tracker.label_flips
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Two-hand gesture stage benchmark")
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+
+    result = run_gesture_benchmark(args.frames)
+    print(f"✋ Gesture stage over {result['frames']} frames:")
+    print(f"   1 hand {result['one_hand_ms']:.3f}ms | 2 hands {result['two_hands_ms']:.3f}ms | "
+          f"second hand ratio {result['second_hand_ratio']:.2f}x")
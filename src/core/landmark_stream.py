@@ -0,0 +1,420 @@
+"""
+Binary UDP streaming of landmarks and gesture events for AzimuthControl.
+
+Lets recognition run on one machine and the game on another (or in a VM).
+The server pushes one small datagram per frame to every subscribed client;
+clients subscribe by sending a HELLO datagram to the server port every second
+and are dropped when they go quiet.
+
+Framing: every datagram starts with a 20-byte little-endian header
+
+    2s  magic "AZ"
+    B   protocol version
+    B   message type
+    I   sequence number (per server, increments per datagram)
+    I   frame id
+    q   send time, time.time_ns()
+
+followed by a type-specific payload:
+
+    KEYFRAME   21x3 int16 absolute landmarks (quantized, see SCALE)
+    DELTA8     u32 keyframe sequence + 21x3 int8 deltas against that keyframe
+    DELTA16    u32 keyframe sequence + 21x3 int16 deltas (accepted by clients;
+               the server sends a keyframe instead, which is smaller)
+    NO_HAND    empty
+    GESTURE    u8 category + 16s status: a transition in one gesture category
+    STATE      5 x 16s statuses (movement, action, camera, navigation, active)
+
+Landmarks are quantized to int16 at 1/16384 (covers -2..2 in normalized
+coordinates, about 0.06 px error on a 1080p frame). Deltas reference the
+last keyframe, not the previous datagram, so a lost delta costs exactly one
+frame; only a lost keyframe makes the client skip deltas until the next one.
+When the hand has moved too far from the keyframe for int8 deltas a new
+keyframe is sent early. Keyframes (and a full STATE) are also sent
+periodically so losses heal. One-way latency uses wall clocks, so it is
+exact on loopback and as good as NTP/PTP sync between machines.
+
+The server binds to 127.0.0.1 by default. HELLOs are not authenticated, so
+set landmark_stream_host to a LAN address only on a trusted network.
+
+A WebSocket transport would need a third-party dependency, so only UDP is
+provided; `python -m src.core.landmark_stream --loopback` runs a server and
+client in one process as a stand-in, optionally with simulated loss.
+"""
+
+import random
+import socket
+import struct
+import time
+from typing import Dict, Any, Optional, Tuple, List
+
+import numpy as np
+
+from ..utils.streaming_stats import RunningStats, P2Quantile
+
+MAGIC = b"AZ"
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 47800
+
+MSG_HELLO = 0
+MSG_KEYFRAME = 1
+MSG_DELTA8 = 2
+MSG_DELTA16 = 3
+MSG_NO_HAND = 4
+MSG_GESTURE = 5
+MSG_STATE = 6
+
+NUM_LANDMARKS = 21
+SCALE = 16384.0
+STATUS_FIELDS = ('movement', 'action', 'camera', 'navigation', 'active')
+
+HEADER = struct.Struct("<2sBBIIq")
+_BASE = struct.Struct("<I")
+_GESTURE = struct.Struct("<B16s")
+_STATE = struct.Struct("<16s16s16s16s16s")
+
+SUBSCRIBER_TIMEOUT = 5.0
+
+# Exact payload sizes for landmark messages, minimum sizes for the rest
+_LANDMARK_PAYLOAD_SIZES = {
+    MSG_KEYFRAME: NUM_LANDMARKS * 3 * 2,
+    MSG_DELTA8: _BASE.size + NUM_LANDMARKS * 3,
+    MSG_DELTA16: _BASE.size + NUM_LANDMARKS * 3 * 2,
+    MSG_NO_HAND: 0
+}
+_MIN_PAYLOAD_SIZES = {MSG_GESTURE: _GESTURE.size, MSG_STATE: _STATE.size}
+
+
+def quantize(landmarks: np.ndarray) -> np.ndarray:
+    """(21, 3) normalized floats -> int16."""
+    return np.clip(np.rint(np.asarray(landmarks, dtype=np.float64) * SCALE), -32768, 32767).astype(np.int16)
+
+
+def dequantize(quantized: np.ndarray) -> np.ndarray:
+    return quantized.astype(np.float32) / SCALE
+
+
+def _encode(text: Optional[str]) -> bytes:
+    return (text or "NEUTRAL").encode("ascii", "replace")[:16]
+
+
+def _decode(raw: bytes) -> str:
+    return raw.split(b"\0", 1)[0].decode("ascii", "replace")
+
+
+class LandmarkStreamServer:
+    """Publishes landmarks and gesture transitions to subscribed UDP clients."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, keyframe_interval: int = 30):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+
+        self.subscribers: Dict[Tuple[str, int], float] = {}
+        self.sequence = 0
+        self._keyframe: Optional[np.ndarray] = None  # Quantized keyframe deltas are based on
+        self._keyframe_sequence = 0
+        self._frames_since_keyframe = 0
+        self._frames_since_state = 0
+        self._statuses: Dict[str, str] = {}
+
+        self.stats = {'datagrams': 0, 'bytes': 0, 'keyframes': 0, 'deltas': 0, 'gesture_events': 0, 'send_errors': 0}
+
+    def _poll_subscribers(self):
+        now = time.monotonic()
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(64)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break  # e.g. ICMP port unreachable surfaced on Windows
+            if data[:2] == MAGIC and len(data) >= 4 and data[3] == MSG_HELLO:
+                if addr not in self.subscribers:
+                    print(f"📡 Landmark stream subscriber {addr[0]}:{addr[1]}")
+                    # New client needs a keyframe and the full state
+                    self._frames_since_keyframe = self._frames_since_state = self.keyframe_interval
+                self.subscribers[addr] = now
+        for addr, last_seen in list(self.subscribers.items()):
+            if now - last_seen > SUBSCRIBER_TIMEOUT:
+                del self.subscribers[addr]
+
+    def _send(self, msg_type: int, frame_id: int, payload: bytes = b"") -> int:
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        datagram = HEADER.pack(MAGIC, PROTOCOL_VERSION, msg_type, self.sequence, frame_id & 0xFFFFFFFF,
+                               time.time_ns()) + payload
+        for addr in self.subscribers:
+            try:
+                self.sock.sendto(datagram, addr)
+                self.stats['datagrams'] += 1
+                self.stats['bytes'] += len(datagram)
+            except OSError:
+                self.stats['send_errors'] += 1
+        return self.sequence
+
+    def publish_frame(self, frame_id: int, landmarks: Optional[np.ndarray], statuses: Dict[str, str]):
+        """Send this frame's landmarks (None when no hand) and any gesture transitions."""
+        self._poll_subscribers()
+        if not self.subscribers:
+            self._keyframe = None
+            return
+
+        self._frames_since_keyframe += 1
+        if landmarks is None:
+            # Repeated at the keyframe interval so a lost NO_HAND heals too
+            if self._keyframe is not None or self._frames_since_keyframe >= self.keyframe_interval:
+                self._send(MSG_NO_HAND, frame_id)
+                self._frames_since_keyframe = 0
+                self._keyframe = None
+        else:
+            quantized = quantize(landmarks)
+            delta = None
+            if self._keyframe is not None and self._frames_since_keyframe < self.keyframe_interval:
+                delta = quantized.astype(np.int32) - self._keyframe
+                if np.abs(delta).max() > 127:
+                    delta = None  # Moved too far for int8: a keyframe is smaller than an int16 delta
+            if delta is None:
+                self._keyframe_sequence = self._send(MSG_KEYFRAME, frame_id, quantized.tobytes())
+                self._keyframe = quantized.astype(np.int32)
+                self._frames_since_keyframe = 0
+                self.stats['keyframes'] += 1
+            else:
+                self._send(MSG_DELTA8, frame_id, _BASE.pack(self._keyframe_sequence) + delta.astype(np.int8).tobytes())
+                self.stats['deltas'] += 1
+
+        for index, name in enumerate(STATUS_FIELDS):
+            status = statuses.get(name, "NEUTRAL")
+            if self._statuses.get(name, "NEUTRAL") != status:
+                self._send(MSG_GESTURE, frame_id, _GESTURE.pack(index, _encode(status)))
+                self.stats['gesture_events'] += 1
+        self._statuses = dict(statuses)
+        self._frames_since_state += 1
+        if self._frames_since_state >= self.keyframe_interval:
+            # Full state at the keyframe interval so lost transitions heal
+            self._send(MSG_STATE, frame_id, _STATE.pack(*(_encode(self._statuses.get(n)) for n in STATUS_FIELDS)))
+            self._frames_since_state = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['subscribers'] = len(self.subscribers)
+        stats['avg_datagram_bytes'] = stats['bytes'] / stats['datagrams'] if stats['datagrams'] else 0.0
+        return stats
+
+    def close(self):
+        self.sock.close()
+
+
+class LandmarkStreamClient:
+    """Subscribes to a server, reconstructs landmarks and gesture state, and measures latency and loss."""
+
+    def __init__(self, server_host: str = "127.0.0.1", port: int = DEFAULT_PORT, hello_interval: float = 1.0):
+        self.server = (server_host, port)
+        self.hello_interval = hello_interval
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("0.0.0.0", 0))
+        self._last_hello = 0.0
+
+        self.landmarks: Optional[np.ndarray] = None  # (21, 3) float32, None when no hand
+        self.statuses: Dict[str, str] = {name: "NEUTRAL" for name in STATUS_FIELDS}
+        self.frame_id = 0
+        self.events: List[Tuple[str, str]] = []  # (category, status) transitions since last drain
+
+        self._keyframe: Optional[np.ndarray] = None  # Last keyframe received, base of the deltas
+        self._keyframe_sequence = None
+        self._expected_sequence = None
+
+        self.latency_ms = RunningStats()
+        self.latency_p50 = P2Quantile(0.5)
+        self.latency_p99 = P2Quantile(0.99)
+        self.stats = {'received': 0, 'lost': 0, 'out_of_order': 0, 'bytes': 0, 'deltas_skipped': 0, 'invalid': 0}
+
+    def subscribe(self):
+        """Send a HELLO if due; the server drops clients that stop sending them."""
+        now = time.monotonic()
+        if now - self._last_hello >= self.hello_interval:
+            hello = HEADER.pack(MAGIC, PROTOCOL_VERSION, MSG_HELLO, 0, 0, time.time_ns())
+            try:
+                self.sock.sendto(hello, self.server)
+            except OSError:
+                pass
+            self._last_hello = now
+
+    def receive(self, timeout: float = 0.1) -> bool:
+        """Process one datagram if one arrives within timeout. Returns whether one did."""
+        self.subscribe()
+        self.sock.settimeout(timeout)
+        try:
+            datagram = self.sock.recv(2048)
+        except (socket.timeout, BlockingIOError):
+            return False
+        except OSError:
+            return False  # Server not up yet (ICMP unreachable on Windows)
+        self.handle_datagram(datagram, time.time_ns())
+        return True
+
+    def handle_datagram(self, datagram: bytes, received_ns: int):
+        if len(datagram) < HEADER.size:
+            self.stats['invalid'] += 1
+            return
+        magic, version, msg_type, sequence, frame_id, sent_ns = HEADER.unpack_from(datagram)
+        if magic != MAGIC or version != PROTOCOL_VERSION:
+            self.stats['invalid'] += 1
+            return
+        payload = datagram[HEADER.size:]
+        expected_size = _LANDMARK_PAYLOAD_SIZES.get(msg_type)
+        if ((expected_size is not None and len(payload) != expected_size)
+                or len(payload) < _MIN_PAYLOAD_SIZES.get(msg_type, 0)):
+            self.stats['invalid'] += 1
+            return
+
+        self.stats['received'] += 1
+        self.stats['bytes'] += len(datagram)
+        if self._expected_sequence is not None:
+            gap = (sequence - self._expected_sequence) & 0xFFFFFFFF
+            if gap >= 0x80000000:
+                self.stats['out_of_order'] += 1
+                return  # Older than what we have; landmarks would go backwards
+            self.stats['lost'] += gap
+        self._expected_sequence = (sequence + 1) & 0xFFFFFFFF
+
+        latency = (received_ns - sent_ns) / 1e6
+        self.latency_ms.update(latency)
+        self.latency_p50.update(latency)
+        self.latency_p99.update(latency)
+
+        if msg_type == MSG_KEYFRAME:
+            self._keyframe = np.frombuffer(payload, dtype=np.int16).reshape(NUM_LANDMARKS, 3).astype(np.int32)
+            self._keyframe_sequence = sequence
+            self._set_landmarks(self._keyframe, frame_id)
+        elif msg_type in (MSG_DELTA8, MSG_DELTA16):
+            base = _BASE.unpack_from(payload)[0]
+            if self._keyframe is None or base != self._keyframe_sequence:
+                self.stats['deltas_skipped'] += 1  # Missing the keyframe; wait for the next one
+                return
+            dtype = np.int8 if msg_type == MSG_DELTA8 else np.int16
+            delta = np.frombuffer(payload, dtype=dtype, offset=_BASE.size).reshape(NUM_LANDMARKS, 3)
+            self._set_landmarks(self._keyframe + delta, frame_id)
+        elif msg_type == MSG_NO_HAND:
+            self.landmarks = None
+            self._keyframe = None
+            self.frame_id = frame_id
+        elif msg_type == MSG_GESTURE:
+            index, raw = _GESTURE.unpack_from(payload)
+            if index < len(STATUS_FIELDS):
+                self.statuses[STATUS_FIELDS[index]] = _decode(raw)
+                self.events.append((STATUS_FIELDS[index], _decode(raw)))
+        elif msg_type == MSG_STATE:
+            for name, raw in zip(STATUS_FIELDS, _STATE.unpack_from(payload)):
+                self.statuses[name] = _decode(raw)
+
+    def _set_landmarks(self, quantized: np.ndarray, frame_id: int):
+        self.landmarks = dequantize(quantized)
+        self.frame_id = frame_id
+
+    def drain_events(self) -> List[Tuple[str, str]]:
+        events, self.events = self.events, []
+        return events
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        expected = stats['received'] + stats['lost']
+        stats['loss_rate'] = stats['lost'] / expected if expected else 0.0
+        stats['avg_datagram_bytes'] = stats['bytes'] / stats['received'] if stats['received'] else 0.0
+        stats['latency_mean_ms'] = self.latency_ms.mean
+        stats['latency_p50_ms'] = self.latency_p50.value
+        stats['latency_p99_ms'] = self.latency_p99.value
+        stats['latency_max_ms'] = self.latency_ms.max if self.latency_ms.count else None
+        return stats
+
+    def close(self):
+        self.sock.close()
+
+
+def run_loopback_test(frames: int = 600, drop_rate: float = 0.0, keyframe_interval: int = 30,
+                      port: int = 0) -> Dict[str, Any]:
+    """
+    Server and client over 127.0.0.1 in one process with a synthetic moving hand.
+    drop_rate discards that fraction of datagrams at the client to simulate loss.
+    """
+    server = LandmarkStreamServer("127.0.0.1", port, keyframe_interval)
+    client = LandmarkStreamClient("127.0.0.1", server.address[1])
+    client.subscribe()
+    server._poll_subscribers()
+    deadline = time.monotonic() + 1.0
+    while not server.subscribers and time.monotonic() < deadline:
+        time.sleep(0.01)
+        server._poll_subscribers()
+
+    rng = np.random.default_rng(0)
+    hand = rng.uniform(0.3, 0.7, (NUM_LANDMARKS, 3)).astype(np.float64)
+    hand[:, 2] -= 0.5
+    max_error = 0.0
+    gestures = ["NEUTRAL", "FORWARD", "LEFT", "NEUTRAL", "JUMP"]
+    for frame_id in range(1, frames + 1):
+        hand += rng.normal(0, 0.002, hand.shape)  # Per-frame hand motion
+        present = (frame_id // 90) % 4 != 3  # Hand leaves the view now and then
+        statuses = {'movement': gestures[(frame_id // 45) % len(gestures)]}
+        statuses['active'] = statuses['movement']
+        server.publish_frame(frame_id, hand if present else None, statuses)
+
+        while True:
+            client.sock.settimeout(0.0)
+            try:
+                datagram = client.sock.recv(2048)
+            except (BlockingIOError, socket.timeout, OSError):
+                break
+            if drop_rate and random.random() < drop_rate:
+                continue
+            client.handle_datagram(datagram, time.time_ns())
+        if present and client.landmarks is not None and client.frame_id == frame_id:
+            max_error = max(max_error, float(np.abs(client.landmarks - hand).max()))
+
+    result = {'server': server.get_stats(), 'client': client.get_stats(),
+              'max_reconstruction_error': max_error, 'raw_float32_bytes': NUM_LANDMARKS * 3 * 4 + HEADER.size}
+    server.close()
+    client.close()
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Landmark stream client / loopback test")
+    parser.add_argument("--loopback", action="store_true", help="Run server and client in-process over 127.0.0.1")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--drop", type=float, default=0.0, help="Simulated loss rate for --loopback (0-1)")
+    parser.add_argument("--host", default="127.0.0.1", help="Server to subscribe to")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    if args.loopback:
+        result = run_loopback_test(args.frames, args.drop)
+        server_stats, client_stats = result['server'], result['client']
+        print(f"📡 Loopback stream, {args.frames} frames, simulated loss {args.drop * 100:.0f}%:")
+        print(f"   server: {server_stats['datagrams']} datagrams, avg {server_stats['avg_datagram_bytes']:.0f} B "
+              f"(float32 frame would be {result['raw_float32_bytes']} B), {server_stats['keyframes']} keyframes, "
+              f"{server_stats['gesture_events']} gesture events")
+        print(f"   client: received {client_stats['received']}, lost {client_stats['lost']} "
+              f"({client_stats['loss_rate'] * 100:.1f}%), deltas skipped {client_stats['deltas_skipped']}")
+        print(f"   latency mean {client_stats['latency_mean_ms']:.3f}ms | p50 {client_stats['latency_p50_ms']:.3f}ms | "
+              f"p99 {client_stats['latency_p99_ms']:.3f}ms")
+        print(f"   max reconstruction error {result['max_reconstruction_error']:.6f} (normalized)")
+    else:
+        client = LandmarkStreamClient(args.host, args.port)
+        print(f"Subscribing to {args.host}:{args.port} (Ctrl+C to stop)")
+        last_report = time.monotonic()
+        try:
+            while True:
+                client.receive(0.5)
+                for category, status in client.drain_events():
+                    print(f"🎮 {category}: {status}")
+                if time.monotonic() - last_report > 5.0:
+                    stats = client.get_stats()
+                    print(f"📊 frame {client.frame_id} | loss {stats['loss_rate'] * 100:.1f}% | "
+                          f"latency p50 {stats['latency_p50_ms'] or 0:.2f}ms p99 {stats['latency_p99_ms'] or 0:.2f}ms")
+                    last_report = time.monotonic()
+        except KeyboardInterrupt:
+            pass
+        client.close()
@@ -0,0 +1,186 @@
+"""
+Non-blocking logging for AzimuthControl.
+
+Runtime messages on the frame path (gesture handlers, engine and frame
+processor error handlers, the main loop's periodic reports) go through the
+standard logging module, but the only work done on the calling thread is
+building the record and appending it to an unbounded SimpleQueue - no handler
+lock and no terminal or file I/O. A QueueListener thread formats and writes
+them to the console and, optionally, a JSON-lines file.
+
+Repeated messages are rate limited before they are enqueued: each distinct
+message (logger, level and format string) may burst a few times per interval,
+after which it is suppressed and the suppressed count is attached to the next
+record that gets through.
+
+Modules keep using logging.getLogger(__name__); call setup_logging() once at
+startup and shutdown_logging() at exit to flush the queue.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets each distinct message through at most `burst` times per `interval` seconds."""
+
+    def __init__(self, interval: float = 5.0, burst: int = 3):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows: Dict[Tuple[str, int, Any], list] = {}  # key -> [window start, count, suppressed]
+        self.suppressed_total = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.interval <= 0:
+            return True
+        key = (record.name, record.levelno, record.msg)
+        now = record.created
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        self.suppressed_total += 1
+        return False
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record; `extra=` fields become top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 6),
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Plain message text, matching the rest of the console output."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f" (repeated message suppressed {suppressed}x)"
+        return text
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that skips the per-handler lock; SimpleQueue.put is already thread-safe."""
+
+    def handle(self, record: logging.LogRecord):
+        # Handler.handle() minus acquire()/release(). The lock itself stays, so
+        # code that takes handler.lock directly (e.g. Python 3.13's handle) still works.
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args into the message now (they may be mutated later) but leave
+        # the expensive formatting (timestamps, JSON, tracebacks) to the listener
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: str = "INFO", json_path: Optional[str] = None, json_console: bool = False,
+                  rate_limit_interval: float = 5.0, rate_limit_burst: int = 3) -> logging.Logger:
+    """
+    Route all logging through the background writer. Replaces any handlers
+    already on the root logger (e.g. from an earlier basicConfig).
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(JsonLinesFormatter() if json_console else ConsoleFormatter("%(message)s"))
+    handlers = [console]
+    if json_path:
+        path = Path(json_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(path, encoding='utf-8')
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(RateLimitFilter(rate_limit_interval, rate_limit_burst))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return root
+
+
+def setup_logging_from_config(system_config: Dict[str, Any]) -> logging.Logger:
+    """setup_logging() with the log_* keys from system_settings."""
+    return setup_logging(
+        level=system_config.get('log_level', 'INFO'),
+        json_path=system_config.get('log_file'),
+        json_console=system_config.get('log_json_console', False),
+        rate_limit_interval=system_config.get('log_rate_limit_interval', 5.0),
+        rate_limit_burst=system_config.get('log_rate_limit_burst', 3)
+    )
+
+
+def get_suppressed_count() -> int:
+    """Messages dropped by the rate limiter so far."""
+    if _queue_handler is None:
+        return 0
+    return sum(f.suppressed_total for f in _queue_handler.filters if isinstance(f, RateLimitFilter))
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()  # Drains the queue before returning
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
@@ -0,0 +1,400 @@
+"""
+Multi-station session server for AzimuthControl.
+
+Hosts several independent stations in one process. Each StationSession has its
+own:
+- capture source (camera or replayed file) and clock
+- resolution governor (its own FrameProcessorWrapper)
+- hands, with their own engines, calibration and gesture state
+- optional shared-memory gesture channel
+
+Nothing per-station goes through the module-level defaults
+(get_movement_controller, get_determinator, get_frame_processor).
+
+MediaPipe inference for all sessions runs on a shared InferencePool of worker
+processes. Each session thread captures, downscales, submits its frame and
+waits for the result, then runs tracking and gestures locally. So a host runs
+one interpreter and a few MediaPipe workers instead of one full
+hand_control.py per station.
+
+Stations come from system_settings.stations in controls.json, e.g.
+    {"name": "left-desk", "camera_index": 0, "profile_user": "alice",
+     "gesture_channel_path": "/dev/shm/azimuth_left"}
+    {"name": "replay-1", "replay_source": "session.mp4", "paced": true}
+
+    python -m src.core.session_manager                      # stations from config
+    python -m src.core.session_manager --replay a.mp4 b.mp4 # one station per file
+    python -m src.core.session_manager --bench 4 --replay a.mp4
+"""
+
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import cv2
+
+from .calibration_profile import CalibrationProfileStore, make_profile_key
+from .clock import ReplayClock, SystemClock
+from .config_manager import get_system_config, get_performance_config
+from .gesture_channel import GestureStateWriter
+from .hand_tracker import HandTracker
+from ..capture.backends import open_camera
+from ..performance.frame_processor import FrameProcessorWrapper
+from ..performance.inference_pool import InferencePool
+from ..performance.thread_budget import get_thread_budget, pin_current_thread, PIPELINE
+from ..utils.streaming_stats import RunningStats, P2Quantile
+
+logger = logging.getLogger(__name__)
+
+
+def hands_settings_from_config(performance_config: Dict[str, Any]) -> Dict[str, Any]:
+    """MediaPipe Hands arguments for the inference workers, from performance_settings."""
+    return {
+        'max_num_hands': performance_config.get('max_num_hands', 2),
+        'model_complexity': performance_config.get('model_complexity', 1),
+        'min_detection_confidence': performance_config.get('detection_confidence', 0.8),
+        'min_tracking_confidence': performance_config.get('tracking_confidence', 0.5)
+    }
+
+
+class SystemLoadSampler:
+    """CPU/memory load shared by all sessions, refreshed at most every `interval` seconds."""
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self._value = (0.0, 0.0)
+        self._time = None
+
+    def __call__(self):
+        now = time.perf_counter()
+        if self._time is None or now - self._time >= self.interval:
+            import psutil
+            self._time = now
+            self._value = (psutil.cpu_percent(), psutil.virtual_memory().percent)
+        return self._value
+
+
+class StationSession:
+    """One station: capture, clock, resolution governor, hands and outputs, run on its own thread."""
+
+    def __init__(self, station: Dict[str, Any], pool: InferencePool, engine_factory, profile_store,
+                 performance_config: Dict[str, Any], load_sampler=None):
+        self.name = station['name']
+        self.station = station
+        self.pool = pool
+        self.replay_source = station.get('replay_source')
+        self.camera_index = station.get('camera_index', 0)
+        self.max_frames = station.get('max_frames')  # Stop after this many frames (benchmarks)
+        self.auto_calibrate = station.get('auto_calibrate', False)  # Calibrate each hand on first sight
+        self.inference_timeout = performance_config.get('inference_timeout_s', 5.0)
+        self.load_sampler = load_sampler
+        self.clock = ReplayClock() if self.replay_source else SystemClock()
+
+        # Per-station resolution governor (no shared get_frame_processor())
+        self.frame_processor = FrameProcessorWrapper()
+
+        primary_label = station.get('primary_hand', 'Right')
+        self.tracker = HandTracker(lambda label: engine_factory(self.clock),
+                                   performance_config.get('smoothing_factor', 3), station.get('mirror_camera', False),
+                                   performance_config.get('hand_track_max_jump', 0.15),
+                                   performance_config.get('hand_track_max_missed_frames', 5),
+                                   performance_config.get('hand_track_label_patience', 1), clock=self.clock)
+        self.primary_hand = self.tracker.session(primary_label)
+        self.profile_store = profile_store
+        profile_key = station.get('profile_key') or make_profile_key(self.camera_index, station.get('profile_user'))
+        self.tracker.load_profiles(profile_store, profile_key, primary_label)
+
+        self.gesture_channel = None
+        if station.get('gesture_channel_path'):
+            self.gesture_channel = GestureStateWriter(station['gesture_channel_path'])
+
+        self.cap = None
+        self.frames = 0
+        self.inference_errors = 0
+        self.frame_ms = RunningStats()
+        self.frame_p95 = P2Quantile(0.95)
+        self.inference_ms = RunningStats()
+        self.wait_ms = RunningStats()  # Round trip minus worker inference: queueing and transfer
+        self.started_at = None
+        self.finished_at = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._calibrate = threading.Event()
+
+    # --- Lifecycle ---
+
+    def open(self) -> bool:
+        self.cap = open_camera(self.camera_index, self.station.get('width', 1280), self.station.get('height', 720),
+                               self.station.get('fps', 30), self.station.get('camera_backend', 'auto'),
+                               self.station.get('camera_buffer_size', 1), replay_source=self.replay_source,
+                               paced=self.station.get('paced', False), loop=self.station.get('loop', False))
+        if self.cap is None:
+            print(f"❌ Station '{self.name}': could not open {self.replay_source or f'camera {self.camera_index}'}")
+            return False
+        return True
+
+    def start(self) -> bool:
+        if self.cap is None and not self.open():
+            return False
+        self.pool.register_session(self.name)
+        self._stop.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name=f"Station-{self.name}", daemon=True)
+        self._thread.start()
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def request_calibration(self):
+        """Calibrate the hands in view on the next processed frame."""
+        self._calibrate.set()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self):
+        self.stop()
+        self.tracker.save_profiles(self.profile_store)
+        self.pool.unregister_session(self.name)
+        if self.gesture_channel:
+            self.gesture_channel.close()
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    # --- Frame loop ---
+
+    def _run(self):
+        pin_current_thread(PIPELINE)
+        fps = self.cap.mode.fps or 30
+        while not self._stop.is_set():
+            success, image = self.cap.read()
+            if not success:
+                if self.replay_source:
+                    break
+                continue
+            frame_start = time.perf_counter()
+            self.frames += 1
+
+            if self.replay_source:
+                # Replays drive time from frame timestamps, as in hand_control.py
+                frame_timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                if frame_timestamp > self.clock.now():
+                    self.clock.set_time(frame_timestamp)
+                else:
+                    self.clock.advance(1.0 / fps)
+
+            downscale, width, height = self.frame_processor.should_downscale_frame(image.shape[1], image.shape[0])
+            if downscale:
+                image = cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+            submit_time = time.perf_counter()
+            try:
+                detections, inference_ms = self.pool.infer(self.name, rgb_image, self.inference_timeout)
+            except Exception as e:
+                self.inference_errors += 1
+                logger.warning("Station %s: inference failed: %s", self.name, e)
+                continue
+            self.inference_ms.update(inference_ms)
+            self.wait_ms.update((time.perf_counter() - submit_time) * 1000 - inference_ms)
+            self.frame_processor.update_processing_stats(inference_ms)
+
+            hands = self.tracker.observe_detections(detections)
+            self.tracker.process(self.load_sampler)
+
+            if self._calibrate.is_set() and hands:
+                self._calibrate.clear()
+                for hand in self.tracker.calibrate(self.profile_store):
+                    print(f"✅ Station '{self.name}': {hand.label} hand calibrated ('{hand.profile_key}')")
+            elif self.auto_calibrate:
+                uncalibrated = [hand for hand in hands if not hand.is_calibrated]
+                if uncalibrated:
+                    self.tracker.calibrate(self.profile_store, uncalibrated)
+
+            if self.gesture_channel:
+                primary = self.primary_hand
+                self.gesture_channel.publish(dict(primary.statuses, active=primary.active_gesture),
+                                             hand_present=primary.present, calibrated=primary.is_calibrated,
+                                             analog={'inference_ms': inference_ms}, frame_id=self.frames)
+
+            frame_ms = (time.perf_counter() - frame_start) * 1000
+            self.frame_ms.update(frame_ms)
+            self.frame_p95.update(frame_ms)
+            if self.max_frames and self.frames >= self.max_frames:
+                break
+        self.finished_at = time.perf_counter()
+
+    # --- Stats ---
+
+    def get_stats(self) -> Dict[str, Any]:
+        end = self.finished_at or time.perf_counter()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            'name': self.name,
+            'frames': self.frames,
+            'fps': self.frames / elapsed if elapsed > 0 else 0.0,
+            'frame_ms': self.frame_ms.mean,
+            'frame_p95_ms': self.frame_p95.value or 0.0,
+            'inference_ms': self.inference_ms.mean,
+            'wait_ms': self.wait_ms.mean,
+            'inference_errors': self.inference_errors,
+            'hands': {hand.label: hand.active_gesture for hand in self.tracker.present},
+            'worker': self.pool.session_workers.get(self.name)
+        }
+
+
+class SessionManager:
+    """Runs N StationSessions on one shared InferencePool."""
+
+    def __init__(self, stations: Optional[List[Dict[str, Any]]] = None, workers: Optional[int] = None,
+                 profile_path: Optional[str] = None, performance_config: Optional[Dict[str, Any]] = None):
+        self.performance_config = performance_config if performance_config is not None else get_performance_config()
+        workers = workers or self.performance_config.get('inference_workers')
+        self.pool = InferencePool(workers, hands_settings_from_config(self.performance_config))
+        self.profile_store = CalibrationProfileStore(profile_path)
+        self.load_sampler = SystemLoadSampler()
+        self.sessions: Dict[str, StationSession] = {}
+        self._template_engine = None
+        for station in stations or []:
+            self.add_session(station)
+
+    def _create_engine(self, clock):
+        """Gesture engine for one hand of one station; all share one warmed-up template's stateless parts."""
+        if self._template_engine is None:
+            from ..performance.optimized_engine import OptimizedGestureEngine
+            self._template_engine = OptimizedGestureEngine()
+            get_thread_budget().apply_numba()
+            self._template_engine.warmup()
+        return self._template_engine.spawn(clock=clock)
+
+    def add_session(self, station: Dict[str, Any]) -> StationSession:
+        if station['name'] in self.sessions:
+            raise ValueError(f"Duplicate station name '{station['name']}'")
+        session = StationSession(station, self.pool, self._create_engine, self.profile_store,
+                                 self.performance_config, self.load_sampler)
+        self.sessions[session.name] = session
+        if self.pool.running:
+            session.start()
+        return session
+
+    def start(self):
+        """Start the inference workers (waits until they are ready), then every station."""
+        print(f"🧵 Starting {self.pool.worker_count} inference worker(s) for {len(self.sessions)} station(s)...")
+        self.pool.start()
+        for session in self.sessions.values():
+            session.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all stations to finish (replays end); returns False on timeout."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for session in self.sessions.values():
+            while session.running:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return False
+                session.join(0.2)
+        return True
+
+    def close(self):
+        for session in self.sessions.values():
+            session.close()
+        self.pool.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'sessions': [session.get_stats() for session in self.sessions.values()],
+                'pool': self.pool.get_stats()}
+
+    def print_stats(self):
+        stats = self.get_stats()
+        for s in stats['sessions']:
+            print(f"🖥️  {s['name']:<14} worker {s['worker']} | {s['frames']} frames {s['fps']:.1f} FPS | "
+                  f"frame {s['frame_ms']:.1f}ms (p95 {s['frame_p95_ms']:.1f}) | inference {s['inference_ms']:.1f}ms "
+                  f"+ wait {s['wait_ms']:.1f}ms | hands {s['hands'] or '-'}")
+        for index, worker in enumerate(stats['pool']['workers']):
+            print(f"🧵 worker {index}: {worker['sessions']} session(s), {worker['requests']} requests, "
+                  f"busy {worker['utilization'] * 100:.0f}%{'' if worker['alive'] else ' (DEAD)'}")
+
+
+def run_scaling_benchmark(replay_source: str, max_sessions: int, frames: int = 300,
+                          workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Replay the same file unpaced in 1..max_sessions sessions on one pool; aggregate throughput per N."""
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for count in range(1, max_sessions + 1):
+            stations = [{'name': f"bench-{i}", 'replay_source': replay_source, 'max_frames': frames,
+                         'auto_calibrate': True, 'profile_key': f"bench-{i}"} for i in range(count)]
+            manager = SessionManager(stations, workers, profile_path=str(Path(scratch) / "profiles.json"))
+            manager.pool.start()  # Worker start-up is not part of the measurement
+            start = time.perf_counter()
+            for session in manager.sessions.values():
+                session.start()
+            manager.wait()
+            elapsed = time.perf_counter() - start
+            stats = manager.get_stats()
+            manager.close()
+
+            sessions = stats['sessions']
+            total_frames = sum(s['frames'] for s in sessions)
+            results.append({
+                'sessions': count,
+                'workers': manager.pool.worker_count,
+                'total_fps': total_frames / elapsed if elapsed > 0 else 0.0,
+                'session_fps': sum(s['fps'] for s in sessions) / count,
+                'frame_ms': sum(s['frame_ms'] for s in sessions) / count,
+                'frame_p95_ms': max(s['frame_p95_ms'] for s in sessions),
+                'inference_ms': sum(s['inference_ms'] for s in sessions) / count,
+                'wait_ms': sum(s['wait_ms'] for s in sessions) / count,
+                'errors': sum(s['inference_errors'] for s in sessions)
+            })
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host several AzimuthControl stations on one inference pool")
+    parser.add_argument("--replay", nargs="+", help="Replay these files, one station each (default: config stations)")
+    parser.add_argument("--workers", type=int, help="Inference worker processes (default: the thread budget's inference_workers)")
+    parser.add_argument("--bench", type=int, metavar="N", help="Scaling benchmark over 1..N replayed sessions")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per session for --bench")
+    args = parser.parse_args()
+
+    if args.bench:
+        if not args.replay:
+            parser.error("--bench needs --replay FILE")
+        print(f"📈 Session scaling: {args.replay[0]}, {args.frames} frames per session")
+        print(f"{'sessions':>8} {'workers':>7} {'total FPS':>10} {'FPS/session':>12} {'frame ms':>9} "
+              f"{'p95 ms':>7} {'infer ms':>9} {'wait ms':>8}")
+        for row in run_scaling_benchmark(args.replay[0], args.bench, args.frames, args.workers):
+            print(f"{row['sessions']:>8} {row['workers']:>7} {row['total_fps']:>10.1f} {row['session_fps']:>12.1f} "
+                  f"{row['frame_ms']:>9.1f} {row['frame_p95_ms']:>7.1f} {row['inference_ms']:>9.1f} {row['wait_ms']:>8.1f}"
+                  + (f"  ({row['errors']} errors)" if row['errors'] else ""))
+    else:
+        if args.replay:
+            stations = [{'name': Path(path).stem, 'replay_source': path, 'paced': True} for path in args.replay]
+        else:
+            stations = get_system_config().get('stations') or []
+        if not stations:
+            parser.error("no stations: add system_settings.stations to controls.json or pass --replay")
+
+        manager = SessionManager(stations, args.workers)
+        manager.start()
+        try:
+            while not manager.wait(timeout=5.0):
+                manager.print_stats()
+        except KeyboardInterrupt:
+            pass
+        manager.close()
+        manager.print_stats()
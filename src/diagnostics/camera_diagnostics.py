@@ -13,30 +13,35 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.core.config_manager import get_system_config
+from src.capture.camera_probe import probe_cameras, CameraCapabilityCache
 
 
-def detect_available_cameras():
-    """Detect all available cameras on the system."""
+def detect_available_cameras(full_probe=False, timeout=5.0):
+    """Detect all available cameras on the system (probed concurrently)."""
     print("=== Available Cameras ===")
     available_cameras = []
     
-    for i in range(10):  # Check first 10 camera indices
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            ret, frame = cap.read()
-            if ret and frame is not None:
-                height, width = frame.shape[:2]
-                available_cameras.append({
-                    'index': i,
-                    'resolution': f"{width}x{height}",
-                    'working': True
-                })
-                print(f"✅ Camera {i}: Available ({width}x{height})")
-            else:
-                print(f"⚠️  Camera {i}: Detected but no frame")
+    # Check first 10 camera indices in parallel
+    cache = CameraCapabilityCache()
+    for result in probe_cameras(range(10), timeout=timeout, full=full_probe):
+        i = result['index']
+        if result['available']:
+            width, height = result['default_resolution']
+            available_cameras.append({
+                'index': i,
+                'resolution': f"{width}x{height}",
+                'working': True
+            })
+            print(f"✅ Camera {i}: Available ({width}x{height}, {result.get('backend', '?')}, "
+                  f"opened in {result.get('open_ms', 0):.0f}ms) [{result['identity']}]")
+            for mode in result['modes']:
+                print(f"   {mode['width']}x{mode['height']} {mode['fourcc']}: {mode['fps']:.1f} FPS delivered")
+            if full_probe:
+                cache.put(result)
+        elif result.get('timed_out'):
+            print(f"⏱️  Camera {i}: No response within {timeout:.0f}s")
         else:
             print(f"❌ Camera {i}: Not available")
-        cap.release()
     
     return available_cameras
 
@@ -107,6 +112,14 @@ def recommend_settings(available_cameras):
 
 
 if __name__ == "__main__":
-    available_cameras = detect_available_cameras()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Detect cameras and test camera configuration")
+    parser.add_argument('--full', action='store_true',
+                        help='Measure supported modes and delivered FPS, and refresh the capability cache')
+    parser.add_argument('--timeout', type=float, default=5.0, help='Per-probe timeout in seconds')
+    
+    args = parser.parse_args()
+    available_cameras = detect_available_cameras(args.full, args.timeout)
     show_current_config()
     recommend_settings(available_cameras)
@@ -14,6 +14,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.controls.movement_control import get_movement_controller
+from src.utils.streaming_stats import RollingMean
 
 
 def analyze_current_settings():
@@ -149,9 +150,9 @@ def test_detection_logic():
             'height': test_area ** 0.5
         }
         
-        # Temporarily modify area history for testing
-        original_history = controller.area_history.copy()
-        controller.area_history = [test_area] * controller.history_size
+        # Temporarily replace the area history so only the test area is averaged
+        original_history = controller.area_history
+        controller.area_history = RollingMean(controller.history_size)
         
         detection = controller.detect_depth_movement(mock_palm_bbox)
         
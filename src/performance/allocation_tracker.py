@@ -0,0 +1,190 @@
+"""
+Per-stage allocation tracking for AzimuthControl.
+
+Instrumentation mode for finding per-frame garbage. The main loop marks stage
+boundaries (capture, inference, landmarks, gestures, display, ...) and for
+each stage of each frame the tracker records, via tracemalloc:
+
+- transient bytes: the allocation high-water mark reached inside the stage
+  (tracemalloc.reset_peak at stage start), i.e. memory allocated and possibly
+  freed again - the garbage that drives the allocator and the GC
+- net bytes/blocks: memory the stage left allocated when it finished
+
+A gc.callbacks hook times every collection and attributes the pause to the
+stage that was running, so frame hitches can be matched to GC generations.
+Allocation sites are reported by comparing tracemalloc snapshots taken after
+warm-up and at report time (growth per source line).
+
+tracemalloc slows allocation down considerably, so this is opt-in and the
+absolute timings it produces are not representative - use it for bytes and
+objects, not for latency.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+
+_SITE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class AllocationTracker:
+    """Attributes allocations and GC pauses to pipeline stages, frame by frame."""
+
+    def __init__(self, enabled: bool = False, warmup_frames: int = 60, traceback_frames: int = 1,
+                 gc_pause_warn_ms: float = 5.0):
+        self.enabled = enabled
+        self.warmup_frames = warmup_frames
+        self.traceback_frames = traceback_frames
+        self.gc_pause_warn_ms = gc_pause_warn_ms
+
+        self.frames = 0
+        self.stage_totals: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {'frames': 0, 'transient_bytes': 0, 'net_bytes': 0, 'net_blocks': 0, 'max_transient_bytes': 0})
+        self.gc_pauses: List[Dict[str, Any]] = []
+        self.gc_totals = {gen: {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'collected': 0} for gen in range(3)}
+
+        self._stage = None
+        self._stage_memory = 0
+        self._stage_blocks = 0
+        self._gc_start = None
+        self._baseline = None
+        self._started = False
+        self._owns_tracing = False  # Whether start() began tracing (tracing set up elsewhere is left running)
+
+        if enabled:
+            self.start()
+
+    def start(self):
+        if self._started:
+            return
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start(self.traceback_frames)
+        gc.callbacks.append(self._gc_callback)
+        self.enabled = self._started = True
+
+    def stop(self):
+        if not self._started:
+            return
+        self.mark(None)
+        if self._gc_callback in gc.callbacks:
+            gc.callbacks.remove(self._gc_callback)
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        self.enabled = self._started = False
+
+    # --- Stage and frame boundaries ---
+
+    def mark(self, stage: Optional[str]):
+        """End the current stage (if any) and begin `stage` (None just ends it)."""
+        if not self.enabled:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        if self._stage is not None:
+            totals = self.stage_totals[self._stage]
+            transient = max(0, peak - self._stage_memory)
+            totals['frames'] += 1
+            totals['transient_bytes'] += transient
+            totals['net_bytes'] += current - self._stage_memory
+            totals['net_blocks'] += blocks - self._stage_blocks
+            totals['max_transient_bytes'] = max(totals['max_transient_bytes'], transient)
+        self._stage = stage
+        if stage is not None:
+            tracemalloc.reset_peak()
+            # Re-read after our own bookkeeping so it is not charged to the stage
+            self._stage_memory = tracemalloc.get_traced_memory()[0]
+            self._stage_blocks = sys.getallocatedblocks()
+
+    def end_frame(self):
+        """Close the frame's last stage. Takes the warm-up baseline when due."""
+        if not self.enabled:
+            return
+        self.mark(None)
+        self.frames += 1
+        if self.frames == self.warmup_frames:
+            self._baseline = tracemalloc.take_snapshot().filter_traces(_SITE_FILTERS)
+
+    def _gc_callback(self, phase: str, info: Dict[str, Any]):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+            return
+        if self._gc_start is None:
+            return
+        pause_ms = (time.perf_counter() - self._gc_start) * 1000
+        self._gc_start = None
+        generation = info.get('generation', 0)
+        totals = self.gc_totals[generation]
+        totals['count'] += 1
+        totals['total_ms'] += pause_ms
+        totals['max_ms'] = max(totals['max_ms'], pause_ms)
+        totals['collected'] += info.get('collected', 0)
+        if pause_ms >= self.gc_pause_warn_ms:
+            self.gc_pauses.append({'frame': self.frames, 'stage': self._stage or 'between stages', 'generation': generation,
+                                   'pause_ms': pause_ms, 'collected': info.get('collected', 0)})
+
+    # --- Reporting ---
+
+    def get_stage_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage averages per frame."""
+        stats = {}
+        for stage, totals in self.stage_totals.items():
+            frames = max(1, totals['frames'])
+            stats[stage] = {
+                'frames': totals['frames'],
+                'avg_transient_kb': totals['transient_bytes'] / frames / 1024,
+                'max_transient_kb': totals['max_transient_bytes'] / 1024,
+                'avg_net_bytes': totals['net_bytes'] / frames,
+                'avg_net_blocks': totals['net_blocks'] / frames
+            }
+        return stats
+
+    def top_sites(self, n: int = 10) -> List[str]:
+        """Source lines whose live allocations grew most since warm-up."""
+        if not self.enabled or self._baseline is None:
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SITE_FILTERS)
+        lines = []
+        for stat in snapshot.compare_to(self._baseline, 'lineno')[:n]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size_diff / 1024:+9.1f} KB {stat.count_diff:+7d} blocks  {frame.filename}:{frame.lineno}")
+        return lines
+
+    def format_summary(self) -> str:
+        """One-line per-stage transient allocation summary."""
+        parts = [f"{stage} {s['avg_transient_kb']:.1f}KB" for stage, s in self.get_stage_stats().items()]
+        gc_count = sum(t['count'] for t in self.gc_totals.values())
+        gc_ms = sum(t['total_ms'] for t in self.gc_totals.values())
+        return f"{' | '.join(parts)} per frame | GC {gc_count}x {gc_ms:.1f}ms"
+
+    def print_report(self, n: int = 10):
+        if not self.stage_totals:
+            return
+        print(f"\n🧮 Allocation report ({self.frames} frames, tracemalloc on)")
+        print(f"{'stage':<14} {'transient KB/frame':>19} {'max KB':>9} {'net B/frame':>12} {'net blocks/frame':>17}")
+        for stage, s in self.get_stage_stats().items():
+            print(f"{stage:<14} {s['avg_transient_kb']:>19.1f} {s['max_transient_kb']:>9.1f} "
+                  f"{s['avg_net_bytes']:>12.0f} {s['avg_net_blocks']:>17.1f}")
+
+        print("GC pauses:")
+        for generation, totals in self.gc_totals.items():
+            if totals['count']:
+                print(f"  gen{generation}: {totals['count']}x, total {totals['total_ms']:.1f}ms, "
+                      f"max {totals['max_ms']:.2f}ms, collected {totals['collected']}")
+        for pause in self.gc_pauses[-5:]:
+            print(f"  ⚠️  frame {pause['frame']}: gen{pause['generation']} {pause['pause_ms']:.1f}ms during '{pause['stage']}'")
+
+        sites = self.top_sites(n)
+        if sites:
+            print(f"Top allocation sites (growth since frame {self.warmup_frames}):")
+            for line in sites:
+                print(f"  {line}")
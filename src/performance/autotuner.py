@@ -0,0 +1,221 @@
+"""
+First-run hardware autotuner for AzimuthControl.
+
+Runs a short benchmark on the actual machine - MediaPipe inference latency
+per processing resolution and model complexity, OpenCV resize/cvtColor cost
+per OpenCV thread count - using a recorded clip (or live camera frames) and
+writes the best-fitting performance_settings to config/performance_profile.json.
+ConfigManager overlays that profile on top of controls.json at startup.
+
+Usage:
+    python -m src.performance.autotuner --clip recording.mp4
+    python -m src.performance.autotuner --camera 0 --frames 90
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.config_manager import get_performance_config, PERFORMANCE_PROFILE_FILENAME
+from src.performance.resolution_governor import load_processing_scales
+
+DEFAULT_PROFILE_PATH = project_root / "config" / PERFORMANCE_PROFILE_FILENAME
+
+
+def load_benchmark_frames(clip_path: Optional[str] = None, camera_index: Optional[int] = None,
+                          max_frames: int = 60) -> List[np.ndarray]:
+    """Read benchmark frames from a recorded clip or a live camera."""
+    source = clip_path if clip_path else (camera_index if camera_index is not None else 0)
+    cap = cv2.VideoCapture(source)
+    frames = []
+    try:
+        while cap.isOpened() and len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                break
+            frames.append(frame)
+    finally:
+        cap.release()
+
+    if not frames:
+        raise RuntimeError(f"No frames could be read from {source}")
+    return frames
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def _fit(frame: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Resize preserving aspect ratio so the frame fits inside width x height."""
+    scale = min(width / frame.shape[1], height / frame.shape[0])
+    if scale >= 1.0:
+        return frame
+    return cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+
+
+def benchmark_opencv(frames: List[np.ndarray], scales: List[Tuple[int, int]],
+                     thread_counts: List[int]) -> Dict[int, Dict[str, float]]:
+    """Cost of the per-frame OpenCV preprocessing (resize + cvtColor) per thread count."""
+    results = {}
+    previous_threads = cv2.getNumThreads()
+    try:
+        for threads in thread_counts:
+            cv2.setNumThreads(threads)
+            timings = []
+            for frame in frames:
+                start = time.perf_counter()
+                for width, height in scales:
+                    cv2.cvtColor(_fit(frame, width, height), cv2.COLOR_BGR2RGB)
+                timings.append((time.perf_counter() - start) * 1000 / len(scales))
+            results[threads] = {
+                'median_ms': _percentile(timings, 50),
+                'p90_ms': _percentile(timings, 90)
+            }
+    finally:
+        cv2.setNumThreads(previous_threads)
+    return results
+
+
+def benchmark_inference(frames: List[np.ndarray], scales: List[Tuple[int, int]],
+                        complexities=(0, 1), warmup_frames: int = 5) -> List[Dict[str, Any]]:
+    """MediaPipe Hands latency per (model complexity, processing resolution)."""
+    import mediapipe as mp
+
+    results = []
+    for complexity in complexities:
+        for width, height in scales:
+            with mp.solutions.hands.Hands(model_complexity=complexity,
+                                          min_detection_confidence=0.5,
+                                          min_tracking_confidence=0.5) as hands:
+                timings = []
+                detections = 0
+                for i, frame in enumerate(frames):
+                    rgb = cv2.cvtColor(_fit(frame, width, height), cv2.COLOR_BGR2RGB)
+                    start = time.perf_counter()
+                    output = hands.process(rgb)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if i >= warmup_frames:
+                        timings.append(elapsed)
+                        if output.multi_hand_landmarks:
+                            detections += 1
+            entry = {
+                'model_complexity': complexity,
+                'resolution': [width, height],
+                'median_ms': _percentile(timings, 50),
+                'p90_ms': _percentile(timings, 90),
+                'detection_rate': detections / len(timings) if timings else 0.0
+            }
+            results.append(entry)
+            print(f"  complexity {complexity} @ {width}x{height}: "
+                  f"median {entry['median_ms']:.1f}ms, p90 {entry['p90_ms']:.1f}ms, "
+                  f"hands in {entry['detection_rate'] * 100:.0f}% of frames")
+    return results
+
+
+def select_settings(inference: List[Dict[str, Any]], opencv: Dict[int, Dict[str, float]],
+                    latency_budget_ms: float) -> Dict[str, Any]:
+    """
+    Pick the richest configuration whose p90 latency fits the budget.
+    Prefers the full model, then the larger resolution.
+    """
+    fitting = [e for e in inference if e['p90_ms'] <= latency_budget_ms]
+    if fitting:
+        best = max(fitting, key=lambda e: (e['model_complexity'],
+                                           e['resolution'][0] * e['resolution'][1]))
+    else:
+        # Nothing fits: take the fastest configuration available
+        best = min(inference, key=lambda e: e['p90_ms'])
+
+    best_threads = min(opencv, key=lambda t: opencv[t]['median_ms']) if opencv else None
+
+    # Top of the governor's ladder; it still adapts below this at runtime
+    settings = {
+        'max_processing_resolution': list(best['resolution']),
+        'model_complexity': best['model_complexity'],
+        'inference_latency_budget_ms': latency_budget_ms
+    }
+    if best_threads is not None:
+        settings['opencv_threads'] = best_threads
+    return settings
+
+
+def run_autotune(clip_path: Optional[str] = None, camera_index: Optional[int] = None,
+                 max_frames: int = 60, output_path: Optional[str] = None) -> Dict[str, Any]:
+    """Benchmark this machine and write a performance profile."""
+    performance_config = get_performance_config()
+    target_fps = performance_config.get('target_fps', 30)
+    # Same key (and fallback) as hand_control, and the key select_settings writes back
+    latency_budget_ms = performance_config.get('inference_latency_budget_ms',
+                                               performance_config.get('max_processing_time_ms', 1000.0 / target_fps))
+
+    print("=== AzimuthControl Autotune ===")
+    frames = load_benchmark_frames(clip_path, camera_index, max_frames)
+    frame_height, frame_width = frames[0].shape[:2]
+    print(f"Loaded {len(frames)} frames ({frame_width}x{frame_height}) from {clip_path or f'camera {camera_index or 0}'}")
+
+    scales = load_processing_scales(performance_config, frame_width, frame_height)
+    cpu_count = os.cpu_count() or 1
+    thread_counts = sorted({1, 2, max(1, cpu_count // 2), cpu_count})
+
+    print("\nOpenCV preprocessing (resize + cvtColor):")
+    opencv_results = benchmark_opencv(frames, scales, thread_counts)
+    for threads, timing in opencv_results.items():
+        print(f"  {threads} threads: median {timing['median_ms']:.2f}ms, p90 {timing['p90_ms']:.2f}ms")
+
+    print("\nMediaPipe Hands inference:")
+    inference_results = benchmark_inference(frames, scales)
+
+    settings = select_settings(inference_results, opencv_results, latency_budget_ms)
+    profile = {
+        'generated_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': cpu_count,
+            'python': platform.python_version(),
+            'opencv': cv2.__version__
+        },
+        'source': {'clip': clip_path, 'camera_index': camera_index, 'frames': len(frames),
+                   'resolution': [frame_width, frame_height]},
+        'benchmarks': {
+            'opencv_threads': {str(k): v for k, v in opencv_results.items()},
+            'inference': inference_results
+        },
+        'performance_settings': settings
+    }
+
+    output = Path(output_path) if output_path else DEFAULT_PROFILE_PATH
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(profile, f, indent=2)
+
+    print("\n✅ Selected performance settings:")
+    for key, value in settings.items():
+        print(f"   {key}: {value}")
+    print(f"📝 Profile written to {output} (loaded automatically at startup)")
+    return profile
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark this machine and write a performance profile")
+    parser.add_argument('--clip', help='Recorded video clip to benchmark with (recommended)')
+    parser.add_argument('--camera', type=int, help='Camera index to capture benchmark frames from')
+    parser.add_argument('--frames', type=int, default=60, help='Number of frames to benchmark')
+    parser.add_argument('--output', help='Profile output path (default: config/performance_profile.json)')
+
+    args = parser.parse_args()
+    run_autotune(args.clip, args.camera, args.frames, args.output)
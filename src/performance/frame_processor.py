@@ -6,12 +6,16 @@ for dynamic resolution management and startup optimization.
 """
 
 import ctypes
+import logging
 import time
 import os
 from pathlib import Path
 from typing import Tuple, Optional
 from ..core.config_manager import get_system_config, get_performance_config
-from ..core.dll_manager import get_frame_processor_dll, cleanup_dll_conflicts
+from ..core.dll_manager import get_frame_processor_dll, dll_manager
+from .resolution_governor import ResolutionGovernor, load_processing_scales
+
+logger = logging.getLogger(__name__)
 
 
 class FrameProcessorWrapper:
@@ -35,7 +39,20 @@ class FrameProcessorWrapper:
         self.target_height = self.performance_config.get('processing_target_height', 480)
         self.target_fps = self.performance_config.get('target_fps', 30)
         
-        print(f"🎯 Frame processor target: {self.target_width}x{self.target_height} @ {self.target_fps}fps")
+        # Closed-loop governor decides the processing resolution (with or without the DLL).
+        # The autotuner's max_processing_resolution (if any) bounds the ladder; it is then
+        # capped at the requested capture size, and at the frames actually delivered.
+        max_width, max_height = self.performance_config.get('max_processing_resolution') or (None, None)
+        self.governor = ResolutionGovernor(
+            load_processing_scales(self.performance_config, max_width, max_height),
+            target_fps=self.target_fps,
+            latency_budget_ms=self.performance_config.get('inference_latency_budget_ms')
+        )
+        self.governor.cap_resolution(self.system_config.get('window_width', 1280),
+                                     self.system_config.get('window_height', 720))
+        
+        top_width, top_height = self.governor.max_resolution
+        print(f"🎯 Frame processor ladder up to {top_width}x{top_height} @ {self.target_fps}fps")
         print(f"📺 Display window: {self.system_config.get('window_width', 1280)}x{self.system_config.get('window_height', 720)}")
         
         self._load_dll()
@@ -44,10 +61,7 @@ class FrameProcessorWrapper:
     def _load_dll(self):
         """Load the enhanced C++ extension using DLL manager."""
         try:
-            # Clean up any conflicting DLLs first
-            cleanup_dll_conflicts()
-            
-            # Load DLL through the manager
+            # Load DLL through the manager (resolved per platform, loaded once per process)
             self.dll = get_frame_processor_dll()
             
             if self.dll is None:
@@ -56,11 +70,12 @@ class FrameProcessorWrapper:
             # Define function signatures
             self._define_function_signatures()
             
-            print(f"✅ Enhanced C++ frame processor loaded successfully via DLL manager")
+            load_ms = sum(t.get('resolve_ms', 0.0) + t.get('load_ms', 0.0) for t in dll_manager.get_timings().values())
+            print(f"✅ Enhanced C++ frame processor loaded successfully via DLL manager ({load_ms:.1f}ms)")
             
         except Exception as e:
-            print(f"❌ Failed to load enhanced C++ extension: {e}")
-            print("   Make sure the DLL is compiled for the correct architecture (x64)")
+            logger.warning("Failed to load enhanced C++ extension: %s", e)
+            logger.warning("Build resBalancer for this platform and architecture (res_balancer.dll / libres_balancer.so / .dylib)")
             self.dll = None
     
     def _define_function_signatures(self):
@@ -103,9 +118,9 @@ class FrameProcessorWrapper:
                 ctypes.c_int, ctypes.POINTER(ctypes.c_ubyte), ctypes.c_int
             ]
             self.dll.apply_mirror_transform.restype = ctypes.c_int
-            print("🔧 Mirror transform functions loaded")
+            logger.info("Mirror transform functions loaded")
         except AttributeError:
-            print("⚠️ Mirror transform functions not available in this DLL version")
+            logger.warning("Mirror transform functions not available in this DLL version")
         
         # New frame downscaling functions
         self.dll.should_downscale_frame.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, 
@@ -130,10 +145,10 @@ class FrameProcessorWrapper:
             if self.processor:
                 print(f"✅ Frame processor initialized: target {self.target_width}x{self.target_height} @ {self.target_fps}fps")
             else:
-                print("❌ Failed to create frame processor")
+                logger.warning("Failed to create frame processor")
                 
         except Exception as e:
-            print(f"❌ Failed to initialize frame processor: {e}")
+            logger.warning("Failed to initialize frame processor: %s", e)
     
     def should_process_frame(self, processing_time_ms: float) -> bool:
         """Check if the current frame should be processed based on performance."""
@@ -144,66 +159,42 @@ class FrameProcessorWrapper:
             result = self.dll.should_process_frame(self.processor, processing_time_ms)
             return bool(result)
         except Exception as e:
-            print(f"Error in should_process_frame: {e}")
+            logger.warning("Error in should_process_frame: %s", e)
             return True
     
     def update_processing_stats(self, processing_time_ms: float):
-        """Update processing statistics and adjust parameters."""
+        """Feed a measured inference latency to the resolution governor (and the C++ processor)."""
+        self.governor.update(processing_time_ms)
+        self.frame_count += 1
+        
+        # Update FPS calculation
+        current_time = time.time()
+        self.fps_counter += 1
+        
+        if current_time - self.last_fps_time >= 1.0:
+            self.current_fps = self.fps_counter / (current_time - self.last_fps_time)
+            self.fps_counter = 0
+            self.last_fps_time = current_time
+        
         if not self.dll or not self.processor:
             return
         
         try:
             self.dll.update_processing_stats(self.processor, processing_time_ms)
-            self.frame_count += 1
-            
-            # Update FPS calculation
-            current_time = time.time()
-            self.fps_counter += 1
-            
-            if current_time - self.last_fps_time >= 1.0:
-                self.current_fps = self.fps_counter / (current_time - self.last_fps_time)
-                self.fps_counter = 0
-                self.last_fps_time = current_time
-                
         except Exception as e:
-            print(f"Error updating processing stats: {e}")
+            logger.warning("Error updating processing stats: %s", e)
     
     def get_optimal_resolution(self) -> Tuple[int, int]:
-        """Get the current optimal resolution for processing."""
-        if not self.dll or not self.processor:
-            return self.target_width, self.target_height
-        
-        try:
-            width = ctypes.c_int()
-            height = ctypes.c_int()
-            self.dll.get_optimal_resolution(self.processor, ctypes.byref(width), ctypes.byref(height))
-            return width.value, height.value
-        except Exception as e:
-            print(f"Error getting optimal resolution: {e}")
-            return self.target_width, self.target_height
+        """Get the current processing resolution chosen by the governor."""
+        return self.governor.resolution
     
     def get_scale_factor(self) -> float:
         """Get current resolution scale factor."""
-        if not self.dll or not self.processor:
-            return 1.0
-        
-        try:
-            return self.dll.get_scale_factor(self.processor)
-        except Exception as e:
-            print(f"Error getting scale factor: {e}")
-            return 1.0
+        return self.governor.scale_factor
     
     def is_startup_complete(self) -> bool:
-        """Check if startup phase is complete."""
-        if not self.dll or not self.processor:
-            return True
-        
-        try:
-            result = self.dll.is_startup_complete(self.processor)
-            return bool(result)
-        except Exception as e:
-            print(f"Error checking startup status: {e}")
-            return True
+        """Check if the governor's startup ramp is complete."""
+        return self.governor.startup_complete
     
     def optimize_for_system_load(self, cpu_usage: float, memory_usage: float):
         """Optimize processing pipeline based on system load."""
@@ -213,50 +204,32 @@ class FrameProcessorWrapper:
         try:
             self.dll.optimize_processing_pipeline(self.processor, cpu_usage, memory_usage)
         except Exception as e:
-            print(f"Error optimizing processing pipeline: {e}")
+            logger.warning("Error optimizing processing pipeline: %s", e)
     
     def should_downscale_frame(self, input_width: int, input_height: int) -> Tuple[bool, int, int]:
         """
-        Check if frame should be downscaled for processing optimization.
+        Check if frame should be downscaled to the governor's processing resolution.
+        Aspect ratio is preserved so normalized landmarks stay valid.
         Returns (should_downscale, output_width, output_height)
         """
-        if not self.dll or not self.processor:
-            return False, input_width, input_height
-        
-        try:
-            output_width = ctypes.c_int()
-            output_height = ctypes.c_int()
-            should_downscale = self.dll.should_downscale_frame(
-                self.processor, input_width, input_height, 
-                ctypes.byref(output_width), ctypes.byref(output_height)
-            )
-            return bool(should_downscale), output_width.value, output_height.value
-        except Exception as e:
-            print(f"Error checking frame downscaling: {e}")
+        self.governor.cap_resolution(input_width, input_height)
+        target_width, target_height = self.governor.resolution
+        scale = min(target_width / input_width, target_height / input_height)
+        if scale >= 1.0:
             return False, input_width, input_height
+        return True, max(1, int(input_width * scale)), max(1, int(input_height * scale))
     
     def get_processing_scale_factor(self) -> float:
         """Get the scale factor for processing (different from display scale)."""
-        if not self.dll or not self.processor:
-            return 1.0
-        
-        try:
-            return self.dll.get_processing_scale_factor(self.processor)
-        except Exception as e:
-            print(f"Error getting processing scale factor: {e}")
-            return 1.0
+        return self.governor.scale_factor
     
     def get_startup_progress(self) -> float:
         """Get startup progress as percentage (0.0 to 1.0)."""
-        if self.is_startup_complete():
-            return 1.0
-        
-        # Estimate progress based on time and frame count
-        elapsed_time = time.time() - self.startup_time
-        time_progress = min(1.0, elapsed_time / 10.0)  # 10 seconds estimated startup
-        frame_progress = min(1.0, self.frame_count / 150.0)  # 150 frames estimated
-        
-        return max(time_progress, frame_progress)
+        return self.governor.startup_progress
+    
+    def get_governor_trace(self) -> list:
+        """Get the governor's recent resolution decisions."""
+        return self.governor.get_trace()
     
     def get_performance_stats(self) -> dict:
         """Get current performance statistics."""
@@ -269,7 +242,8 @@ class FrameProcessorWrapper:
             'current_resolution': self.get_optimal_resolution(),
             'target_resolution': (self.target_width, self.target_height),
             'scale_factor': self.get_scale_factor(),
-            'startup_time_elapsed': time.time() - self.startup_time
+            'startup_time_elapsed': time.time() - self.startup_time,
+            'governor': self.governor.get_stats()
         }
     
     def apply_mirror_transform(self, input_data: bytes, width: int, height: int, 
@@ -301,7 +275,7 @@ class FrameProcessorWrapper:
                 return self._python_mirror_fallback(input_data, width, height, channels, mirror_horizontal)
                 
         except Exception as e:
-            print(f"C++ mirror failed, using Python fallback: {e}")
+            logger.warning("C++ mirror failed, using Python fallback: %s", e)
             return self._python_mirror_fallback(input_data, width, height, channels, mirror_horizontal)
     
     def _python_mirror_fallback(self, input_data: bytes, width: int, height: int, 
@@ -330,11 +304,12 @@ class FrameProcessorWrapper:
                 pass
 
 
-# Global instance for easy access
+# Default instance for the single-station app (hand_control.py); multi-station
+# sessions each construct their own FrameProcessorWrapper
 _frame_processor = None
 
 def get_frame_processor() -> FrameProcessorWrapper:
-    """Get the global frame processor instance."""
+    """Get the default frame processor instance, created on first use."""
     global _frame_processor
     if _frame_processor is None:
         _frame_processor = FrameProcessorWrapper()
@@ -26,6 +26,9 @@ from pathlib import Path
 import os
 import sys
 
+from .thread_budget import pin_current_thread, BACKGROUND
+from ..core.dll_manager import dll_manager
+
 # Configure logging for performance monitoring
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -153,21 +156,23 @@ class CudaFrameProcessor:
     
     def _load_dll(self) -> bool:
         """Load the enhanced DLL with comprehensive error handling"""
-        dll_paths = [
-            Path("resBalancer/res_balancer_cuda.dll"),  # Enhanced CUDA DLL
-            Path("resBalancer/res_balancer.dll"),       # Fallback standard DLL
-            Path("resBalancer/res_balancer_enhanced.dll")  # Alternative enhanced
+        dll_names = [
+            "frame_processor",          # Enhanced CUDA build
+            "frame_processor_legacy",   # Fallback standard build
+            "frame_processor_enhanced"  # Alternative enhanced
         ]
         
-        for dll_path in dll_paths:
+        for dll_name in dll_names:
             try:
-                if dll_path.exists():
-                    self.dll = ctypes.CDLL(str(dll_path))
-                    logger.info(f"✅ Loaded DLL: {dll_path}")
+                # Resolved per platform and loaded once by the shared DLL manager
+                self.dll = dll_manager.load_dll(dll_name)
+                if self.dll is not None:
+                    logger.info(f"✅ Loaded DLL: {dll_manager.dll_registry[dll_name]['path']}")
                     self._setup_dll_functions()
                     return True
             except Exception as e:
-                logger.warning(f"⚠️  Failed to load {dll_path}: {e}")
+                logger.warning(f"⚠️  Failed to set up {dll_name}: {e}")
+                self.dll = None
                 continue
         
         logger.error("❌ No compatible DLL found")
@@ -542,12 +547,13 @@ class CudaFrameProcessor:
     def _start_monitoring(self):
         """Start background monitoring thread"""
         self.monitoring_active = True
-        self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
+        self.monitoring_thread = threading.Thread(target=self._monitoring_loop, name="SafetyMonitor", daemon=True)
         self.monitoring_thread.start()
         logger.info("✅ Safety monitoring started")
     
     def _monitoring_loop(self):
         """Background monitoring loop for system health"""
+        pin_current_thread(BACKGROUND)
         while self.monitoring_active:
             try:
                 # Update system metrics
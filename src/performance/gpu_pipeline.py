@@ -13,6 +13,9 @@ import queue
 from typing import Tuple, Optional, Dict, Any
 import logging
 
+from .resolution_governor import ResolutionGovernor, DEFAULT_PROCESSING_SCALES
+from .thread_budget import pin_current_thread, BACKGROUND
+
 try:
     import cupy as cp
     GPU_AVAILABLE = True
@@ -38,13 +41,8 @@ class GPUFrameProcessor:
         self.target_height = target_height
         self.gpu_available = GPU_AVAILABLE
         
-        # Processing scales for incremental scaling
-        self.processing_scales = [
-            (320, 240),   # Startup/High load
-            (640, 480),   # Medium performance
-            (960, 720),   # Good performance
-            (1280, 720),  # Full resolution
-        ]
+        # Processing scales for incremental scaling (shared ladder)
+        self.processing_scales = list(DEFAULT_PROCESSING_SCALES)
         
         self.current_scale_index = 0
         self.frame_count = 0
@@ -59,6 +57,9 @@ class GPUFrameProcessor:
         self.gpu_memory_usage = 0.0
         self.target_fps = 30.0
         
+        # Closed-loop resolution governor (same controller as FrameProcessorWrapper)
+        self.governor = ResolutionGovernor(self.processing_scales, target_fps=self.target_fps)
+        
         # I/O streaming buffers
         self.frame_queue = queue.Queue(maxsize=3)
         self.result_queue = queue.Queue(maxsize=3)
@@ -91,7 +92,7 @@ class GPUFrameProcessor:
         self.streaming_active = True
         
         # Start GPU processing thread
-        self.gpu_thread = threading.Thread(target=self._gpu_processing_loop, daemon=True)
+        self.gpu_thread = threading.Thread(target=self._gpu_processing_loop, name="GPUStreamingPipeline", daemon=True)
         self.gpu_thread.start()
         
         logger.info("🚀 GPU streaming pipeline started")
@@ -104,6 +105,7 @@ class GPUFrameProcessor:
     
     def _gpu_processing_loop(self):
         """Main GPU processing loop running in separate thread."""
+        pin_current_thread(BACKGROUND)
         while self.streaming_active:
             try:
                 # Get frame from queue (non-blocking)
@@ -211,23 +213,19 @@ class GPUFrameProcessor:
         return resized
     
     def _adapt_processing_scale(self, processing_time: float):
-        """Adapt processing scale based on performance."""
+        """Adapt processing scale based on performance via the resolution governor."""
         # Keep recent performance history
         if len(self.processing_times) > 30:
             self.processing_times = self.processing_times[-20:]
         
-        avg_time = np.mean(self.processing_times[-10:]) if len(self.processing_times) >= 10 else processing_time
-        target_time = 1000.0 / self.target_fps  # Target time per frame
+        previous_index = self.current_scale_index
+        self.governor.update(processing_time)
+        self.current_scale_index = self.governor.index
         
-        # Adaptive scaling logic
-        if avg_time > target_time * 1.5:  # Too slow
-            if self.current_scale_index > 0:
-                self.current_scale_index -= 1
-                logger.info(f"🔽 Reducing processing scale to {self.processing_scales[self.current_scale_index]}")
-        elif avg_time < target_time * 0.7:  # Fast enough to scale up
-            if self.current_scale_index < len(self.processing_scales) - 1:
-                self.current_scale_index += 1
-                logger.info(f"🔼 Increasing processing scale to {self.processing_scales[self.current_scale_index]}")
+        if self.current_scale_index < previous_index:
+            logger.info(f"🔽 Reducing processing scale to {self.processing_scales[self.current_scale_index]}")
+        elif self.current_scale_index > previous_index:
+            logger.info(f"🔼 Increasing processing scale to {self.processing_scales[self.current_scale_index]}")
     
     def submit_frame(self, frame: np.ndarray) -> bool:
         """Submit frame for processing. Returns True if submitted, False if queue full."""
@@ -276,7 +274,8 @@ class GPUFrameProcessor:
             'gpu_utilization': self.gpu_utilization,
             'gpu_memory_usage': self.gpu_memory_usage,
             'frames_processed': self.frame_count,
-            'queue_size': self.frame_queue.qsize()
+            'queue_size': self.frame_queue.qsize(),
+            'governor': self.governor.get_stats()
         }
 
 # Global GPU pipeline instance
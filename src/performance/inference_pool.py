@@ -0,0 +1,327 @@
+"""
+Shared MediaPipe inference worker pool for AzimuthControl.
+
+Several stations on one host share a few inference worker processes instead of
+each running a full hand_control.py with its own interpreter, OpenCV/Numba
+runtime and MediaPipe graph.
+
+MediaPipe Hands tracks from frame to frame, so a stream has to keep reaching
+the same graph. Every session is therefore pinned to one worker (the least
+loaded when it registers), and that worker keeps one Hands graph per session.
+A worker serves its requests in order. Results come back on a single response
+queue, and a dispatcher thread hands each one to the session waiting for it.
+
+Frames go to the worker as RGB at the session's processing resolution,
+pickled through a multiprocessing queue. Results come back as compact
+(handedness label, (21, 3) landmarks) detections rather than MediaPipe
+protobufs.
+
+The dispatcher also watches the worker sentinels. When a worker dies, its
+pending requests fail at once (so the stations drop that frame instead of
+waiting out the timeout) and the worker is respawned under the same index.
+Its sessions stay pinned to it and get fresh graphs on their next frame.
+After max_restarts deaths the worker is retired and its sessions are moved
+to the surviving workers.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from multiprocessing.connection import wait as wait_for_sentinels
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .thread_budget import get_thread_budget, pin_current_thread, pin_worker_process, BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HANDS_SETTINGS = {
+    'max_num_hands': 2,
+    'model_complexity': 1,
+    'min_detection_confidence': 0.8,
+    'min_tracking_confidence': 0.5
+}
+
+# Request kinds
+_FRAME = "frame"
+_CLOSE_SESSION = "close"
+
+SUPERVISE_INTERVAL = 0.25  # Seconds between worker liveness checks while no results arrive
+
+
+class InferenceWorkerError(RuntimeError):
+    """The worker serving a request died, or no worker is left."""
+
+
+def _inference_worker(index: int, settings: Dict[str, Any], requests, responses, cores=None):
+    """Worker process: one MediaPipe Hands graph per session, requests served in order."""
+    pin_worker_process(cores)
+    import cv2
+    cv2.setNumThreads(1)
+    import mediapipe as mp
+    from ..core.hand_tracker import detections_from_results
+
+    graphs = {}
+    responses.put((None, index, None, None))  # Ready
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+        kind, request_id, session_id, payload = message
+        if kind == _CLOSE_SESSION:
+            graph = graphs.pop(session_id, None)
+            if graph is not None:
+                graph.close()
+            continue
+
+        start = time.perf_counter()
+        try:
+            graph = graphs.get(session_id)
+            if graph is None:
+                graph = graphs[session_id] = mp.solutions.hands.Hands(**settings)
+            detections = detections_from_results(graph.process(payload))
+            responses.put((request_id, detections, (time.perf_counter() - start) * 1000, None))
+        except Exception as e:
+            responses.put((request_id, None, (time.perf_counter() - start) * 1000, repr(e)))
+
+    for graph in graphs.values():
+        graph.close()
+
+
+class InferencePool:
+    """Fixed set of MediaPipe worker processes shared by many sessions, with sticky session placement."""
+
+    def __init__(self, workers: Optional[int] = None, hands_settings: Optional[Dict[str, Any]] = None,
+                 start_timeout: float = 60.0, max_restarts: int = 5):
+        # Sized (and pinned) by the thread budget: the workers take the pipeline stage's cores
+        self.thread_budget = get_thread_budget()
+        self.worker_count = max(1, workers or self.thread_budget.inference_workers)
+        self.hands_settings = dict(DEFAULT_HANDS_SETTINGS, **(hands_settings or {}))
+        self.start_timeout = start_timeout
+        self.max_restarts = max_restarts  # Per worker, before it is retired
+
+        # Spawned, not forked: MediaPipe and Numba state must not be inherited from the host
+        self._context = multiprocessing.get_context("spawn")
+        self._requests = []
+        self._processes = []
+        self._responses = None
+        self._dispatcher = None
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple[Future, int]] = {}  # request id -> (future, worker index)
+        self._next_request = 0
+        self._closing = False
+
+        self.session_workers: Dict[str, int] = {}
+        self.worker_stats = [{'sessions': 0, 'requests': 0, 'errors': 0, 'busy_ms': 0.0, 'restarts': 0,
+                              'retired': False} for _ in range(self.worker_count)]
+        self.started_at = None
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None
+
+    def start(self):
+        """Start the workers and wait until each has loaded MediaPipe."""
+        if self.running:
+            return
+        self._closing = False
+        self._responses = self._context.Queue()
+        for index in range(self.worker_count):
+            requests, process = self._spawn_worker(index)
+            self._requests.append(requests)
+            self._processes.append(process)
+
+        ready = 0
+        deadline = time.perf_counter() + self.start_timeout
+        while ready < self.worker_count:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self.close()
+                raise RuntimeError(f"Inference workers not ready after {self.start_timeout:.0f}s")
+            try:
+                request_id, *_ = self._responses.get(timeout=min(remaining, 0.5))
+            except Exception:
+                dead = [process for process in self._processes if not process.is_alive()]
+                if dead:
+                    self.close()
+                    raise RuntimeError(f"{dead[0].name} exited during start-up (exit code {dead[0].exitcode})")
+                continue
+            if request_id is None:
+                ready += 1
+
+        self._dispatcher = threading.Thread(target=self._dispatch, name="InferenceDispatcher", daemon=True)
+        self._dispatcher.start()
+        self.started_at = time.perf_counter()
+
+    def _spawn_worker(self, index: int, requests=None):
+        requests = requests if requests is not None else self._context.Queue()
+        process = self._context.Process(target=_inference_worker, name=f"InferenceWorker-{index}",
+                                        args=(index, self.hands_settings, requests, self._responses,
+                                              self.thread_budget.worker_cores(index, self.worker_count)),
+                                        daemon=True)
+        process.start()
+        return requests, process
+
+    def _dispatch(self):
+        pin_current_thread(BACKGROUND)
+        while True:
+            try:
+                message = self._responses.get(timeout=SUPERVISE_INTERVAL)
+            except queue.Empty:
+                message = ()
+            if message is None:
+                break
+            if message:
+                request_id, detections, inference_ms, error = message
+                if request_id is not None:  # Ready messages from respawned workers carry None
+                    with self._lock:
+                        future, _ = self._pending.pop(request_id, (None, None))
+                    if future is not None and not future.done():
+                        if error is not None:
+                            future.set_exception(RuntimeError(f"Inference failed: {error}"))
+                        else:
+                            future.set_result((detections, inference_ms))
+            self._supervise()
+
+    def _supervise(self):
+        """Fail the requests of dead workers, then respawn or retire them."""
+        if self._closing:
+            return
+        live = {process.sentinel: index for index, process in enumerate(self._processes)
+                if not self.worker_stats[index]['retired']}
+        for sentinel in wait_for_sentinels(list(live), timeout=0):
+            index = live[sentinel]
+            exitcode = self._processes[index].exitcode
+            with self._lock:
+                # New frames go to a fresh queue; everything sent to the dead worker fails now
+                old_requests, self._requests[index] = self._requests[index], self._context.Queue()
+                failed = [request_id for request_id, (_, worker) in self._pending.items() if worker == index]
+                futures = [self._pending.pop(request_id)[0] for request_id in failed]
+            old_requests.cancel_join_thread()
+            old_requests.close()
+            for future in futures:
+                if not future.done():
+                    future.set_exception(InferenceWorkerError(f"Inference worker {index} exited (code {exitcode})"))
+
+            stats = self.worker_stats[index]
+            stats['restarts'] += 1
+            if stats['restarts'] > self.max_restarts:
+                self._retire_worker(index, exitcode)
+                continue
+            logger.warning("♻️  Inference worker %d exited (code %s), %d request(s) failed - respawning (%d/%d)",
+                           index, exitcode, len(futures), stats['restarts'], self.max_restarts)
+            _, self._processes[index] = self._spawn_worker(index, self._requests[index])
+
+    def _retire_worker(self, index: int, exitcode):
+        """Stop using a worker that keeps dying; move its sessions to the others."""
+        with self._lock:
+            self.worker_stats[index]['retired'] = True
+            moved = [session_id for session_id, worker in self.session_workers.items() if worker == index]
+            for session_id in moved:
+                del self.session_workers[session_id]
+            self.worker_stats[index]['sessions'] = 0
+        logger.error("❌ Inference worker %d exited (code %s) after %d restarts - retired, moving %d session(s)",
+                     index, exitcode, self.max_restarts, len(moved))
+        for session_id in moved:
+            try:
+                self.register_session(session_id)
+            except InferenceWorkerError:
+                break  # No live workers; submit() reports it to the stations
+
+    # --- Sessions ---
+
+    def register_session(self, session_id: str) -> int:
+        """Pin a session to the worker with the fewest sessions; returns the worker index."""
+        with self._lock:
+            if session_id in self.session_workers:
+                return self.session_workers[session_id]
+            candidates = [i for i in range(self.worker_count) if not self.worker_stats[i]['retired']]
+            if not candidates:
+                raise InferenceWorkerError("No inference workers left")
+            index = min(candidates, key=lambda i: self.worker_stats[i]['sessions'])
+            self.session_workers[session_id] = index
+            self.worker_stats[index]['sessions'] += 1
+        return index
+
+    def unregister_session(self, session_id: str):
+        """Release a session and its Hands graph in the worker."""
+        with self._lock:
+            index = self.session_workers.pop(session_id, None)
+            if index is None:
+                return
+            self.worker_stats[index]['sessions'] -= 1
+        if self.running:
+            self._requests[index].put((_CLOSE_SESSION, None, session_id, None))
+
+    def submit(self, session_id: str, rgb_image: np.ndarray) -> Future:
+        """Queue an RGB frame for the session's worker; the future resolves to (detections, inference_ms)."""
+        index = self.register_session(session_id)
+        future = Future()
+        with self._lock:
+            request_id = self._next_request
+            self._next_request += 1
+            self._pending[request_id] = (future, index)
+            future.request_id = request_id
+            future.add_done_callback(lambda done, index=index: self._account(index, done))
+            self._requests[index].put((_FRAME, request_id, session_id, rgb_image))
+        return future
+
+    def infer(self, session_id: str, rgb_image: np.ndarray,
+              timeout: Optional[float] = 5.0) -> Tuple[List[Tuple[str, np.ndarray]], float]:
+        """Blocking submit: (detections, worker inference ms)."""
+        future = self.submit(session_id, rgb_image)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            # Nobody will collect it; a late result is dropped by the dispatcher
+            with self._lock:
+                self._pending.pop(future.request_id, None)
+            future.cancel()
+            raise
+
+    def _account(self, index: int, future: Future):
+        if future.cancelled():
+            return
+        stats = self.worker_stats[index]
+        stats['requests'] += 1
+        if future.exception() is not None:
+            stats['errors'] += 1
+        else:
+            stats['busy_ms'] += future.result()[1]
+
+    # --- Stats and shutdown ---
+
+    def get_stats(self) -> Dict[str, Any]:
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000 if self.started_at else 0.0
+        workers = []
+        for index, stats in enumerate(self.worker_stats):
+            workers.append(dict(stats, alive=index < len(self._processes) and self._processes[index].is_alive(),
+                                utilization=stats['busy_ms'] / elapsed_ms if elapsed_ms > 0 else 0.0))
+        return {
+            'workers': workers,
+            'sessions': len(self.session_workers),
+            'pending': len(self._pending),
+            'requests': sum(stats['requests'] for stats in self.worker_stats)
+        }
+
+    def close(self, timeout: float = 5.0):
+        self._closing = True
+        for requests in self._requests:
+            requests.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        if self._dispatcher is not None:
+            self._responses.put(None)
+            self._dispatcher.join(timeout)
+            self._dispatcher = None
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future, _ in pending.values():
+            future.cancel()
+        self._requests, self._processes = [], []
@@ -0,0 +1,743 @@
+"""
+Out-of-process MediaPipe inference for AzimuthControl.
+
+hands.process() runs its Python-side work under the GIL, and a crash inside
+the graph takes the whole app down with it. InferenceServer moves MediaPipe
+into a spawned worker process instead. Frames and results never go through
+pickling:
+
+- Frame ring: a shared_memory block of preallocated frame slots. The caller
+  can have cv2.cvtColor write straight into a slot (frame_buffer), and the
+  worker hands MediaPipe a read-only view of that slot.
+- Result ring: a second block with the same slot count, holding the
+  handedness codes and (21, 3) float32 landmarks of up to max_num_hands hands.
+- Only slot indices travel through the two pipes.
+
+The worker writes a heartbeat timestamp into the result block whenever it is
+idle or between frames. A request that times out triggers a health check.
+A dead worker, or one whose heartbeat is older than heartbeat_timeout, is
+killed and restarted on the same rings. The frames that were in flight are
+dropped: callers get no detections, exactly as if no hand was visible.
+Restarts are budgeted per restart_window (a worker that has been healthy
+for a while earns its budget back). Once the budget is spent the server
+degrades instead of raising: frames go to the in-process fallback_factory
+model if one was given, otherwise they yield no detections.
+
+Run `python -m src.performance.inference_server --bench [--replay FILE]` to
+compare latency and throughput against in-process inference.
+"""
+
+import logging
+import multiprocessing
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .thread_budget import get_thread_budget, pin_current_thread, pin_worker_process, PIPELINE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HANDS_SETTINGS = {
+    'max_num_hands': 2,
+    'min_detection_confidence': 0.8,
+    'min_tracking_confidence': 0.5
+}
+
+LANDMARK_COUNT = 21
+LABEL_CODES = {'Right': 0, 'Left': 1}
+LABEL_NAMES = ('Right', 'Left')
+
+HEARTBEAT_INTERVAL = 0.25  # Worker beats at least this often while idle
+
+# Result status codes
+_OK = 0
+_FAILED = 1
+
+_READY = -1  # Sent once on the response pipe after the graph is loaded
+
+
+class InferenceWorkerError(RuntimeError):
+    """The inference worker died, hung or failed to start."""
+
+
+class _Rings:
+    """numpy views over the two shared-memory blocks (same layout on both sides)."""
+
+    # Frame block: int64[slots, 4] (seq, height, width, complexity), then uint8[slots, capacity]
+    # Result block: int64[2] (heartbeat ns, pid), int64[slots, 3] (seq, status, count),
+    #               float64[slots] inference ms, uint8[slots, 8] labels, float32[slots, hands, 21, 3]
+
+    def __init__(self, frame_block, result_block, slots: int, capacity: int, max_hands: int):
+        self.slots = slots
+        self.capacity = capacity
+        self.max_hands = max_hands
+
+        self.frame_meta = np.ndarray((slots, 4), np.int64, buffer=frame_block.buf)
+        self.frame_data = np.ndarray((slots, capacity), np.uint8, buffer=frame_block.buf, offset=self.frame_meta.nbytes)
+
+        offset = 0
+        self.control = np.ndarray((2,), np.int64, buffer=result_block.buf, offset=offset)
+        offset += self.control.nbytes
+        self.result_meta = np.ndarray((slots, 3), np.int64, buffer=result_block.buf, offset=offset)
+        offset += self.result_meta.nbytes
+        self.result_ms = np.ndarray((slots,), np.float64, buffer=result_block.buf, offset=offset)
+        offset += self.result_ms.nbytes
+        self.result_labels = np.ndarray((slots, 8), np.uint8, buffer=result_block.buf, offset=offset)
+        offset += self.result_labels.nbytes
+        self.result_landmarks = np.ndarray((slots, max_hands, LANDMARK_COUNT, 3), np.float32,
+                                           buffer=result_block.buf, offset=offset)
+
+    @staticmethod
+    def frame_block_size(slots: int, capacity: int) -> int:
+        return slots * 4 * 8 + slots * capacity
+
+    @staticmethod
+    def result_block_size(slots: int, max_hands: int) -> int:
+        return 2 * 8 + slots * 3 * 8 + slots * 8 + slots * 8 + slots * max_hands * LANDMARK_COUNT * 3 * 4
+
+    def frame(self, slot: int, height: int, width: int) -> np.ndarray:
+        """Zero-copy (height, width, 3) view of a frame slot."""
+        return self.frame_data[slot, :height * width * 3].reshape(height, width, 3)
+
+    def beat(self):
+        self.control[0] = time.perf_counter_ns()
+
+    def release(self):
+        """Drop the views so the shared-memory blocks can be closed."""
+        self.frame_meta = self.frame_data = self.control = None
+        self.result_meta = self.result_ms = self.result_labels = self.result_landmarks = None
+
+
+def _write_result(rings: _Rings, slot: int, seq: int, results, inference_ms: float):
+    count = 0
+    if results and results.multi_hand_landmarks:
+        for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+            if count >= rings.max_hands:
+                break
+            rings.result_labels[slot, count] = LABEL_CODES.get(handedness.classification[0].label, 0)
+            target = rings.result_landmarks[slot, count]
+            for i, lm in enumerate(hand_landmarks.landmark):
+                target[i] = (lm.x, lm.y, lm.z)
+            count += 1
+    rings.result_ms[slot] = inference_ms
+    rings.result_meta[slot] = (seq, _OK, count)
+
+
+def _server_worker(frame_name: str, result_name: str, slots: int, capacity: int,
+                   settings: Dict[str, Any], initial_complexity: int, requests, responses, cores=None):
+    """Worker process: one Hands graph per model complexity, fed from the frame ring."""
+    pin_worker_process(cores)
+    import cv2
+    cv2.setNumThreads(1)
+    import mediapipe as mp
+
+    frame_block = shared_memory.SharedMemory(name=frame_name)
+    result_block = shared_memory.SharedMemory(name=result_name)
+    rings = _Rings(frame_block, result_block, slots, capacity, settings['max_num_hands'])
+    rings.control[1] = multiprocessing.current_process().pid
+
+    graphs = {}
+
+    def graph_for(complexity):
+        if complexity not in graphs:
+            graphs[complexity] = mp.solutions.hands.Hands(model_complexity=complexity, **settings)
+        return graphs[complexity]
+
+    graph_for(initial_complexity)
+    rings.beat()
+    responses.send(_READY)
+
+    try:
+        while True:
+            if not requests.poll(HEARTBEAT_INTERVAL):
+                rings.beat()
+                continue
+            slot = requests.recv()
+            if slot is None:
+                break
+            rings.beat()
+            seq, height, width, complexity = (int(v) for v in rings.frame_meta[slot])
+            image = rings.frame(slot, height, width)
+            image.flags.writeable = False  # Lets MediaPipe use the buffer without copying it
+            start = time.perf_counter()
+            try:
+                results = graph_for(complexity).process(image)
+                _write_result(rings, slot, seq, results, (time.perf_counter() - start) * 1000)
+            except Exception:
+                rings.result_ms[slot] = (time.perf_counter() - start) * 1000
+                rings.result_meta[slot] = (seq, _FAILED, 0)
+            responses.send(slot)
+            rings.beat()
+    except (EOFError, KeyboardInterrupt):
+        pass  # Parent went away
+    finally:
+        for graph in graphs.values():
+            graph.close()
+        rings.release()
+        frame_block.close()
+        result_block.close()
+
+
+@contextmanager
+def _without_main_script():
+    """Keep spawn from re-running the host script in the worker.
+
+    hand_control.py runs at import time (no __main__ guard), and spawn rebuilds
+    __main__ in the child from its path or module spec. The worker needs
+    nothing from __main__, so both are hidden while it starts.
+    """
+    main = sys.modules.get('__main__')
+    if main is None:
+        yield
+        return
+    saved_file = main.__dict__.pop('__file__', None)
+    saved_spec = getattr(main, '__spec__', None)
+    main.__spec__ = None
+    try:
+        yield
+    finally:
+        main.__spec__ = saved_spec
+        if saved_file is not None:
+            main.__file__ = saved_file
+
+
+class RemoteHands:
+    """Hands-like handle for one model complexity; process() returns (label, (21, 3)) detections."""
+
+    def __init__(self, server: 'InferenceServer', complexity: int):
+        self.server = server
+        self.complexity = complexity
+
+    def process(self, rgb_image: np.ndarray) -> List[Tuple[str, np.ndarray]]:
+        return self.server.process(rgb_image, self.complexity)
+
+    def close(self):
+        pass  # The server owns the worker and its graphs
+
+
+class InferenceServer:
+    """MediaPipe Hands in a supervised worker process, fed through shared-memory frame and result rings."""
+
+    def __init__(self, hands_settings: Optional[Dict[str, Any]] = None, slots: int = 2,
+                 max_width: int = 1280, max_height: int = 720, request_timeout: float = 2.0,
+                 heartbeat_timeout: float = 5.0, max_restarts: int = 5, start_timeout: float = 60.0,
+                 restart_window: float = 300.0, fallback_factory: Optional[Callable[[int], Any]] = None):
+        self.hands_settings = dict(DEFAULT_HANDS_SETTINGS, **(hands_settings or {}))
+        self.initial_complexity = self.hands_settings.pop('model_complexity', 1)  # Then chosen per request
+        self.slots = max(1, slots)
+        self.capacity = max_width * max_height * 3
+        self.max_hands = self.hands_settings['max_num_hands']
+        self.request_timeout = request_timeout
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_restarts = max_restarts      # Within any restart_window seconds
+        self.restart_window = restart_window
+        self.start_timeout = start_timeout
+        self.fallback_factory = fallback_factory  # complexity -> in-process Hands, used once degraded
+
+        # Spawned, not forked: MediaPipe state must not be inherited from the host
+        self._context = multiprocessing.get_context("spawn")
+        self._frame_block = None
+        self._result_block = None
+        self._rings: Optional[_Rings] = None
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._lock = threading.RLock()
+
+        self._free = deque()
+        self._in_flight: Dict[int, int] = {}  # slot -> seq
+        self._done: Dict[int, int] = {}       # seq -> slot, result not collected yet
+        self._abandoned = set()               # seqs nobody will collect
+        self._staged: Optional[Tuple[int, np.ndarray]] = None
+        self._next_seq = 1
+
+        self.requests = 0
+        self.failed_requests = 0
+        self.restarts = 0
+        self.resizes = 0
+        self.restart_ms: List[float] = []
+        self.last_failure = None
+        self.degraded = False
+        self._restart_times = deque()
+        self._fallback_models: Dict[int, Any] = {}
+        self._scratch: Optional[np.ndarray] = None
+
+    # --- Lifecycle ---
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None
+
+    def start(self):
+        """Allocate the rings and start the worker; returns once MediaPipe is loaded."""
+        with self._lock:
+            if self.running:
+                return
+            self._allocate()
+            self._launch()
+
+    def _allocate(self):
+        self._frame_block = shared_memory.SharedMemory(create=True,
+                                                       size=_Rings.frame_block_size(self.slots, self.capacity))
+        self._result_block = shared_memory.SharedMemory(create=True,
+                                                        size=_Rings.result_block_size(self.slots, self.max_hands))
+        self._rings = _Rings(self._frame_block, self._result_block, self.slots, self.capacity, self.max_hands)
+        self._rings.control[:] = 0
+
+    def _release(self):
+        if self._rings is not None:
+            self._rings.release()
+            self._rings = None
+        self._staged = None
+        for block in (self._frame_block, self._result_block):
+            if block is not None:
+                block.close()
+                block.unlink()
+        self._frame_block = self._result_block = None
+
+    def _launch(self):
+        worker_requests, self._requests = self._context.Pipe(duplex=False)
+        self._responses, worker_responses = self._context.Pipe(duplex=False)
+        self._process = self._context.Process(
+            target=_server_worker, name="InferenceServer", daemon=True,
+            args=(self._frame_block.name, self._result_block.name, self.slots, self.capacity,
+                  self.hands_settings, self.initial_complexity, worker_requests, worker_responses,
+                  get_thread_budget().worker_cores()))
+        with _without_main_script():
+            self._process.start()
+        # Only the worker holds its ends, so a dead worker shows up as EOF on our side
+        worker_requests.close()
+        worker_responses.close()
+
+        self._free = deque(range(self.slots))
+        self._in_flight.clear()
+        self._done.clear()
+        self._abandoned.clear()
+
+        deadline = time.perf_counter() + self.start_timeout
+        while True:
+            if self._responses.poll(0.5):
+                try:
+                    if self._responses.recv() == _READY:
+                        return
+                except EOFError:
+                    pass
+            if not self._process.is_alive() or time.perf_counter() > deadline:
+                exitcode = self._process.exitcode
+                self._stop_process()
+                raise InferenceWorkerError(f"Inference worker failed to start (exit code {exitcode})")
+
+    def _stop_process(self, timeout: float = 2.0):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.is_alive():
+            try:
+                self._requests.send(None)
+            except (OSError, ValueError):
+                pass
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout)
+        for connection in (self._requests, self._responses):
+            connection.close()
+        self._requests = self._responses = None
+
+    def close(self):
+        with self._lock:
+            self._stop_process()
+            self._release()
+            for model in self._fallback_models.values():
+                model.close()
+            self._fallback_models.clear()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    # --- Health ---
+
+    @property
+    def heartbeat_age(self) -> Optional[float]:
+        """Seconds since the worker last reported in."""
+        if self._rings is None or not self._rings.control[0]:
+            return None
+        return (time.perf_counter_ns() - int(self._rings.control[0])) / 1e9
+
+    def check_health(self) -> Optional[str]:
+        """None while the worker is healthy, otherwise why it is not."""
+        if self._process is None:
+            return "not running"
+        if not self._process.is_alive():
+            return f"worker exited (code {self._process.exitcode})"
+        age = self.heartbeat_age
+        if age is not None and age > self.heartbeat_timeout:
+            return f"no heartbeat for {age:.1f}s"
+        return None
+
+    def restart(self, reason: str) -> bool:
+        """
+        Kill the worker and start a fresh one on the same rings; in-flight frames
+        are dropped. Returns False (and degrades) once the restart budget is spent.
+        """
+        with self._lock:
+            self.last_failure = reason
+            now = time.perf_counter()
+            while self._restart_times and now - self._restart_times[0] > self.restart_window:
+                self._restart_times.popleft()
+            if len(self._restart_times) >= self.max_restarts:
+                self._degrade(f"{len(self._restart_times)} restarts within {self.restart_window:.0f}s, last: {reason}")
+                return False
+            self._restart_times.append(now)
+            self.restarts += 1
+            logger.warning("♻️  Restarting inference worker (%s), restart %d/%d in %.0fs", reason,
+                           len(self._restart_times), self.max_restarts, self.restart_window)
+            if self._process is not None and self._process.is_alive():
+                self._process.kill()
+            self._stop_process()
+            self._staged = None
+            self._rings.control[:] = 0
+            try:
+                self._launch()
+            except InferenceWorkerError as e:
+                self._degrade(str(e))
+                return False
+            self.restart_ms.append((time.perf_counter() - now) * 1000)
+            return True
+
+    def _degrade(self, reason: str):
+        """Stop using the worker for the rest of the session."""
+        self.degraded = True
+        self._stop_process()
+        self._staged = None
+        fallback = "in-process inference" if self.fallback_factory else "no detections"
+        logger.error("❌ Inference worker given up (%s) - continuing with %s", reason, fallback)
+
+    def _process_fallback(self, rgb_image: np.ndarray, complexity: int) -> List[Tuple[str, np.ndarray]]:
+        if self.fallback_factory is None:
+            return []
+        from ..core.hand_tracker import detections_from_results
+        model = self._fallback_models.get(complexity)
+        if model is None:
+            model = self._fallback_models[complexity] = self.fallback_factory(complexity)
+        return detections_from_results(model.process(rgb_image))
+
+    def _resize(self, height: int, width: int):
+        """Grow the frame ring for a larger frame (restarts the worker)."""
+        self.resizes += 1
+        logger.info("📐 Inference frame ring resized for %dx%d", width, height)
+        self._stop_process()
+        self._release()
+        self.capacity = height * width * 3
+        self._allocate()
+        self._launch()
+
+    # --- Requests ---
+
+    def _receive(self, timeout: float):
+        """Move finished slots from the response pipe into _done (or back to the free list)."""
+        try:
+            if not self._responses.poll(timeout):
+                if not self._process.is_alive():
+                    raise InferenceWorkerError(f"worker exited (code {self._process.exitcode})")
+                return
+            while True:
+                slot = self._responses.recv()
+                seq = self._in_flight.pop(slot, None)
+                if seq is None or seq in self._abandoned:
+                    self._abandoned.discard(seq)
+                    self._free.append(slot)
+                else:
+                    self._done[seq] = slot
+                if not self._responses.poll(0):
+                    return
+        except (EOFError, OSError) as e:
+            raise InferenceWorkerError(f"worker connection lost ({e!r})")
+
+    def _acquire(self) -> int:
+        deadline = time.perf_counter() + self.request_timeout
+        while not self._free:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError("no free frame slot")
+            self._receive(min(remaining, HEARTBEAT_INTERVAL))
+        return self._free.popleft()
+
+    def frame_buffer(self, height: int, width: int) -> np.ndarray:
+        """Writable (height, width, 3) view of the next frame slot, e.g. as cv2.cvtColor's dst."""
+        with self._lock:
+            if self.degraded:
+                if self._scratch is None or self._scratch.shape != (height, width, 3):
+                    self._scratch = np.empty((height, width, 3), np.uint8)
+                return self._scratch
+            if height * width * 3 > self.capacity:
+                self._resize(height, width)
+            if self._staged is None:
+                self._staged = (self._acquire(), None)
+            slot = self._staged[0]
+            view = self._rings.frame(slot, height, width)
+            self._staged = (slot, view)
+            return view
+
+    def submit(self, rgb_image: np.ndarray, complexity: int = 1) -> int:
+        """Queue an RGB frame; returns the sequence number to collect() it with."""
+        with self._lock:
+            height, width = rgb_image.shape[:2]
+            if height * width * 3 > self.capacity:
+                self._resize(height, width)
+            if self._staged is not None:
+                slot, view = self._staged
+                self._staged = None
+            else:
+                slot, view = self._acquire(), None
+            if view is None or view.shape != rgb_image.shape or not np.shares_memory(view, rgb_image):
+                self._rings.frame(slot, height, width)[...] = rgb_image
+
+            seq = self._next_seq
+            self._next_seq += 1
+            self._rings.frame_meta[slot] = (seq, height, width, complexity)
+            self._in_flight[slot] = seq
+            try:
+                self._requests.send(slot)
+            except (OSError, ValueError) as e:
+                self._in_flight.pop(slot, None)
+                self._abandoned.add(seq)
+                raise InferenceWorkerError(f"worker connection lost ({e!r})")
+            self.requests += 1
+            return seq
+
+    def collect(self, seq: int, timeout: Optional[float] = None) -> Tuple[List[Tuple[str, np.ndarray]], float]:
+        """Wait for a submitted frame: (detections, worker inference ms)."""
+        timeout = self.request_timeout if timeout is None else timeout
+        deadline = time.perf_counter() + timeout
+        with self._lock:
+            while seq not in self._done:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._abandoned.add(seq)
+                    raise TimeoutError(f"no inference result after {timeout:.1f}s")
+                self._receive(min(remaining, HEARTBEAT_INTERVAL))
+
+            slot = self._done.pop(seq)
+            _, status, count = (int(v) for v in self._rings.result_meta[slot])
+            inference_ms = float(self._rings.result_ms[slot])
+            detections = [(LABEL_NAMES[self._rings.result_labels[slot, i]],
+                           self._rings.result_landmarks[slot, i].astype(np.float64))
+                          for i in range(count)]
+            self._free.append(slot)
+        if status != _OK:
+            raise RuntimeError("Inference failed in the worker")
+        return detections, inference_ms
+
+    def process(self, rgb_image: np.ndarray, complexity: int = 1) -> List[Tuple[str, np.ndarray]]:
+        """
+        Synchronous inference. A failed or lost frame yields no detections; a sick
+        worker is restarted. Never raises for worker failures.
+        """
+        if self.degraded:
+            return self._process_fallback(rgb_image, complexity)
+        try:
+            return self.collect(self.submit(rgb_image, complexity))[0]
+        except (TimeoutError, InferenceWorkerError, RuntimeError) as e:
+            self.failed_requests += 1
+            self.last_failure = str(e)
+            reason = self.check_health()
+            if reason is None and isinstance(e, InferenceWorkerError):
+                reason = str(e)
+            if reason is not None:
+                self.restart(reason)
+            return []
+
+    def model(self, complexity: int) -> RemoteHands:
+        """Hands-like handle, e.g. for AdaptiveHandsModel's factory."""
+        return RemoteHands(self, complexity)
+
+    def get_stats(self) -> Dict[str, Any]:
+        age = self.heartbeat_age
+        return {
+            'running': self.running and self._process.is_alive(),
+            'pid': self._process.pid if self._process else None,
+            'slots': self.slots,
+            'frame_capacity': self.capacity,
+            'requests': self.requests,
+            'failed_requests': self.failed_requests,
+            'restarts': self.restarts,
+            'degraded': self.degraded,
+            'resizes': self.resizes,
+            'restart_ms': sum(self.restart_ms) / len(self.restart_ms) if self.restart_ms else 0.0,
+            'heartbeat_age_ms': age * 1000 if age is not None else None,
+            'last_failure': self.last_failure
+        }
+
+    def format_stats(self) -> str:
+        stats = self.get_stats()
+        text = f"{stats['requests']} frames, {stats['failed_requests']} failed, {stats['restarts']} restart(s)"
+        if stats['restarts']:
+            text += f" (avg {stats['restart_ms']:.0f}ms), last failure: {stats['last_failure']}"
+        if stats['degraded']:
+            text += " - worker given up, " + ("in-process fallback" if self.fallback_factory else "no detections")
+        return text
+
+
+# --- Benchmark ---
+
+def _load_frames(replay_source: Optional[str], frames: int, width: int, height: int) -> List[np.ndarray]:
+    """RGB frames from a recording, or noise frames when there is none."""
+    import cv2
+    images = []
+    if replay_source:
+        cap = cv2.VideoCapture(replay_source)
+        while len(images) < frames:
+            ok, image = cap.read()
+            if not ok:
+                break
+            images.append(cv2.cvtColor(cv2.resize(image, (width, height)), cv2.COLOR_BGR2RGB))
+        cap.release()
+    if not images:
+        rng = np.random.default_rng(0)
+        images = [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+    return [images[i % len(images)] for i in range(frames)]
+
+
+class _PythonLoad:
+    """Python work on a second thread; its rate shows how much the GIL is left to the rest of the app."""
+
+    def __init__(self):
+        self.iterations = 0
+        self._running = False
+        self._thread = None
+
+    def __enter__(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="BenchPythonLoad", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        pin_current_thread(PIPELINE)
+        while self._running:
+            for _ in range(1000):
+                self.iterations += 1
+
+    def __exit__(self, *exc):
+        self._running = False
+        self._thread.join()
+        return False
+
+
+def _summarize(mode: str, latencies: List[float], elapsed: float, python_iterations: int) -> Dict[str, Any]:
+    values = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        'mode': mode,
+        'frames': len(latencies),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'fps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'python_kops': python_iterations / elapsed / 1000 if elapsed > 0 else 0.0
+    }
+
+
+def run_inference_benchmark(replay_source: Optional[str] = None, frames: int = 300, width: int = 640,
+                            height: int = 480, complexity: int = 1, slots: int = 2) -> Dict[str, Any]:
+    """In-process vs out-of-process (synchronous and pipelined) latency/throughput, plus crash recovery time."""
+    import mediapipe as mp
+
+    images = _load_frames(replay_source, frames, width, height)
+    settings = dict(DEFAULT_HANDS_SETTINGS)
+    rows = []
+
+    with mp.solutions.hands.Hands(model_complexity=complexity, **settings) as hands:
+        hands.process(images[0])
+        latencies = []
+        with _PythonLoad() as load:
+            start = time.perf_counter()
+            for image in images:
+                t = time.perf_counter()
+                hands.process(image)
+                latencies.append((time.perf_counter() - t) * 1000)
+            elapsed = time.perf_counter() - start
+        rows.append(_summarize("in-process", latencies, elapsed, load.iterations))
+
+    server = InferenceServer(dict(settings, model_complexity=complexity), slots=slots,
+                             max_width=width, max_height=height)
+    startup_start = time.perf_counter()
+    server.start()
+    startup_ms = (time.perf_counter() - startup_start) * 1000
+    try:
+        server.process(images[0], complexity)
+
+        latencies = []
+        with _PythonLoad() as load:
+            start = time.perf_counter()
+            for image in images:
+                t = time.perf_counter()
+                server.process(image, complexity)
+                latencies.append((time.perf_counter() - t) * 1000)
+            elapsed = time.perf_counter() - start
+        rows.append(_summarize("worker, sync", latencies, elapsed, load.iterations))
+
+        # Keep every slot busy: the next frame is queued while the worker runs the current one
+        latencies, in_flight = [], deque()
+        with _PythonLoad() as load:
+            start = time.perf_counter()
+            for image in images:
+                if len(in_flight) == slots:
+                    seq, t = in_flight.popleft()
+                    server.collect(seq)
+                    latencies.append((time.perf_counter() - t) * 1000)
+                in_flight.append((server.submit(image, complexity), time.perf_counter()))
+            while in_flight:
+                seq, t = in_flight.popleft()
+                server.collect(seq)
+                latencies.append((time.perf_counter() - t) * 1000)
+            elapsed = time.perf_counter() - start
+        rows.append(_summarize(f"worker, {slots} in flight", latencies, elapsed, load.iterations))
+
+        # Crash recovery: kill the worker and time until frames flow again
+        server._process.kill()
+        crash_start = time.perf_counter()
+        while server.restarts == 0 and not server.degraded:
+            server.process(images[0], complexity)
+        server.process(images[0], complexity)
+        recovery_ms = (time.perf_counter() - crash_start) * 1000
+    finally:
+        server.close()
+
+    return {'rows': rows, 'startup_ms': startup_ms, 'recovery_ms': recovery_ms, 'frames': frames,
+            'resolution': f"{width}x{height}", 'complexity': complexity}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Out-of-process MediaPipe inference server")
+    parser.add_argument("--bench", action="store_true", help="Compare with in-process inference")
+    parser.add_argument("--replay", help="Recording to take benchmark frames from (default: noise frames)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--complexity", type=int, default=1)
+    parser.add_argument("--slots", type=int, default=2)
+    args = parser.parse_args()
+
+    if not args.bench:
+        parser.error("nothing to do (pass --bench)")
+    report = run_inference_benchmark(args.replay, args.frames, args.width, args.height, args.complexity, args.slots)
+    print(f"📈 Inference {report['resolution']}, model_complexity={report['complexity']}, {report['frames']} frames")
+    print(f"{'mode':<20} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'FPS':>7} {'Python kops/s':>14}")
+    for row in report['rows']:
+        print(f"{row['mode']:<20} {row['mean_ms']:>8.2f} {row['p50_ms']:>7.2f} {row['p95_ms']:>7.2f} "
+              f"{row['fps']:>7.1f} {row['python_kops']:>14.0f}")
+    print(f"Worker start-up {report['startup_ms']:.0f}ms, crash recovery {report['recovery_ms']:.0f}ms")
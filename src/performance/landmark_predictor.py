@@ -0,0 +1,84 @@
+"""
+Landmark prediction for frames where inference is skipped or late.
+
+Each of the 21 landmarks is tracked by a constant-velocity alpha-beta filter
+(the steady-state form of a constant-velocity Kalman filter), vectorized over
+all landmarks with NumPy. Between inferences the filter extrapolates the last
+state to the requested time, and the prediction confidence decays with the
+age of the last real observation.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class LandmarkPredictor:
+    """Vectorized constant-velocity predictor for a (21, 3) landmark array."""
+
+    def __init__(self, alpha: float = 0.85, beta: float = 0.25,
+                 confidence_half_life: float = 0.1, max_prediction_age: float = 0.3,
+                 max_velocity: float = 5.0):
+        self.alpha = alpha                                # Position correction gain
+        self.beta = beta                                  # Velocity correction gain
+        self.confidence_half_life = confidence_half_life  # Seconds until confidence halves
+        self.max_prediction_age = max_prediction_age      # Stop predicting after this long
+        self.max_velocity = max_velocity                  # Clamp (normalized units / second)
+
+        self.position = None
+        self.velocity = None
+        self.last_observation_time = None
+
+        # Statistics
+        self.observations = 0
+        self.predictions = 0
+
+    @property
+    def has_track(self) -> bool:
+        return self.position is not None
+
+    def reset(self):
+        """Drop the current track (e.g. hand lost)."""
+        self.position = None
+        self.velocity = None
+        self.last_observation_time = None
+
+    def observe(self, landmarks: np.ndarray, timestamp: float):
+        """Correct the filter with a fresh inference result."""
+        landmarks = np.asarray(landmarks, dtype=np.float64)
+        self.observations += 1
+
+        if self.position is None:
+            self.position = landmarks.copy()
+            self.velocity = np.zeros_like(landmarks)
+            self.last_observation_time = timestamp
+            return
+
+        dt = timestamp - self.last_observation_time
+        if dt <= 0:
+            self.position = landmarks.copy()
+            return
+
+        predicted = self.position + self.velocity * dt
+        residual = landmarks - predicted
+        self.position = predicted + self.alpha * residual
+        self.velocity = self.velocity + (self.beta / dt) * residual
+        np.clip(self.velocity, -self.max_velocity, self.max_velocity, out=self.velocity)
+        self.last_observation_time = timestamp
+
+    def predict(self, timestamp: float) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        Extrapolate landmarks to timestamp.
+        Returns (landmarks, confidence) or None if there is no usable track.
+        """
+        if self.position is None:
+            return None
+
+        age = timestamp - self.last_observation_time
+        if age > self.max_prediction_age:
+            return None
+
+        age = max(0.0, age)
+        self.predictions += 1
+        confidence = 0.5 ** (age / self.confidence_half_life) if self.confidence_half_life > 0 else 1.0
+        return self.position + self.velocity * age, confidence
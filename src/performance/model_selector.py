@@ -0,0 +1,187 @@
+"""
+Adaptive MediaPipe model complexity selection for AzimuthControl.
+
+Holds a complexity-1 (full) and a complexity-0 (lite) MediaPipe Hands
+instance, created on demand, and routes frames to whichever fits the
+per-frame latency budget. The controller drops to the lite model when the
+measured inference latency exceeds the budget or the system is loaded, moves
+back once there is headroom, and logs every transition with the latency
+measured before and after the switch.
+
+The resolution governor answers the same latency signal against the same
+budget, so the two are ordered through can_switch (e.g. "the governor is on
+its bottom rung"): the resolution is cut first and the model is only
+downgraded once no lower resolution is left, and on recovery the model is
+upgraded before the governor climbs again (see ResolutionGovernor.can_increase).
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Any, List, Optional
+
+from ..core.clock import get_clock
+
+logger = logging.getLogger(__name__)
+
+FULL_COMPLEXITY = 1
+LITE_COMPLEXITY = 0
+
+
+class AdaptiveHandsModel:
+    """Drop-in replacement for a mp.solutions.hands.Hands instance."""
+
+    def __init__(self, hands_factory: Callable[[int], Any], latency_budget_ms: float = 20.0,
+                 initial_complexity: int = FULL_COMPLEXITY, enabled: bool = True,
+                 downgrade_frames: int = 15, upgrade_frames: int = 90, max_upgrade_frames: int = 1800,
+                 headroom_ratio: float = 0.5, cpu_threshold: float = 85.0,
+                 keep_both_models: bool = True, settle_frames: int = 30,
+                 can_switch: Optional[Callable[[], bool]] = None, clock=None):
+        self.hands_factory = hands_factory            # complexity -> Hands instance
+        self.latency_budget_ms = latency_budget_ms
+        self.enabled = enabled
+        self.downgrade_frames = downgrade_frames      # Consecutive over-budget frames before dropping
+        self.base_upgrade_frames = upgrade_frames     # Consecutive headroom frames before upgrading
+        self.upgrade_frames = upgrade_frames
+        self.max_upgrade_frames = max_upgrade_frames  # Backoff cap after repeated downgrades
+        self.headroom_ratio = headroom_ratio          # Lite latency must be below budget * ratio
+        self.cpu_threshold = cpu_threshold
+        self.keep_both_models = keep_both_models
+        self.settle_frames = settle_frames            # Samples on the new model before logging "after"
+        self.can_switch = can_switch                  # () -> bool: resolution can't give more, model may switch
+        self.clock = clock if clock is not None else get_clock()
+
+        self.models: Dict[int, Any] = {}
+        self.latency_ewma: Dict[int, float] = {}
+        self.complexity = initial_complexity
+        self.cpu_usage = 0.0
+        self.over_budget_frames = 0
+        self.headroom_frames = 0
+        self.frames_on_model = 0
+
+        self.transitions: List[Dict[str, Any]] = []
+        self._pending_transition: Optional[Dict[str, Any]] = None
+
+        self._get_model(self.complexity)
+
+    def _get_model(self, complexity: int):
+        if complexity not in self.models:
+            start = time.perf_counter()
+            self.models[complexity] = self.hands_factory(complexity)
+            logger.info("🧠 MediaPipe Hands (model_complexity=%d) created in %.0fms",
+                        complexity, (time.perf_counter() - start) * 1000)
+        return self.models[complexity]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        for model in self.models.values():
+            try:
+                model.close()
+            except Exception:
+                pass
+        self.models.clear()
+
+    def warmup(self, rgb_image):
+        """Run the active model once (graph init) without feeding the latency controller."""
+        self._get_model(self.complexity).process(rgb_image)
+
+    def update_system_load(self, cpu_usage: float):
+        """Latest CPU usage (percent) for load-based switching."""
+        self.cpu_usage = cpu_usage
+
+    def process(self, rgb_image, measure: bool = True):
+        """
+        Run inference on the active model and adapt complexity. measure=False
+        keeps the frame out of the latency estimate (e.g. idle-mode frames at a
+        reduced resolution, which say nothing about the normal workload).
+        """
+        model = self._get_model(self.complexity)
+        start = time.perf_counter()
+        results = model.process(rgb_image)
+        if measure:
+            self._record_latency((time.perf_counter() - start) * 1000)
+        return results
+
+    def _record_latency(self, latency_ms: float):
+        previous = self.latency_ewma.get(self.complexity)
+        self.latency_ewma[self.complexity] = latency_ms if previous is None else 0.9 * previous + 0.1 * latency_ms
+        self.frames_on_model += 1
+
+        if self._pending_transition and self.frames_on_model >= self.settle_frames:
+            transition = self._pending_transition
+            transition['latency_after_ms'] = self.latency_ewma[self.complexity]
+            logger.info("🧠 Model complexity %d→%d settled: %.1fms → %.1fms", transition['from'], transition['to'],
+                        transition['latency_before_ms'], transition['latency_after_ms'])
+            self._pending_transition = None
+
+        if self.enabled:
+            self._adapt()
+
+    def _adapt(self):
+        latency = self.latency_ewma[self.complexity]
+        overloaded = self.cpu_usage > self.cpu_threshold
+        if self.can_switch is not None and not self.can_switch():
+            # The resolution governor still has room: it acts first, the model holds
+            self.over_budget_frames = 0
+            self.headroom_frames = 0
+            return
+
+        if self.complexity == FULL_COMPLEXITY:
+            if latency > self.latency_budget_ms or overloaded:
+                self.over_budget_frames += 1
+            else:
+                self.over_budget_frames = 0
+            if self.over_budget_frames >= self.downgrade_frames:
+                reason = "cpu load" if overloaded else "latency budget"
+                self._switch(LITE_COMPLEXITY, reason)
+                # Back off further upgrade attempts if we keep bouncing
+                self.upgrade_frames = min(self.max_upgrade_frames, self.upgrade_frames * 2)
+        else:
+            if latency < self.latency_budget_ms * self.headroom_ratio and not overloaded:
+                self.headroom_frames += 1
+            else:
+                self.headroom_frames = 0
+            if self.headroom_frames >= self.upgrade_frames:
+                self._switch(FULL_COMPLEXITY, "headroom")
+
+    def _switch(self, complexity: int, reason: str):
+        latency_before = self.latency_ewma.get(self.complexity, 0.0)
+        transition = {
+            'time': self.clock.now(),
+            'from': self.complexity,
+            'to': complexity,
+            'reason': reason,
+            'cpu_usage': self.cpu_usage,
+            'latency_before_ms': latency_before,
+            'latency_after_ms': None
+        }
+        logger.info("🧠 Switching model_complexity %d→%d (%s): %.1fms vs budget %.1fms, CPU %.0f%%",
+                    self.complexity, complexity, reason, latency_before, self.latency_budget_ms, self.cpu_usage)
+
+        if not self.keep_both_models:
+            old_model = self.models.pop(self.complexity, None)
+            if old_model is not None:
+                old_model.close()
+
+        self.complexity = complexity
+        self._get_model(complexity)
+        self.latency_ewma.pop(complexity, None)  # Re-measure, old tracking state is stale
+        self.over_budget_frames = 0
+        self.headroom_frames = 0
+        self.frames_on_model = 0
+        self.transitions.append(transition)
+        self._pending_transition = transition
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'model_complexity': self.complexity,
+            'latency_ms': dict(self.latency_ewma),
+            'latency_budget_ms': self.latency_budget_ms,
+            'transitions': len(self.transitions),
+            'upgrade_frames': self.upgrade_frames
+        }
@@ -3,22 +3,29 @@ import threading
 from collections import deque
 import json
 
+from .thread_budget import pin_current_thread, BACKGROUND
+from ..utils.streaming_stats import WindowedStats, P2Quantile
+
 class PerformanceMonitor:
     """
     Real-time performance monitoring for the gesture recognition system.
     """
     
     def __init__(self):
+        # Windowed mean/max over the last 60 values, O(1) per update
         self.metrics = {
-            'frame_times': deque(maxlen=60),
-            'gesture_processing_times': deque(maxlen=60),
-            'cpu_usage': deque(maxlen=60),
-            'memory_usage': deque(maxlen=60),
-            'gpu_usage': deque(maxlen=60),
-            'cache_hit_rate': deque(maxlen=60),
+            'frame_times': WindowedStats(60),
+            'gesture_processing_times': WindowedStats(60),
+            'cpu_usage': WindowedStats(60),
+            'memory_usage': WindowedStats(60),
+            'gpu_usage': WindowedStats(60),
+            'cache_hit_rate': WindowedStats(60),
             'gesture_counts': {},
             'performance_warnings': deque(maxlen=20)
         }
+        # Session-wide tail latency without storing samples
+        self.frame_time_p95 = P2Quantile(0.95)
+        self.processing_time_p95 = P2Quantile(0.95)
         
         self.thresholds = {
             'max_frame_time': 0.033,  # 30 FPS
@@ -34,7 +41,7 @@ class PerformanceMonitor:
     def start_monitoring(self):
         """Start the performance monitoring thread."""
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop)
+        self.monitor_thread = threading.Thread(target=self._monitor_loop, name="PerformanceMonitor")
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
         
@@ -46,23 +53,25 @@ class PerformanceMonitor:
     
     def log_frame_time(self, frame_time):
         """Log frame processing time."""
-        self.metrics['frame_times'].append(frame_time)
+        self.metrics['frame_times'].update(frame_time)
+        self.frame_time_p95.update(frame_time)
         
         if frame_time > self.thresholds['max_frame_time']:
             self._add_warning(f"High frame time: {frame_time:.3f}s")
     
     def log_gesture_processing_time(self, processing_time):
         """Log gesture processing time."""
-        self.metrics['gesture_processing_times'].append(processing_time)
+        self.metrics['gesture_processing_times'].update(processing_time)
+        self.processing_time_p95.update(processing_time)
         
         if processing_time > self.thresholds['max_processing_time']:
             self._add_warning(f"High processing time: {processing_time:.3f}s")
     
     def log_system_metrics(self, cpu_usage, memory_usage, gpu_usage=0):
         """Log system resource usage."""
-        self.metrics['cpu_usage'].append(cpu_usage)
-        self.metrics['memory_usage'].append(memory_usage)
-        self.metrics['gpu_usage'].append(gpu_usage)
+        self.metrics['cpu_usage'].update(cpu_usage)
+        self.metrics['memory_usage'].update(memory_usage)
+        self.metrics['gpu_usage'].update(gpu_usage)
         
         if cpu_usage > self.thresholds['max_cpu_usage']:
             self._add_warning(f"High CPU usage: {cpu_usage:.1f}%")
@@ -78,7 +87,7 @@ class PerformanceMonitor:
     def log_cache_performance(self, cache_hits, total_requests):
         """Log cache performance metrics."""
         hit_rate = cache_hits / total_requests if total_requests > 0 else 0
-        self.metrics['cache_hit_rate'].append(hit_rate)
+        self.metrics['cache_hit_rate'].update(hit_rate)
         
         if hit_rate < self.thresholds['min_cache_hit_rate']:
             self._add_warning(f"Low cache hit rate: {hit_rate:.2f}")
@@ -87,30 +96,31 @@ class PerformanceMonitor:
         """Get a summary of current performance metrics."""
         summary = {}
         
-        if self.metrics['frame_times']:
-            frame_times = list(self.metrics['frame_times'])
-            summary['avg_frame_time'] = sum(frame_times) / len(frame_times)
-            summary['max_frame_time'] = max(frame_times)
+        frame_times = self.metrics['frame_times']
+        if len(frame_times):
+            summary['avg_frame_time'] = frame_times.mean
+            summary['max_frame_time'] = frame_times.max
+            summary['p95_frame_time'] = self.frame_time_p95.value
             summary['current_fps'] = 1.0 / summary['avg_frame_time'] if summary['avg_frame_time'] > 0 else 0
         
-        if self.metrics['gesture_processing_times']:
-            proc_times = list(self.metrics['gesture_processing_times'])
-            summary['avg_processing_time'] = sum(proc_times) / len(proc_times)
-            summary['max_processing_time'] = max(proc_times)
+        proc_times = self.metrics['gesture_processing_times']
+        if len(proc_times):
+            summary['avg_processing_time'] = proc_times.mean
+            summary['max_processing_time'] = proc_times.max
+            summary['p95_processing_time'] = self.processing_time_p95.value
         
-        if self.metrics['cpu_usage']:
-            cpu_usage = list(self.metrics['cpu_usage'])
-            summary['avg_cpu_usage'] = sum(cpu_usage) / len(cpu_usage)
-            summary['max_cpu_usage'] = max(cpu_usage)
+        cpu_usage = self.metrics['cpu_usage']
+        if len(cpu_usage):
+            summary['avg_cpu_usage'] = cpu_usage.mean
+            summary['max_cpu_usage'] = cpu_usage.max
         
-        if self.metrics['memory_usage']:
-            mem_usage = list(self.metrics['memory_usage'])
-            summary['avg_memory_usage'] = sum(mem_usage) / len(mem_usage)
-            summary['max_memory_usage'] = max(mem_usage)
+        mem_usage = self.metrics['memory_usage']
+        if len(mem_usage):
+            summary['avg_memory_usage'] = mem_usage.mean
+            summary['max_memory_usage'] = mem_usage.max
         
-        if self.metrics['cache_hit_rate']:
-            hit_rates = list(self.metrics['cache_hit_rate'])
-            summary['avg_cache_hit_rate'] = sum(hit_rates) / len(hit_rates)
+        if len(self.metrics['cache_hit_rate']):
+            summary['avg_cache_hit_rate'] = self.metrics['cache_hit_rate'].mean
         
         summary['gesture_counts'] = dict(self.metrics['gesture_counts'])
         summary['recent_warnings'] = list(self.metrics['performance_warnings'])
@@ -124,6 +134,7 @@ class PerformanceMonitor:
     
     def _monitor_loop(self):
         """Background monitoring loop."""
+        pin_current_thread(BACKGROUND)
         while self.monitoring_active:
             # Perform periodic analysis and cleanup
             self._analyze_performance_trends()
@@ -134,8 +145,7 @@ class PerformanceMonitor:
         if len(self.metrics['frame_times']) < 30:
             return  # Not enough data
         
-        recent_frame_times = list(self.metrics['frame_times'])[-30:]
-        avg_recent = sum(recent_frame_times) / len(recent_frame_times)
+        avg_recent = self.metrics['frame_times'].rolling.tail_mean(30)
         
         # Check for performance degradation
         if avg_recent > self.thresholds['max_frame_time'] * 1.2:
@@ -147,11 +157,15 @@ class PerformanceMonitor:
             'timestamp': time.time(),
             'summary': self.get_performance_summary(),
             'raw_metrics': {
-                'frame_times': list(self.metrics['frame_times']),
-                'processing_times': list(self.metrics['gesture_processing_times']),
-                'cpu_usage': list(self.metrics['cpu_usage']),
-                'memory_usage': list(self.metrics['memory_usage']),
-                'cache_hit_rates': list(self.metrics['cache_hit_rate'])
+                'frame_times': self.metrics['frame_times'].rolling.values().tolist(),
+                'processing_times': self.metrics['gesture_processing_times'].rolling.values().tolist(),
+                'cpu_usage': self.metrics['cpu_usage'].rolling.values().tolist(),
+                'memory_usage': self.metrics['memory_usage'].rolling.values().tolist(),
+                'cache_hit_rates': self.metrics['cache_hit_rate'].rolling.values().tolist()
+            },
+            'session': {
+                'frame_times': self.metrics['frame_times'].session.to_dict(),
+                'processing_times': self.metrics['gesture_processing_times'].session.to_dict()
             }
         }
         
@@ -163,7 +177,9 @@ class PerformanceMonitor:
     def reset_metrics(self):
         """Reset all metrics for a fresh start."""
         for key in self.metrics:
-            if isinstance(self.metrics[key], deque):
-                self.metrics[key].clear()
-            elif isinstance(self.metrics[key], dict):
+            if isinstance(self.metrics[key], WindowedStats):
+                self.metrics[key].reset()
+            elif isinstance(self.metrics[key], (deque, dict)):
                 self.metrics[key].clear()
+        self.frame_time_p95.reset()
+        self.processing_time_p95.reset()
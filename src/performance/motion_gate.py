@@ -0,0 +1,122 @@
+"""
+Motion-gated inference skipping for AzimuthControl.
+
+Computes a tiny downsampled grayscale difference against the last frame that
+went through MediaPipe (optionally restricted to the last hand ROI) and skips
+inference while the scene is still, reusing the previous landmarks. A maximum
+skip bound guarantees a fresh inference at least every N+1 frames.
+"""
+
+import time
+from typing import Optional, Tuple, Dict, Any
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Decides per frame whether hand inference needs to run."""
+
+    def __init__(self, threshold: float = 3.0, max_skip_frames: int = 4,
+                 thumbnail_size: Tuple[int, int] = (64, 48), roi_margin: float = 0.15):
+        self.threshold = threshold              # Mean absolute gray-level difference (0-255)
+        self.max_skip_frames = max_skip_frames  # Force inference after this many skips
+        self.thumbnail_size = thumbnail_size
+        self.roi_margin = roi_margin            # ROI padding as a fraction of ROI size
+
+        self.reference_thumbnail = None
+        self.pending_thumbnail = None
+        self.consecutive_skips = 0
+        self.last_motion_score = 0.0
+
+        # Metrics
+        self.frames_seen = 0
+        self.frames_skipped = 0
+        self.frames_inferred = 0
+        self.avg_inference_ms = 0.0
+        self.total_gate_ms = 0.0
+
+    def _make_thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        # Strided view first (free), then area-average the remaining ~2x oversampling
+        tw, th = self.thumbnail_size
+        step = max(1, min(frame.shape[1] // (tw * 2), frame.shape[0] // (th * 2)))
+        small = cv2.resize(frame[::step, ::step], self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def _roi_slice(self, roi: Tuple[float, float, float, float]) -> Tuple[slice, slice]:
+        """Convert a normalized (min_x, min_y, max_x, max_y) ROI to thumbnail slices."""
+        tw, th = self.thumbnail_size
+        min_x, min_y, max_x, max_y = roi
+        pad_x = (max_x - min_x) * self.roi_margin
+        pad_y = (max_y - min_y) * self.roi_margin
+        x0 = int(max(0.0, min_x - pad_x) * tw)
+        x1 = int(np.ceil(min(1.0, max_x + pad_x) * tw))
+        y0 = int(max(0.0, min_y - pad_y) * th)
+        y1 = int(np.ceil(min(1.0, max_y + pad_y) * th))
+        return slice(y0, max(y1, y0 + 1)), slice(x0, max(x1, x0 + 1))
+
+    def measure_motion(self, thumbnail: np.ndarray, roi=None) -> float:
+        """Mean absolute difference to the reference thumbnail (inf if none)."""
+        if self.reference_thumbnail is None:
+            return float('inf')
+        diff = cv2.absdiff(thumbnail, self.reference_thumbnail)
+        if roi is not None:
+            rows, cols = self._roi_slice(roi)
+            diff = diff[rows, cols]
+        return float(diff.mean()) if diff.size else float('inf')
+
+    def should_infer(self, frame: np.ndarray, roi=None) -> bool:
+        """
+        Check whether this frame needs inference.
+        roi: last hand ROI in normalized image coordinates, or None for full frame.
+        """
+        gate_start = time.perf_counter()
+        self.frames_seen += 1
+
+        thumbnail = self._make_thumbnail(frame)
+        self.last_motion_score = self.measure_motion(thumbnail, roi)
+
+        run_inference = (self.last_motion_score >= self.threshold or
+                         self.consecutive_skips >= self.max_skip_frames)
+        if run_inference:
+            self.pending_thumbnail = thumbnail
+        else:
+            self.consecutive_skips += 1
+            self.frames_skipped += 1
+
+        self.total_gate_ms += (time.perf_counter() - gate_start) * 1000
+        return run_inference
+
+    def record_inference(self, inference_ms: float):
+        """Report that inference ran on the last gated frame and how long it took."""
+        if self.pending_thumbnail is not None:
+            self.reference_thumbnail = self.pending_thumbnail
+            self.pending_thumbnail = None
+        self.consecutive_skips = 0
+        self.frames_inferred += 1
+        if self.frames_inferred == 1:
+            self.avg_inference_ms = inference_ms
+        else:
+            self.avg_inference_ms = 0.9 * self.avg_inference_ms + 0.1 * inference_ms
+
+    def reset(self):
+        """Force the next frame through inference (e.g. after a resolution change)."""
+        self.reference_thumbnail = None
+        self.pending_thumbnail = None
+        self.consecutive_skips = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Skip rate and estimated CPU time saved."""
+        skip_rate = self.frames_skipped / self.frames_seen if self.frames_seen else 0.0
+        saved_ms = self.frames_skipped * self.avg_inference_ms - self.total_gate_ms
+        return {
+            'frames_seen': self.frames_seen,
+            'frames_skipped': self.frames_skipped,
+            'skip_rate': skip_rate,
+            'avg_inference_ms': self.avg_inference_ms,
+            'avg_gate_ms': self.total_gate_ms / self.frames_seen if self.frames_seen else 0.0,
+            'cpu_saved_ms': max(0.0, saved_ms),
+            'last_motion_score': self.last_motion_score
+        }
@@ -2,10 +2,15 @@ import numpy as np
 import time
 from collections import defaultdict
 from .optimizer import PerformanceOptimizer
-from .optimized_validator import OptimizedGestureValidator
+from .optimized_validator import OptimizedGestureValidator, warmup_jit
+from .landmark_predictor import LandmarkPredictor
+from ..controls.movement_control import MovementController
 import ctypes
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 class OptimizedGestureEngine:
     """
     Author-calibrated high-performance gesture recognition engine for HandsFree Gaming.
@@ -27,23 +32,36 @@ class OptimizedGestureEngine:
     - Gaming-oriented gesture stability (3-frame confirmation)
     """
     
-    def __init__(self):
+    def __init__(self, clock=None, movement_controller=None, shared=None):
+        # Injectable clock so replays can drive time from frame timestamps
+        from ..core.clock import get_clock
+        self.clock = clock if clock is not None else get_clock()
+        
         # Author-specific performance profile (stdnt-c1's hardware - 2025-08-03)
         self.AUTHOR_TARGET_FPS = 30  # Author's gaming preference
         self.AUTHOR_CPU_THRESHOLD = 80  # Based on author's system performance
         self.AUTHOR_MEMORY_THRESHOLD = 85  # Author's available RAM consideration
         self.STABILITY_FRAMES = 3  # Author's preferred responsiveness vs stability
         
-        # CRITICAL: Load configuration to respect enabled/disabled settings
-        from ..core.config_manager import get_controls_config
-        self.controls_config = get_controls_config()
+        self.performance_optimizer = PerformanceOptimizer(clock=self.clock)
         
-        self.performance_optimizer = PerformanceOptimizer()
-        self.validator = OptimizedGestureValidator()
+        # Per-hand depth calibration and movement hysteresis (one controller per engine)
+        self.movement_controller = movement_controller if movement_controller is not None else MovementController()
         
-        # Load C++ extension if available (75% performance boost for author's system)
-        self.cpp_extension = None
-        self._load_cpp_extension()
+        if shared is not None:
+            # Another hand's engine: config, validator and C++ extension hold no per-hand state
+            self.controls_config = shared.controls_config
+            self.validator = shared.validator
+            self.cpp_extension = shared.cpp_extension
+        else:
+            # CRITICAL: Load configuration to respect enabled/disabled settings
+            from ..core.config_manager import get_controls_config
+            self.controls_config = get_controls_config()
+            self.validator = OptimizedGestureValidator()
+            
+            # Load C++ extension if available (75% performance boost for author's system)
+            self.cpp_extension = None
+            self._load_cpp_extension()
         
         # Gesture processing state
         self.last_gesture_results = {
@@ -61,6 +79,9 @@ class OptimizedGestureEngine:
             'max_processing_time': 0.016  # 16ms max processing time
         }
         
+        # Landmark prediction for frames where inference is skipped or late
+        self.landmark_predictor = LandmarkPredictor()
+        
         # Frame-to-frame tracking
         self.previous_landmarks_hash = None
         self.gesture_confidence_tracker = defaultdict(int)
@@ -87,6 +108,21 @@ class OptimizedGestureEngine:
             print("   Using Python fallback (slower performance)")
             self.cpp_extension = None
     
+    def spawn(self, movement_controller=None, clock=None):
+        """
+        Engine for another hand or session. Shares this engine's config,
+        validator and C++ extension; has its own movement controller, gesture
+        cache, landmark predictor and stability filter (and optionally clock).
+        """
+        return OptimizedGestureEngine(clock=clock if clock is not None else self.clock,
+                                      movement_controller=movement_controller, shared=self)
+    
+    def warmup(self) -> float:
+        """Compile JIT kernels before the first frame; returns the time taken in ms."""
+        start = time.perf_counter()
+        warmup_jit()
+        return (time.perf_counter() - start) * 1000
+    
     def _setup_cpp_functions(self):
         """Setup C++ function signatures."""
         if self.cpp_extension:
@@ -105,15 +141,18 @@ class OptimizedGestureEngine:
             self.cpp_extension.batch_bbox_check.restype = ctypes.c_int
     
     def process_frame(self, landmarks, palm_bbox, neutral_area=None, neutral_distances=None, 
-                     cpu_usage=0.0, memory_usage=0.0):
+                     cpu_usage=0.0, memory_usage=0.0, predicted=False):
         """
         Main frame processing function with intelligent optimization.
+        predicted=True marks extrapolated landmarks (no inference this frame): they
+        drive the gestures but do not refine calibration or depth smoothing.
         """
-        start_time = time.time()
+        # Processing cost is measured in real time; scheduling uses the injected clock
+        start_time = time.perf_counter()
         
         # Check if we should process this frame
         if not self.performance_optimizer.should_process_frame():
-            return self.last_gesture_results
+            return self._fill_throttled_frame(landmarks, palm_bbox, predicted)
         
         # Convert landmarks to numpy array for faster processing
         landmarks_array = self._landmarks_to_array(landmarks)
@@ -130,7 +169,7 @@ class OptimizedGestureEngine:
         
         # Process gestures with adaptive quality
         results = self._process_gestures_optimized(landmarks_array, palm_bbox, 
-                                                 neutral_area, neutral_distances)
+                                                 neutral_area, neutral_distances, predicted)
         
         # Apply stability filtering
         stable_results = self._apply_stability_filter(results)
@@ -139,13 +178,13 @@ class OptimizedGestureEngine:
         self.performance_optimizer.cache_gesture(landmarks_hash, stable_results)
         
         # Update performance metrics
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         self.performance_optimizer.update_performance_metrics(processing_time, cpu_usage, memory_usage)
-        self.performance_optimizer.last_process_time = time.time()
+        self.performance_optimizer.last_process_time = self.clock.now()
         
         # Track processing history for debugging
         self.processing_history.append({
-            'time': time.time(),
+            'time': self.clock.now(),
             'processing_time': processing_time,
             'results': stable_results
         })
@@ -159,8 +198,43 @@ class OptimizedGestureEngine:
         
         return stable_results
     
+    def _fill_throttled_frame(self, landmarks, palm_bbox, predicted):
+        """
+        Frame skipped by the optimizer's rate limit: refresh the continuous
+        movement output from this frame's landmarks (already oriented and
+        smoothed by the caller, and cheap), keep the other categories from the
+        last full pass.
+        """
+        if not self.controls_config.get('MovementControl', {}).get('enabled', False):
+            return self.last_gesture_results
+        
+        results = dict(self.last_gesture_results)
+        try:
+            results['movement'] = self._process_movement_gestures(self._landmarks_to_array(landmarks), palm_bbox,
+                                                                  None, None, predicted)
+        except Exception as e:
+            logger.warning("Error processing throttled movement: %s", e)
+        return results
+    
+    def observe_landmarks(self, landmarks_array, timestamp=None):
+        """Feed a fresh inference result (numpy (21, 3)) to the landmark predictor."""
+        self.landmark_predictor.observe(landmarks_array, self.clock.now() if timestamp is None else timestamp)
+    
+    def predict_landmarks(self, timestamp=None):
+        """
+        Extrapolated landmarks for a frame without inference.
+        Returns (landmarks_array, confidence) or None when the track is too old.
+        """
+        return self.landmark_predictor.predict(self.clock.now() if timestamp is None else timestamp)
+    
+    def reset_prediction(self):
+        """Drop the predictor track (hand lost)."""
+        self.landmark_predictor.reset()
+    
     def _landmarks_to_array(self, landmarks):
         """Convert MediaPipe landmarks to numpy array for faster processing."""
+        if isinstance(landmarks, np.ndarray):
+            return landmarks
         return np.array([[lm.x, lm.y, lm.z] for lm in landmarks.landmark])
     
     def _is_similar_to_previous(self, landmarks_hash):
@@ -174,16 +248,17 @@ class OptimizedGestureEngine:
         # Simple hash comparison for now
         return landmarks_hash == self.previous_landmarks_hash
     
-    def _process_gestures_optimized(self, landmarks_array, palm_bbox, neutral_area, neutral_distances):
+    def _process_gestures_optimized(self, landmarks_array, palm_bbox, neutral_area, neutral_distances, predicted=False):
         """Process all gesture types with optimized validation - RESPECTING CONFIG SETTINGS."""
         results = {}
         
         # CRITICAL FIX: Only process enabled gesture controls from config
         if self.controls_config.get('MovementControl', {}).get('enabled', False):
             try:
-                results['movement'] = self._process_movement_gestures(landmarks_array, palm_bbox, neutral_area, neutral_distances)
+                results['movement'] = self._process_movement_gestures(landmarks_array, palm_bbox, neutral_area,
+                                                                      neutral_distances, predicted)
             except Exception as e:
-                print(f"Error processing movement: {e}")
+                logger.warning("Error processing movement: %s", e)
                 results['movement'] = 'NEUTRAL'
         else:
             results['movement'] = 'NEUTRAL'
@@ -192,7 +267,7 @@ class OptimizedGestureEngine:
             try:
                 results['action'] = self._process_action_gestures(landmarks_array, palm_bbox)
             except Exception as e:
-                print(f"Error processing action: {e}")
+                logger.warning("Error processing action: %s", e)
                 results['action'] = 'NEUTRAL'
         else:
             results['action'] = 'NEUTRAL'
@@ -201,7 +276,7 @@ class OptimizedGestureEngine:
             try:
                 results['camera'] = self._process_camera_gestures(landmarks_array, palm_bbox, neutral_distances)
             except Exception as e:
-                print(f"Error processing camera: {e}")
+                logger.warning("Error processing camera: %s", e)
                 results['camera'] = 'NEUTRAL'
         else:
             results['camera'] = 'NEUTRAL'
@@ -210,7 +285,7 @@ class OptimizedGestureEngine:
             try:
                 results['navigation'] = self._process_navigation_gestures(landmarks_array, palm_bbox)
             except Exception as e:
-                print(f"Error processing navigation: {e}")
+                logger.warning("Error processing navigation: %s", e)
                 results['navigation'] = 'NEUTRAL'
         else:
             results['navigation'] = 'NEUTRAL'
@@ -227,28 +302,9 @@ class OptimizedGestureEngine:
         
         return "NEUTRAL"
     
-    def _process_movement_gestures(self, landmarks_array, palm_bbox, neutral_area, neutral_distances):
-        """Process movement gestures with enhanced depth detection."""
-        # Import the enhanced movement controller
-        from ..controls.movement_control import determine_movement_status
-        
-        # Create a mock MediaPipe landmarks object from numpy array
-        class MockLandmark:
-            def __init__(self, x, y, z):
-                self.x = x
-                self.y = y
-                self.z = z
-        
-        class MockLandmarks:
-            def __init__(self, landmarks_array):
-                self.landmark = []
-                for row in landmarks_array:
-                    self.landmark.append(MockLandmark(row[0], row[1], row[2]))
-        
-        mock_landmarks = MockLandmarks(landmarks_array)
-        result = determine_movement_status(mock_landmarks, palm_bbox)
-        
-        return result
+    def _process_movement_gestures(self, landmarks_array, palm_bbox, neutral_area, neutral_distances, predicted=False):
+        """Process movement gestures with enhanced depth detection (this engine's hand only)."""
+        return self.movement_controller.determine_movement_status(landmarks_array, palm_bbox, predicted)
     
     def _process_camera_gestures(self, landmarks_array, palm_bbox, neutral_distances):
         """Process camera gestures (placeholder for now)."""
@@ -42,6 +42,12 @@ def fast_bbox_check(tip_x, tip_y, min_x, max_x, min_y, max_y):
     """Fast bounding box check using Numba."""
     return min_x <= tip_x <= max_x and min_y <= tip_y <= max_y
 
+def warmup_jit():
+    """Compile the Numba kernels ahead of the first frame."""
+    fast_distance(0.0, 0.0, 1.0, 1.0)
+    fast_roi_overlap(0.0, 0.0, 1.0, 0.5, 0.0, 1.0)
+    fast_bbox_check(0.5, 0.5, 0.0, 1.0, 0.0, 1.0)
+
 class OptimizedGestureValidator:
     """
     Optimized gesture validation with early exit patterns and vectorized operations.
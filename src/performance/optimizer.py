@@ -2,6 +2,9 @@ import time
 import threading
 from collections import deque
 import numpy as np
+from ..core.clock import get_clock
+from ..utils.streaming_stats import RollingMean
+from .thread_budget import pin_current_thread, BACKGROUND
 
 class PerformanceOptimizer:
     """
@@ -9,9 +12,10 @@ class PerformanceOptimizer:
     Implements adaptive frame processing, gesture caching, and load balancing.
     """
     
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else get_clock()
         self.target_fps = 30  # Reduced from 60 to 30 for stability
-        self.frame_time_buffer = deque(maxlen=10)
+        self.frame_time_mean = RollingMean(10)
         self.gesture_cache = {}
         self.cache_timeout = 0.1  # 100ms cache validity
         self.adaptive_quality = True
@@ -30,7 +34,7 @@ class PerformanceOptimizer:
         
     def should_process_frame(self):
         """Determine if current frame should be processed based on performance."""
-        current_time = time.time()
+        current_time = self.clock.now()
         
         # Skip frames if processing is too slow
         if current_time - self.last_process_time < (1.0 / self.target_fps):
@@ -40,9 +44,7 @@ class PerformanceOptimizer:
     
     def update_performance_metrics(self, frame_time, cpu_usage, memory_usage):
         """Update performance metrics and adjust processing parameters."""
-        self.frame_time_buffer.append(frame_time)
-        
-        avg_frame_time = np.mean(self.frame_time_buffer)
+        avg_frame_time = self.frame_time_mean.update(frame_time)
         
         # Adaptive quality adjustment
         if cpu_usage > self.cpu_threshold_high or memory_usage > self.memory_threshold:
@@ -56,16 +58,16 @@ class PerformanceOptimizer:
         """Get cached gesture result if still valid."""
         if landmarks_hash in self.gesture_cache:
             cached_result, timestamp = self.gesture_cache[landmarks_hash]
-            if time.time() - timestamp < self.cache_timeout:
+            if self.clock.now() - timestamp < self.cache_timeout:
                 return cached_result
         return None
     
     def cache_gesture(self, landmarks_hash, result):
         """Cache gesture result."""
-        self.gesture_cache[landmarks_hash] = (result, time.time())
+        current_time = self.clock.now()
+        self.gesture_cache[landmarks_hash] = (result, current_time)
         
         # Clean old cache entries
-        current_time = time.time()
         expired_keys = [k for k, (_, t) in self.gesture_cache.items() 
                        if current_time - t > self.cache_timeout]
         for key in expired_keys:
@@ -74,6 +76,8 @@ class PerformanceOptimizer:
     def create_landmarks_hash(self, landmarks):
         """Create a hash for landmarks to use as cache key."""
         # Use rounded coordinates to allow for small variations
+        if isinstance(landmarks, np.ndarray):
+            return hash(np.round(landmarks[:, :2], 3).tobytes())
         coords = []
         for lm in landmarks.landmark:
             coords.extend([round(lm.x, 3), round(lm.y, 3)])
@@ -83,7 +87,7 @@ class PerformanceOptimizer:
         """Start asynchronous gesture processing thread."""
         if self.processing_thread is None or not self.processing_thread.is_alive():
             self.stop_processing = False
-            self.processing_thread = threading.Thread(target=self._async_processor)
+            self.processing_thread = threading.Thread(target=self._async_processor, name="GestureAsyncProcessor")
             self.processing_thread.daemon = True
             self.processing_thread.start()
     
@@ -95,6 +99,7 @@ class PerformanceOptimizer:
     
     def _async_processor(self):
         """Background thread for processing gestures."""
+        pin_current_thread(BACKGROUND)
         while not self.stop_processing:
             if self.gesture_queue:
                 try:
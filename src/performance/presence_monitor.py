@@ -0,0 +1,121 @@
+"""
+Hand presence state machine for AzimuthControl.
+
+After a run of frames without a detected hand the pipeline drops into IDLE:
+inference runs only every few frames and on a downscaled image. Any motion
+reported by the motion gate, or a detection on one of the sparse idle
+inferences, wakes it back to ACTIVE immediately.
+"""
+
+import logging
+from typing import Dict, Any
+
+from ..core.clock import get_clock
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = "ACTIVE"
+IDLE = "IDLE"
+
+
+class PresenceMonitor:
+    """Tracks whether a hand is present and throttles inference while it isn't."""
+
+    def __init__(self, idle_after_frames: int = 30, idle_inference_interval: int = 6,
+                 idle_processing_scale: float = 0.5, clock=None):
+        self.idle_after_frames = idle_after_frames              # Empty inferences before going idle
+        self.idle_inference_interval = idle_inference_interval  # Infer every Nth frame while idle
+        self.idle_processing_scale = idle_processing_scale      # Inference resolution scale while idle
+        self.clock = clock if clock is not None else get_clock()
+
+        self.state = ACTIVE
+        self.empty_frames = 0
+        self.frames_since_inference = 0
+        self.state_since = self.clock.now()
+
+        # Statistics
+        self.idle_time = 0.0
+        self.active_time = 0.0
+        self.idle_entries = 0
+        self.wakeups_by_motion = 0
+        self.wakeups_by_detection = 0
+        self.idle_frames_skipped = 0
+
+    @property
+    def is_idle(self) -> bool:
+        return self.state == IDLE
+
+    @property
+    def processing_scale(self) -> float:
+        """Scale to apply to the inference frame in the current state."""
+        return self.idle_processing_scale if self.state == IDLE else 1.0
+
+    def _set_state(self, new_state: str):
+        if new_state == self.state:
+            return
+        now = self.clock.now()
+        if self.state == IDLE:
+            self.idle_time += now - self.state_since
+        else:
+            self.active_time += now - self.state_since
+        self.state = new_state
+        self.state_since = now
+        self.frames_since_inference = 0
+        if new_state == IDLE:
+            self.idle_entries += 1
+            logger.info("💤 No hand for %d frames - idle mode (inference every %d frames at %.2fx)",
+                        self.empty_frames, self.idle_inference_interval, self.idle_processing_scale)
+        else:
+            logger.info("👋 Hand activity - leaving idle mode")
+
+    def should_infer(self, requested: bool, motion_detected: bool = False) -> bool:
+        """
+        Filter the inference decision for this frame.
+        requested: what the pipeline would do without presence throttling.
+        motion_detected: motion gate saw movement on this frame.
+        """
+        if self.state == ACTIVE:
+            return requested
+
+        if motion_detected:
+            self.wakeups_by_motion += 1
+            self.empty_frames = 0
+            self._set_state(ACTIVE)
+            return True
+
+        self.frames_since_inference += 1
+        if self.frames_since_inference >= self.idle_inference_interval:
+            self.frames_since_inference = 0
+            return True
+
+        self.idle_frames_skipped += 1
+        return False
+
+    def update(self, hand_detected: bool, inference_ran: bool):
+        """Feed the outcome of the frame into the state machine."""
+        if hand_detected:
+            if self.state == IDLE:
+                self.wakeups_by_detection += 1
+            self.empty_frames = 0
+            self._set_state(ACTIVE)
+        elif inference_ran:
+            self.empty_frames += 1
+            if self.state == ACTIVE and self.empty_frames >= self.idle_after_frames:
+                self._set_state(IDLE)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Idle/active time split and wake-up counters."""
+        now = self.clock.now()
+        idle_time = self.idle_time + (now - self.state_since if self.state == IDLE else 0.0)
+        active_time = self.active_time + (now - self.state_since if self.state == ACTIVE else 0.0)
+        total = idle_time + active_time
+        return {
+            'state': self.state,
+            'idle_time_s': idle_time,
+            'active_time_s': active_time,
+            'idle_ratio': idle_time / total if total > 0 else 0.0,
+            'idle_entries': self.idle_entries,
+            'wakeups_by_motion': self.wakeups_by_motion,
+            'wakeups_by_detection': self.wakeups_by_detection,
+            'idle_frames_skipped': self.idle_frames_skipped
+        }
@@ -0,0 +1,201 @@
+"""
+Closed-loop processing-resolution governor for AzimuthControl.
+
+Selects the processing resolution from the processing_scales ladder using
+measured inference latency against the per-frame budget derived from the
+target FPS. The controller is AIMD-style: it steps up one rung at a time
+after a sustained run of frames with headroom, and on sustained overload it
+cuts the ladder index in half. Hysteresis (consecutive-frame requirements plus
+a cooldown after every change) prevents oscillation. A startup ramp climbs
+from the lowest rung while measuring latency, replacing fixed startup timers.
+The ladder is capped at the capture resolution once it is known (processing
+never upscales). can_increase lets another controller on the same latency
+signal (AdaptiveHandsModel) restore its headroom before the governor climbs.
+Every decision is recorded in a bounded trace.
+"""
+
+from collections import deque
+from typing import List, Tuple, Optional, Dict, Any
+
+from ..core.clock import get_clock
+
+# Default ladder (lowest to highest) shared by all frame processors
+DEFAULT_PROCESSING_SCALES = [
+    (320, 240),   # Startup/High load
+    (640, 480),   # Medium performance
+    (960, 720),   # Good performance
+    (1280, 720),  # Full resolution
+]
+
+
+def load_processing_scales(performance_config: Dict[str, Any],
+                           max_width: Optional[int] = None,
+                           max_height: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Read the processing_scales ladder from config, capped at a maximum resolution."""
+    scales = [tuple(s) for s in performance_config.get('processing_scales', DEFAULT_PROCESSING_SCALES)]
+    scales.sort(key=lambda s: s[0] * s[1])
+    if max_width and max_height:
+        capped = [s for s in scales if s[0] <= max_width and s[1] <= max_height]
+        scales = capped or scales[:1]
+    return scales
+
+
+class ResolutionGovernor:
+    """AIMD resolution controller over a ladder of processing resolutions."""
+
+    def __init__(self, processing_scales: Optional[List[Tuple[int, int]]] = None,
+                 target_fps: float = 30.0, latency_budget_ms: Optional[float] = None,
+                 ramp_frames: int = 10, increase_frames: int = 30, decrease_frames: int = 5,
+                 increase_margin: float = 0.7, cooldown_frames: int = 30,
+                 trace_size: int = 200, can_increase=None, clock=None):
+        self.ladder = sorted(processing_scales or DEFAULT_PROCESSING_SCALES, key=lambda s: s[0] * s[1])
+        self.processing_scales = list(self.ladder)  # The ladder capped at the capture resolution
+        self.resolution_cap = None
+        self.target_fps = target_fps
+        self.latency_budget_ms = latency_budget_ms or 1000.0 / target_fps
+        self.ramp_frames = ramp_frames            # Frames per rung during the startup ramp
+        self.increase_frames = increase_frames    # Consecutive headroom frames before stepping up
+        self.decrease_frames = decrease_frames    # Consecutive overloaded frames before cutting
+        self.increase_margin = increase_margin    # Headroom means latency < budget * margin
+        self.cooldown_frames = cooldown_frames    # Frames to hold after any change
+        self.can_increase = can_increase          # () -> bool, e.g. "the full model is back"
+        self.clock = clock if clock is not None else get_clock()
+
+        self.index = 0
+        self.startup_complete = False
+        self.frame_count = 0
+        self.latency_ewma = None
+        self.headroom_streak = 0
+        self.overload_streak = 0
+        self.frames_since_change = 0
+        self.decisions = 0
+        self.trace = deque(maxlen=trace_size)
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        return self.processing_scales[self.index]
+
+    @property
+    def at_floor(self) -> bool:
+        """On the bottom rung: no lower resolution left to shed load with."""
+        return self.index == 0
+
+    @property
+    def max_resolution(self) -> Tuple[int, int]:
+        return self.processing_scales[-1]
+
+    @property
+    def scale_factor(self) -> float:
+        """Current width relative to the top of the ladder."""
+        return self.resolution[0] / self.max_resolution[0]
+
+    @property
+    def startup_progress(self) -> float:
+        if self.startup_complete:
+            return 1.0
+        return (self.index + 1) / len(self.processing_scales)
+
+    def _record(self, new_resolution: Tuple[int, int], reason: str):
+        self.decisions += 1
+        self.trace.append({
+            'seq': self.decisions,
+            'time': self.clock.now(),
+            'frame': self.frame_count,
+            'from': self.resolution,
+            'to': new_resolution,
+            'reason': reason,
+            'latency_ms': self.latency_ewma
+        })
+
+    def _set_index(self, new_index: int, reason: str):
+        new_index = max(0, min(len(self.processing_scales) - 1, new_index))
+        if new_index != self.index:
+            self._record(self.processing_scales[new_index], reason)
+            self.index = new_index
+            # Latency at the new rung is unknown; re-seed from the next sample
+            self.latency_ewma = None
+        self.headroom_streak = 0
+        self.overload_streak = 0
+        self.frames_since_change = 0
+
+    def cap_resolution(self, max_width: int, max_height: int):
+        """Limit the ladder to rungs that fit in max_width x max_height (the capture resolution)."""
+        if self.resolution_cap == (max_width, max_height):
+            return
+        self.resolution_cap = (max_width, max_height)
+        current = self.resolution
+        scales = [s for s in self.ladder if s[0] <= max_width and s[1] <= max_height] or self.ladder[:1]
+        new_index = max(i for i, s in enumerate(scales) if s[0] * s[1] <= current[0] * current[1] or i == 0)
+        if scales[new_index] != current:
+            self._record(scales[new_index], f"capped at capture {max_width}x{max_height}")
+            self.latency_ewma = None
+        self.processing_scales = scales
+        self.index = new_index
+
+    def _complete_startup(self, reason: str):
+        self.startup_complete = True
+        self.frames_since_change = 0
+        self._record(self.resolution, reason)
+
+    def update(self, latency_ms: float) -> Tuple[int, int]:
+        """Feed one inference latency sample; returns the resolution to use next."""
+        self.frame_count += 1
+        self.frames_since_change += 1
+        if self.latency_ewma is None:
+            self.latency_ewma = latency_ms
+        else:
+            self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency_ms
+
+        budget = self.latency_budget_ms
+        top = len(self.processing_scales) - 1
+
+        if self.latency_ewma > budget:
+            self.overload_streak += 1
+            self.headroom_streak = 0
+        elif self.latency_ewma < budget * self.increase_margin:
+            self.headroom_streak += 1
+            self.overload_streak = 0
+        else:
+            self.headroom_streak = 0
+            self.overload_streak = 0
+
+        if not self.startup_complete:
+            # Startup ramp: climb one rung per ramp_frames while there is headroom
+            if self.overload_streak >= self.decrease_frames:
+                self._set_index(self.index - 1, "startup ramp overshoot")
+                self._complete_startup("startup complete (latency limit)")
+            elif self.frames_since_change >= self.ramp_frames:
+                if self.index >= top:
+                    self._complete_startup("startup complete (top of ladder)")
+                elif self.latency_ewma < budget * self.increase_margin:
+                    self._set_index(self.index + 1, "startup ramp")
+                else:
+                    self._complete_startup("startup complete (no headroom)")
+            return self.resolution
+
+        if self.can_increase is not None and not self.can_increase():
+            self.headroom_streak = 0  # Headroom is restored elsewhere first (e.g. the full model)
+
+        if self.overload_streak >= self.decrease_frames and self.index > 0:
+            # Multiplicative decrease on the ladder index
+            self._set_index(self.index // 2, "overload")
+        elif (self.headroom_streak >= self.increase_frames and self.index < top
+              and self.frames_since_change >= self.cooldown_frames):
+            # Additive increase, one rung at a time
+            self._set_index(self.index + 1, "headroom")
+
+        return self.resolution
+
+    def get_trace(self) -> List[Dict[str, Any]]:
+        return list(self.trace)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'resolution': self.resolution,
+            'scale_index': self.index,
+            'resolution_cap': self.resolution_cap,
+            'latency_ms': self.latency_ewma,
+            'latency_budget_ms': self.latency_budget_ms,
+            'startup_complete': self.startup_complete,
+            'decisions': self.decisions
+        }
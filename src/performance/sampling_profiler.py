@@ -0,0 +1,173 @@
+"""
+In-process sampling profiler for AzimuthControl.
+
+A background thread wakes up at a fixed rate and records the Python stack of
+every other thread via sys._current_frames(). Nothing is installed on the
+profiled threads (no sys.setprofile/settrace hooks), so the 30 FPS loop runs
+at its normal speed and the cost is confined to the sampler's own time slice.
+
+Samples are aggregated as folded stacks ("thread;file.py:func;file.py:func N"),
+the input format of flamegraph.pl, inferno and speedscope, and summarized as a
+top-N table of the hottest functions by self and total samples.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_OUTPUT_DIR = Path(__file__).parent.parent.parent / "profiles"
+
+
+def _frame_label(code) -> str:
+    return f"{Path(code.co_filename).name}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Thread-based stack sampler producing folded stacks and a hot-function report."""
+
+    def __init__(self, hz: float = 100.0, output_dir: Optional[str] = None,
+                 thread_names: Optional[List[str]] = None, max_depth: int = 64):
+        self.interval = 1.0 / max(1.0, hz)
+        self.output_dir = Path(output_dir) if output_dir else DEFAULT_OUTPUT_DIR
+        self.thread_names = set(thread_names) if thread_names else None  # None = all threads
+        self.max_depth = max_depth
+
+        self.folded: Counter = Counter()
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+        self.samples = 0
+        self.sample_time = 0.0  # Time the sampler itself spent collecting stacks
+        self.started_at = None
+        self.profiled_time = 0.0
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.profiled_time += time.perf_counter() - self.started_at
+
+    def toggle(self) -> bool:
+        """Start or stop sampling; returns whether the profiler is now running."""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+        return self.running
+
+    def reset(self):
+        self.folded.clear()
+        self.self_counts.clear()
+        self.total_counts.clear()
+        self.samples = 0
+        self.sample_time = 0.0
+        self.profiled_time = 0.0
+
+    def _run(self):
+        own_id = threading.get_ident()
+        next_sample = time.perf_counter()
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            self._sample(own_id)
+            self.sample_time += time.perf_counter() - start
+            next_sample += self.interval
+            # Skip missed ticks rather than bursting to catch up
+            delay = next_sample - time.perf_counter()
+            if delay < 0:
+                next_sample = time.perf_counter()
+                delay = 0
+            self._stop.wait(delay)
+
+    def _sample(self, own_id: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            thread_name = names.get(thread_id, f"thread-{thread_id}")
+            if self.thread_names is not None and thread_name not in self.thread_names:
+                continue
+
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if not stack:
+                continue
+            stack.reverse()  # Root first, as folded stacks expect
+
+            self.folded[";".join([thread_name] + stack)] += 1
+            self.self_counts[stack[-1]] += 1
+            for label in set(stack):  # Recursion counts once per sample
+                self.total_counts[label] += 1
+        self.samples += 1
+
+    # --- Output ---
+
+    def top_functions(self, n: int = 20) -> List[Tuple[str, int, int]]:
+        """(function, self samples, total samples), hottest self time first."""
+        return [(label, count, self.total_counts[label]) for label, count in self.self_counts.most_common(n)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        elapsed = self.profiled_time + (time.perf_counter() - self.started_at if self.running else 0.0)
+        return {
+            'running': self.running,
+            'samples': self.samples,
+            'stacks': len(self.folded),
+            'effective_hz': self.samples / elapsed if elapsed > 0 else 0.0,
+            'overhead_pct': self.sample_time / elapsed * 100 if elapsed > 0 else 0.0,
+            'profiled_s': elapsed
+        }
+
+    def write_folded(self, path: Optional[str] = None) -> Optional[Path]:
+        """Write folded stacks (flamegraph.pl / speedscope input). Returns the path written."""
+        if not self.folded:
+            return None
+        path = Path(path) if path else self.output_dir / time.strftime("profile_%Y%m%d_%H%M%S.folded")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                for stack, count in sorted(self.folded.items()):
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            print(f"⚠️  Could not write profile: {e}")
+            return None
+        return path
+
+    def print_report(self, n: int = 15):
+        stats = self.get_stats()
+        print(f"\n🔥 Sampling profile: {stats['samples']} samples over {stats['profiled_s']:.1f}s "
+              f"({stats['effective_hz']:.0f} Hz, sampler overhead {stats['overhead_pct']:.2f}%)")
+        if not self.self_counts:
+            print("   (no samples)")
+            return
+        thread_samples = sum(self.self_counts.values())
+        print(f"{'self %':>7} {'total %':>8}  function")
+        for label, self_count, total_count in self.top_functions(n):
+            print(f"{self_count / thread_samples * 100:6.1f}% {total_count / thread_samples * 100:7.1f}%  {label}")
+
+    def save(self, n: int = 15) -> Optional[Path]:
+        """Print the report and write folded stacks."""
+        self.print_report(n)
+        path = self.write_folded()
+        if path:
+            print(f"🔥 Folded stacks written to {path} (render with flamegraph.pl or speedscope)")
+        return path
@@ -111,6 +111,9 @@ def show_configuration_recommendations():
     print('   "target_fps": 15,')
     print('   "window_width": 640, "window_height": 480,')
     print('   "max_processing_time_ms": 50')
+    print()
+    print("🔧 For settings measured on this machine, run the autotuner:")
+    print("   python -m src.performance.startup_monitor --autotune --clip <recording.mp4>")
 
 
 if __name__ == "__main__":
@@ -120,10 +123,15 @@ if __name__ == "__main__":
     parser.add_argument('--duration', type=int, default=30, help='Monitoring duration in seconds')
     parser.add_argument('--compare', action='store_true', help='Show startup mode comparison')
     parser.add_argument('--config', action='store_true', help='Show configuration recommendations')
+    parser.add_argument('--autotune', action='store_true', help='Benchmark this machine and write a performance profile')
+    parser.add_argument('--clip', help='Recorded clip for --autotune (defaults to the camera)')
     
     args = parser.parse_args()
     
-    if args.compare:
+    if args.autotune:
+        from src.performance.autotuner import run_autotune
+        run_autotune(clip_path=args.clip)
+    elif args.compare:
         compare_startup_modes()
     elif args.config:
         show_configuration_recommendations()
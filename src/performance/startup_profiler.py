@@ -0,0 +1,112 @@
+"""
+Startup profiler and parallel initializer for AzimuthControl.
+
+Times every import and init step of the startup path, runs independent init
+steps (model load, JIT warm-up, C++ loader) on background threads while the
+main thread opens the camera, and records milestones such as the first frame
+and the first recognized gesture. Run hand_control.py --profile-startup to
+print the report.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, List, Optional
+
+
+class StartupProfiler:
+    """Records per-step startup timings and runs init steps in parallel."""
+
+    def __init__(self, enabled: bool = False, max_workers: int = 4):
+        self.enabled = enabled  # Print the report; timings are always recorded
+        self.start = time.perf_counter()
+        self.max_workers = max_workers
+
+        self.steps: List[Dict[str, Any]] = []
+        self.milestones: Dict[str, float] = {}
+        self._tasks: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.reported = False
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def record(self, name: str, begin: float, kind: str = "init"):
+        """Record a step that started at begin (time.perf_counter()) and ends now."""
+        end = time.perf_counter()
+        with self._lock:
+            self.steps.append({
+                'name': name,
+                'kind': kind,
+                'thread': threading.current_thread().name,
+                'start_ms': (begin - self.start) * 1000,
+                'duration_ms': (end - begin) * 1000
+            })
+
+    @contextmanager
+    def step(self, name: str, kind: str = "init"):
+        """Time a block of the startup path."""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, begin, kind)
+
+    def run_in_background(self, name: str, func: Callable, *args, **kwargs) -> Future:
+        """Start an init step on a background thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="startup")
+
+        def task():
+            with self.step(name, kind="background"):
+                return func(*args, **kwargs)
+
+        future = self._executor.submit(task)
+        self._tasks[name] = future
+        return future
+
+    def result(self, name: str, timeout: Optional[float] = None):
+        """Wait for a background step; the time spent blocked is recorded too."""
+        future = self._tasks[name]
+        if future.done():
+            return future.result()
+        with self.step(f"wait for {name}", kind="wait"):
+            return future.result(timeout)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def mark(self, milestone: str):
+        """Record the first time a milestone is reached."""
+        if milestone not in self.milestones:
+            self.milestones[milestone] = self.elapsed_ms()
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            steps = sorted(self.steps, key=lambda s: s['start_ms'])
+        background = [s for s in steps if s['kind'] == "background"]
+        waits = [s for s in steps if s['kind'] == "wait"]
+        return {
+            'steps': steps,
+            'milestones': dict(self.milestones),
+            'background_ms': sum(s['duration_ms'] for s in background),
+            # Background work the main thread did not have to wait for
+            'overlapped_ms': max(0.0, sum(s['duration_ms'] for s in background)
+                                 - sum(s['duration_ms'] for s in waits))
+        }
+
+    def print_report(self):
+        report = self.get_report()
+        self.reported = True
+        print("\n=== Startup Profile ===")
+        print(f"{'start':>9} {'duration':>9}  {'kind':<10} {'thread':<12} step")
+        for s in report['steps']:
+            print(f"{s['start_ms']:8.0f}ms {s['duration_ms']:8.1f}ms  {s['kind']:<10} {s['thread'][:12]:<12} {s['name']}")
+        print(f"⏱️  Background init: {report['background_ms']:.0f}ms, "
+              f"{report['overlapped_ms']:.0f}ms overlapped with the main thread")
+        for milestone, at in sorted(report['milestones'].items(), key=lambda m: m[1]):
+            print(f"🏁 {milestone}: {at:.0f}ms")
@@ -0,0 +1,196 @@
+"""
+Central thread budget for AzimuthControl.
+
+OpenCV, Numba and the background monitor threads in src/performance each size
+their own thread pools, and the MediaPipe TFLite/XNNPACK delegate spins up its
+own workers on top. This module splits one core budget between those stages,
+applies the thread counts (cv2.setNumThreads, OMP_NUM_THREADS and
+NUMBA_NUM_THREADS up front; numba.set_num_threads from the background JIT
+warm-up, so Numba is never imported on the startup path), sizes the
+out-of-process inference workers, optionally pins each stage to its own
+cores with os.sched_setaffinity on Linux, and reports the resulting layout.
+
+MediaPipe's legacy Hands API does not expose a thread count, so inference is
+bounded by the core set of the thread that calls Hands.process (the main
+"pipeline" stage) - worker threads inherit that affinity when they are created.
+"""
+
+import os
+import threading
+from typing import Dict, Any, List, Optional
+
+PIPELINE = "pipeline"      # Main loop: capture, MediaPipe inference, OpenCV preprocessing
+BACKGROUND = "background"  # Monitor/worker threads in src/performance
+
+AFFINITY_SUPPORTED = hasattr(os, "sched_setaffinity") and hasattr(os, "sched_getaffinity")
+
+
+def available_cores() -> List[int]:
+    """Cores this process may run on."""
+    if AFFINITY_SUPPORTED:
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class ThreadBudget:
+    """Splits a core budget between OpenCV, Numba, inference and worker threads."""
+
+    def __init__(self, total_threads: Optional[int] = None, opencv_threads: Optional[int] = None,
+                 numba_threads: Optional[int] = None, worker_threads: Optional[int] = None,
+                 inference_workers: Optional[int] = None, pin_threads: bool = False):
+        self.cores = available_cores()
+        self.total_threads = max(1, min(total_threads or len(self.cores), len(self.cores)))
+        self.pin_threads = pin_threads and AFFINITY_SUPPORTED
+
+        # Background monitors get one core once there are enough to spare
+        default_workers = 1 if self.total_threads >= 4 else 0
+        self.worker_threads = default_workers if worker_threads is None else max(0, worker_threads)
+        pipeline_threads = max(1, self.total_threads - self.worker_threads)
+
+        # OpenCV and Numba share the pipeline cores with MediaPipe, never more than that
+        self.opencv_threads = min(opencv_threads or max(1, pipeline_threads // 2), pipeline_threads)
+        self.numba_threads = min(numba_threads or max(1, pipeline_threads // 2), pipeline_threads)
+        # Inference worker processes (InferencePool) run MediaPipe in place of the pipeline stage
+        self.inference_workers = max(1, inference_workers or pipeline_threads)
+
+        budget_cores = self.cores[:self.total_threads]
+        self.stage_cores: Dict[str, List[int]] = {
+            PIPELINE: budget_cores[:pipeline_threads],
+            # Without a spare core, background threads share the pipeline cores
+            BACKGROUND: budget_cores[pipeline_threads:] or budget_cores[:pipeline_threads]
+        }
+
+        self.applied = False
+        self.numba_applied = None
+        self._threads: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def apply_environment(self):
+        """
+        Thread-count environment variables for native libraries.
+        Only effective for libraries that have not been imported yet.
+        """
+        os.environ.setdefault("OMP_NUM_THREADS", str(self.opencv_threads))
+        os.environ.setdefault("NUMBA_NUM_THREADS", str(self.numba_threads))
+
+    def apply(self):
+        """
+        Apply thread counts to OpenCV (Numba through its environment variable)
+        and pin the calling (main) thread. Does not import Numba.
+        """
+        self.apply_environment()
+
+        try:
+            import cv2
+            cv2.setNumThreads(self.opencv_threads)
+        except ImportError:
+            pass
+
+        self.pin_current_thread(PIPELINE)
+        self.applied = True
+
+    def apply_numba(self):
+        """Apply the Numba thread count; call from the JIT warm-up, which imports Numba anyway."""
+        try:
+            import numba
+            # numba cannot exceed the pool size it was launched with
+            self.numba_applied = min(self.numba_threads, numba.config.NUMBA_NUM_THREADS)
+            numba.set_num_threads(self.numba_applied)
+        except (ImportError, AttributeError, ValueError):
+            self.numba_applied = None
+
+    def worker_cores(self, index: int = 0, count: int = 1) -> Optional[List[int]]:
+        """
+        Cores for inference worker process `index` of `count` (None when not
+        pinning): the pipeline cores, split between the workers.
+        """
+        if not self.pin_threads:
+            return None
+        cores = self.stage_cores[PIPELINE]
+        if count >= len(cores):
+            return [cores[index % len(cores)]]
+        return cores[index::count]
+
+    def pin_current_thread(self, stage: str) -> bool:
+        """Register the calling thread with a stage and pin it to that stage's cores."""
+        cores = self.stage_cores.get(stage, self.stage_cores[PIPELINE])
+        thread = threading.current_thread()
+        pinned = False
+        if self.pin_threads:
+            try:
+                # pid 0 is the calling thread on Linux; threads it creates inherit the mask
+                os.sched_setaffinity(0, cores)
+                pinned = True
+            except OSError as e:
+                print(f"⚠️ Could not pin {thread.name} to cores {cores}: {e}")
+
+        with self._lock:
+            self._threads[thread.name] = {'stage': stage, 'cores': cores if pinned else None}
+        return pinned
+
+    def get_layout(self) -> Dict[str, Any]:
+        """Resulting thread layout."""
+        with self._lock:
+            threads = dict(self._threads)
+        return {
+            'available_cores': len(self.cores),
+            'total_threads': self.total_threads,
+            'opencv_threads': self.opencv_threads,
+            'numba_threads': self.numba_applied if self.numba_applied is not None else self.numba_threads,
+            'worker_threads': self.worker_threads,
+            'inference_workers': self.inference_workers,
+            'pinning': self.pin_threads,
+            'stage_cores': {stage: list(cores) for stage, cores in self.stage_cores.items()},
+            'threads': threads
+        }
+
+    def print_layout(self):
+        layout = self.get_layout()
+        print(f"🧵 Thread budget: {layout['total_threads']}/{layout['available_cores']} cores - "
+              f"OpenCV {layout['opencv_threads']}, Numba {layout['numba_threads']}, "
+              f"workers {layout['worker_threads']}, inference processes {layout['inference_workers']}")
+        if layout['pinning']:
+            for stage, cores in layout['stage_cores'].items():
+                print(f"   {stage}: cores {cores}")
+        for name, info in layout['threads'].items():
+            pinned = f"cores {info['cores']}" if info['cores'] is not None else "unpinned"
+            print(f"   {name} [{info['stage']}]: {pinned}")
+
+
+def create_thread_budget(performance_config: Dict[str, Any]) -> ThreadBudget:
+    """Build a ThreadBudget from performance_settings."""
+    return ThreadBudget(
+        total_threads=performance_config.get('thread_budget'),
+        opencv_threads=performance_config.get('opencv_threads'),
+        numba_threads=performance_config.get('numba_threads'),
+        worker_threads=performance_config.get('worker_threads'),
+        inference_workers=performance_config.get('inference_workers'),
+        pin_threads=performance_config.get('pin_threads', False)
+    )
+
+
+# Global thread budget
+_thread_budget = None
+
+
+def get_thread_budget() -> ThreadBudget:
+    """Get the global thread budget, created from performance_settings on first use."""
+    global _thread_budget
+    if _thread_budget is None:
+        from ..core.config_manager import get_performance_config
+        _thread_budget = create_thread_budget(get_performance_config())
+    return _thread_budget
+
+
+def pin_current_thread(stage: str = BACKGROUND) -> bool:
+    """Pin the calling thread to a stage of the global budget."""
+    return get_thread_budget().pin_current_thread(stage)
+
+
+def pin_worker_process(cores: Optional[List[int]]):
+    """In an inference worker process: pin to the cores the parent's budget gave it."""
+    if cores and AFFINITY_SUPPORTED:
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError as e:
+            print(f"⚠️ Could not pin inference worker to cores {cores}: {e}")
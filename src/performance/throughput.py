@@ -0,0 +1,65 @@
+"""
+Processing throughput meter for AzimuthControl.
+
+Counts frames and inferences and the time the loop spends busy, giving
+end-to-end processing throughput independent of display. Used for the
+headless run mode's periodic and final reports.
+"""
+
+import time
+from typing import Dict, Any
+
+
+class ThroughputMeter:
+    """Frames/inferences per second and per-frame processing cost."""
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.frames = 0
+        self.inferences = 0
+        self.busy_time = 0.0
+        self._window_start = self.start_time
+        self._window_frames = 0
+        self._window_inferences = 0
+        self._window_busy = 0.0
+
+    def record(self, frame_seconds: float, inference_ran: bool):
+        """Record one processed frame and the time spent on it."""
+        self.frames += 1
+        self._window_frames += 1
+        self.busy_time += frame_seconds
+        self._window_busy += frame_seconds
+        if inference_ran:
+            self.inferences += 1
+            self._window_inferences += 1
+
+    @staticmethod
+    def _summary(frames, inferences, busy, elapsed) -> Dict[str, Any]:
+        return {
+            'frames': frames,
+            'fps': frames / elapsed if elapsed > 0 else 0.0,
+            'inferences_per_s': inferences / elapsed if elapsed > 0 else 0.0,
+            'avg_frame_ms': busy / frames * 1000 if frames else 0.0,
+            # Frames per second the loop could sustain if capture were instantaneous
+            'capacity_fps': frames / busy if busy > 0 else 0.0,
+            'elapsed_s': elapsed
+        }
+
+    def window(self) -> Dict[str, Any]:
+        """Stats since the last call, then start a new window."""
+        now = time.perf_counter()
+        stats = self._summary(self._window_frames, self._window_inferences, self._window_busy,
+                              now - self._window_start)
+        self._window_start = now
+        self._window_frames = self._window_inferences = 0
+        self._window_busy = 0.0
+        return stats
+
+    def total(self) -> Dict[str, Any]:
+        return self._summary(self.frames, self.inferences, self.busy_time,
+                             time.perf_counter() - self.start_time)
+
+    @staticmethod
+    def format(stats: Dict[str, Any]) -> str:
+        return (f"{stats['fps']:.1f} FPS, {stats['inferences_per_s']:.1f} inferences/s, "
+                f"{stats['avg_frame_ms']:.1f}ms/frame (capacity {stats['capacity_fps']:.0f} FPS)")
@@ -1,7 +1,5 @@
-import mediapipe as mp
 import numpy as np
 import math
-from mediapipe.framework.formats import landmark_pb2
 
 # Landmark indices from MediaPipe Hands
 class HandLandmark:
@@ -38,13 +36,17 @@ def smooth_landmarks(landmark_history, current_landmarks, smoothing_factor):
         landmark_history.append(current_landmarks)
 
     smoothed_landmarks_np = np.mean(landmark_history, axis=0)
-
-    smoothed_landmark_proto = landmark_pb2.NormalizedLandmarkList()
-    for lm in smoothed_landmarks_np:
-        landmark = smoothed_landmark_proto.landmark.add()
+    return landmarks_to_proto(smoothed_landmarks_np), landmark_history
+
+def landmarks_to_proto(landmarks_array):
+    """Builds a MediaPipe NormalizedLandmarkList from a (21, 3) array."""
+    # Deferred so importing geometry helpers does not load MediaPipe
+    from mediapipe.framework.formats import landmark_pb2
+    landmark_proto = landmark_pb2.NormalizedLandmarkList()
+    for lm in landmarks_array:
+        landmark = landmark_proto.landmark.add()
         landmark.x, landmark.y, landmark.z = lm
-
-    return smoothed_landmark_proto, landmark_history
+    return landmark_proto
 
 def is_right_hand(handedness):
     """Checks if the detected hand is the right hand."""
@@ -59,23 +61,23 @@ def get_landmark_coords(landmarks, landmark_index):
     lm = landmarks.landmark[landmark_index]
     return lm.x, lm.y
 
+PALM_LANDMARKS = [
+    HandLandmark.WRIST,
+    HandLandmark.INDEX_FINGER_MCP,
+    HandLandmark.MIDDLE_FINGER_MCP,
+    HandLandmark.RING_FINGER_MCP,
+    HandLandmark.PINKY_MCP
+]
+
 def calculate_palm_bbox_norm(landmarks):
     """
     Calculates the normalized bounding box around the palm using specified landmarks.
     Returns a dictionary with min_x, max_x, min_y, max_y, width, height, and center.
     """
-    palm_indices = [
-        HandLandmark.WRIST,
-        HandLandmark.INDEX_FINGER_MCP,
-        HandLandmark.MIDDLE_FINGER_MCP,
-        HandLandmark.RING_FINGER_MCP,
-        HandLandmark.PINKY_MCP
-    ]
-
     min_x, min_y = 1.0, 1.0
     max_x, max_y = 0.0, 0.0
 
-    for index in palm_indices:
+    for index in PALM_LANDMARKS:
         lm = landmarks.landmark[index]
         min_x = min(min_x, lm.x)
         max_x = max(max_x, lm.x)
@@ -93,6 +95,20 @@ def calculate_palm_bbox_norm(landmarks):
         "center_x": center_x, "center_y": center_y
     }
 
+def calculate_palm_bbox_array(landmarks_array):
+    """calculate_palm_bbox_norm for a (21, 2+) numpy array of normalized landmarks."""
+    palm = landmarks_array[PALM_LANDMARKS, :2]
+    min_x, min_y = np.minimum(palm.min(axis=0), 1.0).tolist()
+    max_x, max_y = np.maximum(palm.max(axis=0), 0.0).tolist()
+
+    width = max_x - min_x
+    height = max_y - min_y
+    return {
+        "min_x": min_x, "max_x": max_x, "min_y": min_y, "max_y": max_y,
+        "width": width, "height": height,
+        "center_x": min_x + width / 2, "center_y": min_y + height / 2
+    }
+
 def is_finger_in_palm_bbox(landmarks, finger_tip_index, palm_bbox):
     """Checks if a fingertip is within the palm bounding box."""
     tip_x, tip_y = get_landmark_coords(landmarks, finger_tip_index)
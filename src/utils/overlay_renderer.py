@@ -0,0 +1,224 @@
+"""
+Batched overlay renderer for AzimuthControl.
+
+Replaces the per-primitive drawing passes of visualizer.py for the live view:
+landmarks are converted to pixel coordinates once per frame with NumPy, all
+skeleton and axis lines go out in a single cv2.polylines call per color, and
+the HUD text is rendered into a cached layer that is only redrawn when the
+displayed values change. Overlays can be reduced with detail levels and
+rendered at a lower rate than frames are processed.
+"""
+
+import time
+from typing import Dict, Any, Optional, Tuple, List
+
+import cv2
+import numpy as np
+
+from .geometry_utils import HandLandmark
+
+# Overlay detail levels, least to most
+DETAIL_OFF = "off"            # Nothing drawn on the frame
+DETAIL_MINIMAL = "minimal"    # Skeleton and HUD
+DETAIL_STANDARD = "standard"  # + palm bounding box, fingertip ROIs, wrist anchor
+DETAIL_FULL = "full"          # + joint boxes, 3-axis graph, tilt anchor, enhanced ROIs
+DETAIL_LEVELS = [DETAIL_OFF, DETAIL_MINIMAL, DETAIL_STANDARD, DETAIL_FULL]
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+FINGER_GROUPS = [
+    ("THUMB_COLOR", [HandLandmark.THUMB_CMC, HandLandmark.THUMB_MCP, HandLandmark.THUMB_IP, HandLandmark.THUMB_TIP]),
+    ("INDEX_FINGER_COLOR", [HandLandmark.INDEX_FINGER_MCP, HandLandmark.INDEX_FINGER_PIP, HandLandmark.INDEX_FINGER_DIP, HandLandmark.INDEX_FINGER_TIP]),
+    ("MIDDLE_FINGER_COLOR", [HandLandmark.MIDDLE_FINGER_MCP, HandLandmark.MIDDLE_FINGER_PIP, HandLandmark.MIDDLE_FINGER_DIP, HandLandmark.MIDDLE_FINGER_TIP]),
+    ("RING_FINGER_COLOR", [HandLandmark.RING_FINGER_MCP, HandLandmark.RING_FINGER_PIP, HandLandmark.RING_FINGER_DIP, HandLandmark.RING_FINGER_TIP]),
+    ("PINKY_FINGER_COLOR", [HandLandmark.PINKY_MCP, HandLandmark.PINKY_PIP, HandLandmark.PINKY_DIP, HandLandmark.PINKY_TIP]),
+    ("PALM_COLOR", [HandLandmark.WRIST]),
+]
+JOINT_LANDMARKS = [HandLandmark.INDEX_FINGER_PIP, HandLandmark.MIDDLE_FINGER_PIP,
+                   HandLandmark.RING_FINGER_PIP, HandLandmark.PINKY_PIP]
+FINGERTIP_LANDMARKS = [HandLandmark.THUMB_TIP, HandLandmark.INDEX_FINGER_TIP, HandLandmark.MIDDLE_FINGER_TIP,
+                       HandLandmark.RING_FINGER_TIP, HandLandmark.PINKY_TIP]
+AXIS_LANDMARKS = [HandLandmark.MIDDLE_FINGER_TIP, HandLandmark.INDEX_FINGER_TIP, HandLandmark.THUMB_TIP]
+
+
+class OverlayRenderer:
+    """Draws the hand overlay and HUD with batched primitives and a cached HUD layer."""
+
+    def __init__(self, colors: Dict[str, Tuple[int, int, int]], hand_connections,
+                 detail_level: str = DETAIL_FULL, render_fps: float = 0.0,
+                 hud_update_interval: float = 0.25):
+        self.colors = colors
+        self.connections = np.array(sorted(hand_connections), dtype=np.intp)  # (N, 2) landmark index pairs
+        self.detail_level = detail_level if detail_level in DETAIL_LEVELS else DETAIL_FULL
+        self.render_interval = 1.0 / render_fps if render_fps and render_fps > 0 else 0.0
+        self.hud_update_interval = hud_update_interval  # Volatile readouts (FPS/CPU/...) refresh at most this often
+
+        self.last_render_time = None
+        self._hud_lines: Optional[List[Tuple[str, Tuple[int, int], float, Tuple[int, int, int]]]] = None
+        self._hud_layer = None
+        self._hud_mask = None
+        self._hud_readouts_time = 0.0
+        self._hud_readouts: Dict[str, Any] = {}
+
+        # Statistics
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self.hud_redraws = 0
+
+    @property
+    def level(self) -> int:
+        return DETAIL_LEVELS.index(self.detail_level)
+
+    def cycle_detail_level(self) -> str:
+        """Step to the next detail level (wrapping) and return it."""
+        self.detail_level = DETAIL_LEVELS[(self.level + 1) % len(DETAIL_LEVELS)]
+        return self.detail_level
+
+    def should_render(self, now: Optional[float] = None) -> bool:
+        """Whether this frame should be rendered at the configured render rate."""
+        now = time.perf_counter() if now is None else now
+        if self.last_render_time is None or now - self.last_render_time >= self.render_interval:
+            self.last_render_time = now
+            self.frames_rendered += 1
+            return True
+        self.frames_skipped += 1
+        return False
+
+    def draw_hand(self, image: np.ndarray, landmarks: np.ndarray, palm_bbox: Dict[str, float]):
+        """Draw the hand overlay for a (21, 2+) array of normalized landmarks."""
+        if self.level == 0:
+            return
+        h, w = image.shape[:2]
+        # One conversion for every primitive below
+        pts = (np.asarray(landmarks)[:, :2] * (w, h)).astype(np.int32)
+        colors = self.colors
+
+        cv2.polylines(image, pts[self.connections], False, colors["CONNECTION_COLOR"], 2)
+        for color_name, indices in FINGER_GROUPS:
+            color = colors[color_name]
+            for x, y in pts[indices]:
+                cv2.circle(image, (int(x), int(y)), 5, color, cv2.FILLED)
+
+        if self.level >= DETAIL_LEVELS.index(DETAIL_STANDARD):
+            self._draw_palm_bbox(image, palm_bbox, w, h)
+            for x, y in pts[FINGERTIP_LANDMARKS]:
+                cv2.circle(image, (int(x), int(y)), 10, colors["FINGERTIP_ROI_COLOR"], 1)
+            wrist = pts[HandLandmark.WRIST]
+            cv2.circle(image, (int(wrist[0]), int(wrist[1])), 8, colors["WRIST_ANCHOR_COLOR"], -1)
+
+        if self.level >= DETAIL_LEVELS.index(DETAIL_FULL):
+            self._draw_full_detail(image, pts, palm_bbox, w, h)
+
+    def _draw_palm_bbox(self, image, palm_bbox, w, h):
+        min_x, max_x = int(palm_bbox['min_x'] * w), int(palm_bbox['max_x'] * w)
+        min_y, max_y = int(palm_bbox['min_y'] * h), int(palm_bbox['max_y'] * h)
+        text_color = self.colors["TEXT_COLOR"]
+        cv2.rectangle(image, (min_x, min_y), (max_x, max_y), self.colors["BBOX_COLOR"], 2)
+        mid_x, mid_y = (min_x + max_x) // 2, (min_y + max_y) // 2
+        cv2.putText(image, "TOP", (mid_x - 15, min_y - 10), FONT, 0.5, text_color, 1)
+        cv2.putText(image, "BOTTOM", (mid_x - 25, max_y + 20), FONT, 0.5, text_color, 1)
+        cv2.putText(image, "LEFT", (min_x - 40, mid_y + 5), FONT, 0.5, text_color, 1)
+        cv2.putText(image, "RIGHT", (max_x + 10, mid_y + 5), FONT, 0.5, text_color, 1)
+
+    def _draw_full_detail(self, image, pts, palm_bbox, w, h):
+        colors = self.colors
+        for x, y in pts[JOINT_LANDMARKS]:
+            cv2.circle(image, (int(x), int(y)), 35, colors["JOINT_BBOX_COLOR"], 1)
+        for x, y in pts[FINGERTIP_LANDMARKS[1:]]:
+            cv2.circle(image, (int(x), int(y)), 20, (0, 255, 255), 2)
+
+        # 3-axis ROI: X/Y/Z fingertips joined to the N anchor (index MCP) in one polylines call
+        anchor = pts[HandLandmark.INDEX_FINGER_MCP]
+        axis_pts = pts[AXIS_LANDMARKS]
+        segments = np.stack([axis_pts, np.broadcast_to(anchor, axis_pts.shape)], axis=1)
+        cv2.polylines(image, segments, False, colors["AXIS_GRAPH_COLOR"], 1)
+        for label, (x, y) in zip("XYZ", axis_pts):
+            cv2.circle(image, (int(x), int(y)), 15, colors["AXIS_ROI_COLOR"], 1)
+            cv2.putText(image, label, (int(x) + 10, int(y) - 10), FONT, 0.5, colors["TEXT_COLOR"], 1)
+        anchor_point = (int(anchor[0]), int(anchor[1]))
+        cv2.circle(image, anchor_point, 20, colors["AXIS_GRAPH_COLOR"], 1)
+        cv2.circle(image, anchor_point, 5, colors["AXIS_GRAPH_COLOR"], cv2.FILLED)
+        cv2.putText(image, "N", (anchor_point[0] + 10, anchor_point[1] - 10), FONT, 0.5, colors["TEXT_COLOR"], 1)
+
+        # Tilt anchor: palm center to middle PIP
+        palm_center = (int(palm_bbox['center_x'] * w), int(palm_bbox['center_y'] * h))
+        middle_pip = pts[HandLandmark.MIDDLE_FINGER_PIP]
+        middle_pip = (int(middle_pip[0]), int(middle_pip[1]))
+        cv2.line(image, palm_center, middle_pip, colors["TILT_ANCHOR_COLOR"], 2)
+        cv2.circle(image, palm_center, 5, colors["TILT_ANCHOR_COLOR"], -1)
+        cv2.circle(image, middle_pip, 5, colors["TILT_ANCHOR_COLOR"], -1)
+
+    def draw_hud(self, image: np.ndarray, readouts: Dict[str, Any], is_calibrated: bool,
+                 statuses: Dict[str, str], stream_info: Optional[Dict[str, Any]] = None,
+                 other_hands: Optional[List[Tuple[str, Optional[str]]]] = None):
+        """
+        Composite the HUD text layer onto the image. The layer is re-rendered
+        only when a displayed value changes; volatile readouts (fps, cpu, mem,
+        gpu, gpu_mem) are sampled at most every hud_update_interval.
+        """
+        if self.level == 0:
+            return
+        now = time.perf_counter()
+        if not self._hud_readouts or now - self._hud_readouts_time >= self.hud_update_interval:
+            self._hud_readouts = dict(readouts)
+            self._hud_readouts_time = now
+
+        lines = self._hud_text(self._hud_readouts, is_calibrated, statuses, stream_info, other_hands)
+        if lines != self._hud_lines:
+            self._render_hud_layer(lines)
+
+        h, w = self._hud_layer.shape[:2]
+        h, w = min(h, image.shape[0]), min(w, image.shape[1])
+        roi = image[:h, :w]
+        cv2.copyTo(self._hud_layer[:h, :w], self._hud_mask[:h, :w], roi)
+
+    def _hud_text(self, readouts, is_calibrated, statuses, stream_info, other_hands=None):
+        text_color = self.colors["TEXT_COLOR"]
+        lines = [
+            (f"FPS: {readouts.get('fps', 0):.2f}", (10, 30), 1.0, text_color),
+            (f"CPU: {readouts.get('cpu', 0):.1f}%", (10, 70), 1.0, text_color),
+            (f"MEM: {readouts.get('mem', 0):.1f}%", (10, 110), 1.0, text_color),
+            (f"GPU Util: {readouts.get('gpu', 0):.1f}%", (10, 150), 1.0, text_color),
+            (f"GPU Mem: {readouts.get('gpu_mem', 0):.1f}%", (10, 190), 1.0, text_color),
+        ]
+        status_y = 230
+        if stream_info:
+            startup_status = "Ready" if stream_info['startup_complete'] else "Starting..."
+            lines += [
+                (f"Processing: {stream_info['processing_resolution']}", (10, 230), 0.7, text_color),
+                (f"Scale: {stream_info['processing_scale']}", (10, 255), 0.7, text_color),
+                (f"Display: {stream_info['display_resolution']}", (10, 280), 0.7, text_color),
+                (f"C++ Engine: {startup_status}", (10, 305), 0.7, text_color),
+            ]
+            status_y = 340
+
+        if not is_calibrated:
+            lines.append(("Clench fist in neutral pose and press 'c' to calibrate", (10, status_y), 0.8,
+                          self.colors["STATUS_COLOR_NEUTRAL"]))
+        else:
+            go = self.colors["STATUS_COLOR_GO"]
+            for i, name in enumerate(["movement", "action", "camera", "navigation"]):
+                lines.append((f"{name.upper()}: {statuses.get(name, 'NEUTRAL')}", (10, status_y + 40 * i), 1.0, go))
+            # Active gesture of each additional tracked hand, below the primary hand's statuses
+            for i, (label, gesture) in enumerate(other_hands or ()):
+                lines.append((f"{label.upper()} HAND: {gesture or 'NEUTRAL'}", (10, status_y + 160 + 40 * i), 1.0, go))
+        return lines
+
+    def _render_hud_layer(self, lines):
+        width = max(10 + cv2.getTextSize(text, FONT, scale, 2)[0][0] for text, _, scale, _ in lines) + 10
+        height = max(y for _, (_, y), _, _ in lines) + 15
+        layer = np.zeros((height, width, 3), dtype=np.uint8)
+        mask = np.zeros((height, width), dtype=np.uint8)
+        for text, origin, scale, color in lines:
+            cv2.putText(layer, text, origin, FONT, scale, color, 2)
+            cv2.putText(mask, text, origin, FONT, scale, 255, 2)
+        self._hud_layer, self._hud_mask, self._hud_lines = layer, mask, lines
+        self.hud_redraws += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'detail_level': self.detail_level,
+            'frames_rendered': self.frames_rendered,
+            'frames_skipped': self.frames_skipped,
+            'hud_redraws': self.hud_redraws
+        }
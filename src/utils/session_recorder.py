@@ -0,0 +1,191 @@
+"""
+Asynchronous session recorder for AzimuthControl.
+
+Snapshots (JPEG/PNG) and annotated session video (cv2.VideoWriter) are
+encoded and written on a background thread so disk and encoder latency never
+stall frame processing. The main loop only enqueues frames into a bounded
+queue; when the writer falls behind, frames are dropped according to the
+backpressure policy instead of blocking, and every drop is counted.
+"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import cv2
+import numpy as np
+
+from ..performance.thread_budget import pin_current_thread
+
+DEFAULT_OUTPUT_DIR = Path(__file__).parent.parent.parent / "recordings"
+
+# Backpressure policies when the queue is full
+DROP_NEWEST = "drop_newest"  # Discard the frame being submitted
+DROP_OLDEST = "drop_oldest"  # Discard the oldest queued frame to make room
+
+_SNAPSHOT = "snapshot"
+_VIDEO_FRAME = "video"
+_STOP = object()
+
+
+class SessionRecorder:
+    """Bounded-queue writer thread for snapshots and annotated video."""
+
+    def __init__(self, output_dir: Optional[str] = None, queue_size: int = 32,
+                 drop_policy: str = DROP_NEWEST, video_fps: float = 30.0,
+                 video_fourcc: str = "mp4v", snapshot_format: str = "jpg"):
+        self.output_dir = Path(output_dir) if output_dir else DEFAULT_OUTPUT_DIR
+        self.drop_policy = drop_policy if drop_policy in (DROP_NEWEST, DROP_OLDEST) else DROP_NEWEST
+        self.video_fps = video_fps
+        self.video_fourcc = video_fourcc
+        self.snapshot_format = snapshot_format
+        self.session_name = time.strftime("session_%Y%m%d_%H%M%S")
+
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._writer = None
+        self._video_path = None
+        self._closed = False
+
+        self.stats = {
+            'snapshots_written': 0,
+            'video_frames_written': 0,
+            'dropped_snapshots': 0,
+            'dropped_video_frames': 0,
+            'write_errors': 0,
+            'write_time_ms': 0.0
+        }
+        self._lock = threading.Lock()  # Guards stats shared with the writer thread
+
+        self._thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self._thread.start()
+
+    # --- Producer side (main loop) ---
+
+    def snapshot(self, image: np.ndarray, name: Optional[str] = None) -> bool:
+        """
+        Queue a still image. The frame is not copied; the caller must not
+        modify it afterwards. Returns False if it was dropped.
+        """
+        name = name or f"{self.session_name}_{time.strftime('%H%M%S')}_{int(time.time() * 1000) % 1000:03d}"
+        return self._submit((_SNAPSHOT, image, name))
+
+    def write_frame(self, image: np.ndarray) -> bool:
+        """Queue a frame for the session video. Returns False if it was dropped."""
+        return self._submit((_VIDEO_FRAME, image, None))
+
+    def _submit(self, item) -> bool:
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+
+        if self.drop_policy == DROP_OLDEST:
+            try:
+                self._count_drop(self._queue.get_nowait()[0])
+                self._queue.put_nowait(item)
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+        self._count_drop(item[0])
+        return False
+
+    def _count_drop(self, kind: str):
+        key = 'dropped_snapshots' if kind == _SNAPSHOT else 'dropped_video_frames'
+        with self._lock:
+            self.stats[key] += 1
+
+    # --- Consumer side (writer thread) ---
+
+    def _run(self):
+        pin_current_thread()
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            kind, image, name = item
+            start = time.perf_counter()
+            try:
+                if kind == _SNAPSHOT:
+                    ok = self._write_snapshot(image, name)
+                else:
+                    ok = self._write_video_frame(image)
+            except (cv2.error, OSError) as e:
+                print(f"⚠️  Recorder write failed: {e}")
+                ok = False
+            with self._lock:
+                self.stats['write_time_ms'] += (time.perf_counter() - start) * 1000
+                if not ok:
+                    self.stats['write_errors'] += 1
+                elif kind == _SNAPSHOT:
+                    self.stats['snapshots_written'] += 1
+                else:
+                    self.stats['video_frames_written'] += 1
+        self._release_writer()
+
+    def _write_snapshot(self, image: np.ndarray, name: str) -> bool:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{name}.{self.snapshot_format}"
+        if not cv2.imwrite(str(path), image):
+            return False
+        print(f"📸 Snapshot saved to {path}")
+        return True
+
+    def _write_video_frame(self, image: np.ndarray) -> bool:
+        if self._writer is None:
+            # Opened lazily with the size of the first frame
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._video_path = self.output_dir / f"{self.session_name}.mp4"
+            height, width = image.shape[:2]
+            self._writer = cv2.VideoWriter(str(self._video_path), cv2.VideoWriter_fourcc(*self.video_fourcc),
+                                           self.video_fps, (width, height))
+            if not self._writer.isOpened():
+                print(f"⚠️  Could not open video writer for {self._video_path}")
+                return False
+            print(f"🎥 Recording session to {self._video_path}")
+        if not self._writer.isOpened():
+            return False
+        self._writer.write(image)
+        return True
+
+    def _release_writer(self):
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+    # --- Lifecycle and reporting ---
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        written = stats['snapshots_written'] + stats['video_frames_written']
+        stats['avg_write_ms'] = stats['write_time_ms'] / written if written else 0.0
+        stats['pending'] = self.pending()
+        stats['video_path'] = str(self._video_path) if self._video_path else None
+        return stats
+
+    def close(self, timeout: float = 5.0):
+        """Flush queued writes (up to timeout) and finalize the video file."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+            self._thread.join(timeout)
+        except queue.Full:
+            pass
+        if self._thread.is_alive():
+            print(f"⚠️  Recorder still writing after {timeout:.0f}s - {self.pending()} queued frame(s) abandoned")
+
+    def print_stats(self):
+        stats = self.get_stats()
+        print(f"🎞️  Recorder: {stats['snapshots_written']} snapshot(s), {stats['video_frames_written']} video frame(s) "
+              f"written | dropped {stats['dropped_snapshots']} snapshot(s), {stats['dropped_video_frames']} frame(s) "
+              f"| errors {stats['write_errors']} | {stats['avg_write_ms']:.1f}ms/write")
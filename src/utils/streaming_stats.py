@@ -0,0 +1,301 @@
+"""
+Streaming statistics for AzimuthControl.
+
+O(1)-update estimators for per-frame metrics, replacing np.mean/median over
+Python lists and deques that were rebuilt every frame:
+
+- RunningStats: count, mean, variance (Welford), min and max since start
+- EWMA: exponentially weighted mean, optionally warm-started with a cumulative mean
+- RollingMean: exact mean of the last N values (fixed ring buffer and running sum)
+- WindowedMinMax: exact min/max of the last N values (monotonic deques)
+- P2Quantile: running quantile estimate in constant memory (Jain & Chlamtac P-square)
+
+All update() methods take one float and return the current estimate.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+
+
+def ewma_weight(count: int, alpha: float) -> float:
+    """
+    Weight of the newest sample for a warm-started EWMA: 1/n (cumulative mean)
+    until that falls below alpha, then alpha.
+    """
+    return max(alpha, 1.0 / count) if count > 0 else 1.0
+
+
+class RunningStats:
+    """Welford running mean/variance plus min/max, over everything seen."""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value: float) -> float:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        return self.mean
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two values)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'count': self.count, 'mean': self.mean, 'std': self.std,
+                'min': self.min if self.count else None, 'max': self.max if self.count else None}
+
+
+class EWMA:
+    """
+    Exponentially weighted moving average. With warm_start the first samples
+    are averaged cumulatively so early estimates are not biased toward the
+    first value.
+    """
+
+    __slots__ = ('alpha', 'warm_start', 'value', 'count')
+
+    def __init__(self, alpha: float = 0.1, warm_start: bool = True, initial: Optional[float] = None):
+        self.alpha = alpha
+        self.warm_start = warm_start
+        self.value = initial
+        self.count = 0 if initial is None else 1
+
+    def reset(self):
+        self.value = None
+        self.count = 0
+
+    def update(self, value: float) -> float:
+        self.count += 1
+        if self.value is None:
+            self.value = value
+        else:
+            weight = ewma_weight(self.count, self.alpha) if self.warm_start else self.alpha
+            self.value += weight * (value - self.value)
+        return self.value
+
+
+class RollingMean:
+    """Exact mean of the last `window` values: a fixed ring buffer and a running sum."""
+
+    # Re-sum the buffer this often to cancel floating-point drift of the running sum
+    RESUM_INTERVAL = 4096
+
+    def __init__(self, window: int):
+        self.window = max(1, int(window))
+        self._buffer = np.zeros(self.window, dtype=np.float64)
+        self._next = 0
+        self._size = 0
+        self._sum = 0.0
+        self._updates = 0
+
+    def reset(self):
+        self._next = self._size = self._updates = 0
+        self._sum = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def update(self, value: float) -> float:
+        if self._size == self.window:
+            self._sum -= float(self._buffer[self._next])
+        else:
+            self._size += 1
+        self._buffer[self._next] = value
+        self._sum += value
+        self._next = (self._next + 1) % self.window
+
+        self._updates += 1
+        if self._updates % self.RESUM_INTERVAL == 0:
+            self._sum = float(self.values().sum())
+        return self.mean
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._size if self._size else 0.0
+
+    def peek(self, value: float) -> float:
+        """Mean the window would have after update(value), without storing value."""
+        if self._size == self.window:
+            return (self._sum - float(self._buffer[self._next]) + value) / self.window
+        return (self._sum + value) / (self._size + 1)
+
+    def values(self) -> np.ndarray:
+        """Values in the window, oldest first."""
+        if self._size < self.window:
+            return self._buffer[:self._size].copy()
+        return np.roll(self._buffer, -self._next)
+
+    def tail_mean(self, n: int) -> float:
+        """Mean of the most recent n values (O(n), for occasional analysis)."""
+        values = self.values()[-n:]
+        return float(values.mean()) if len(values) else 0.0
+
+
+class WindowedMinMax:
+    """Exact min and max of the last `window` values, amortized O(1) per update."""
+
+    def __init__(self, window: int):
+        self.window = max(1, int(window))
+        self._index = 0
+        self._min = deque()  # (index, value), values increasing
+        self._max = deque()  # (index, value), values decreasing
+
+    def reset(self):
+        self._index = 0
+        self._min.clear()
+        self._max.clear()
+
+    def update(self, value: float):
+        index = self._index
+        self._index += 1
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((index, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((index, value))
+
+        expired = index - self.window
+        if self._min[0][0] <= expired:
+            self._min.popleft()
+        if self._max[0][0] <= expired:
+            self._max.popleft()
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max[0][1] if self._max else None
+
+
+class P2Quantile:
+    """
+    P-square running quantile estimate (Jain & Chlamtac, 1985): five markers,
+    no stored samples. Exact for the first five values.
+    """
+
+    def __init__(self, quantile: float = 0.5):
+        self.quantile = quantile
+        self.reset()
+
+    def reset(self):
+        q = self.quantile
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def update(self, value: float) -> float:
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return self.value
+
+        # Find the cell the value falls in, extending the extremes if needed
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the three middle markers toward their desired positions
+        for i in range(1, 4):
+            offset = self._desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+               (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+        return self.value
+
+    def _parabolic(self, i: int, step: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            # Exact quantile of the few samples seen so far (nearest rank)
+            rank = min(len(self._heights) - 1, max(0, math.ceil(self.quantile * len(self._heights)) - 1))
+            return self._heights[rank]
+        return self._heights[2]
+
+
+class WindowedStats:
+    """Rolling mean and min/max over the last `window` values, plus session-wide Welford stats."""
+
+    def __init__(self, window: int):
+        self.rolling = RollingMean(window)
+        self.extremes = WindowedMinMax(window)
+        self.session = RunningStats()
+
+    def reset(self):
+        self.rolling.reset()
+        self.extremes.reset()
+        self.session.reset()
+
+    def update(self, value: float) -> float:
+        self.extremes.update(value)
+        self.session.update(value)
+        return self.rolling.update(value)
+
+    def __len__(self) -> int:
+        return len(self.rolling)
+
+    @property
+    def mean(self) -> float:
+        return self.rolling.mean
+
+    @property
+    def max(self) -> Optional[float]:
+        return self.extremes.max
+
+    @property
+    def min(self) -> Optional[float]:
+        return self.extremes.min
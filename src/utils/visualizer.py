@@ -1,6 +1,5 @@
 import cv2
 import sys
-import mediapipe as mp
 from pathlib import Path
 
 # Handle both relative and absolute imports
@@ -0,0 +1,25 @@
+"""AllocationTracker must leave tracemalloc as it found it."""
+
+import tracemalloc
+
+from src.performance.allocation_tracker import AllocationTracker
+
+
+def test_stop_ends_tracing_it_started():
+    assert not tracemalloc.is_tracing()
+    tracker = AllocationTracker(enabled=True)
+    assert tracemalloc.is_tracing()
+    tracker.stop()
+    assert not tracemalloc.is_tracing()
+
+
+def test_stop_keeps_tracing_started_elsewhere():
+    tracemalloc.start()
+    try:
+        tracker = AllocationTracker(enabled=True)
+        tracker.mark("stage")
+        tracker.end_frame()
+        tracker.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,63 @@
+"""Replay a generated recording through the capture backend layer."""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.capture.backends import FileCameraBackend, open_camera
+
+FRAME_COUNT = 12
+WIDTH, HEIGHT = 160, 120
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = str(tmp_path / "replay.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (WIDTH, HEIGHT))
+    if not writer.isOpened():
+        pytest.skip("OpenCV build cannot write MJPG video")
+    for i in range(FRAME_COUNT):
+        frame = np.full((HEIGHT, WIDTH, 3), i * 20, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def test_replay_delivers_every_frame_then_eof(recording):
+    cap = open_camera(0, 1280, 720, replay_source=recording)
+    assert isinstance(cap, FileCameraBackend)
+    assert cap.isOpened()
+    assert (cap.mode.width, cap.mode.height) == (WIDTH, HEIGHT)
+    assert cap.mode.fps == pytest.approx(30.0)
+
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+
+    assert len(frames) == FRAME_COUNT
+    assert frames[0].shape == (HEIGHT, WIDTH, 3)
+    # Frames come back in recording order (brightness ramps up)
+    means = [frame.mean() for frame in frames]
+    assert means == sorted(means)
+
+    # EOF is sticky without loop
+    ret, frame = cap.read()
+    assert not ret
+    cap.release()
+    assert not cap.isOpened()
+    assert cap.read() == (False, None)
+
+
+def test_looped_replay_restarts_at_eof(recording):
+    cap = open_camera(0, 1280, 720, replay_source=recording, loop=True)
+    for _ in range(FRAME_COUNT * 2 + 1):
+        ret, frame = cap.read()
+        assert ret and frame is not None
+    cap.release()
+
+
+def test_missing_recording_returns_none(tmp_path):
+    assert open_camera(0, 1280, 720, replay_source=str(tmp_path / "missing.avi")) is None
@@ -0,0 +1,15 @@
+"""Two-process latency test for the shared-memory gesture channel."""
+
+from src.core.gesture_channel import run_latency_benchmark
+
+
+def test_latency_benchmark_sees_every_update(tmp_path):
+    # Sleeping reader at 100Hz so writer and reader don't fight over a single core
+    result = run_latency_benchmark(rate_hz=100.0, duration=1.0, spin=False,
+                                   path=tmp_path / "gesture_channel")
+
+    assert result['updates_seen'] > 0
+    assert result['updates_missed'] == 0
+    # Generous bounds that still catch a stalled reader
+    assert result['latency_p99_us'] < 20000
+    assert result['latency_max_us'] < 100000
@@ -0,0 +1,83 @@
+"""Streaming statistics checked against numpy on the same samples."""
+
+import numpy as np
+import pytest
+
+from src.utils.streaming_stats import P2Quantile, RollingMean, RunningStats, WindowedMinMax
+
+
+@pytest.fixture
+def samples():
+    return np.random.default_rng(1234).normal(10.0, 3.0, size=5000)
+
+
+@pytest.mark.parametrize("window", [1, 7, 64])
+def test_rolling_mean_matches_window_slice(samples, window):
+    rolling = RollingMean(window)
+    for i, value in enumerate(samples[:500]):
+        mean = rolling.update(value)
+        expected = samples[max(0, i + 1 - window):i + 1]
+        assert mean == pytest.approx(expected.mean(), rel=1e-12, abs=1e-12)
+        np.testing.assert_allclose(rolling.values(), expected)
+
+
+def test_rolling_mean_peek_does_not_store(samples):
+    rolling = RollingMean(8)
+    for value in samples[:20]:
+        rolling.update(value)
+    before = rolling.values()
+    peeked = rolling.peek(100.0)
+    np.testing.assert_array_equal(rolling.values(), before)
+    assert peeked == pytest.approx(np.append(before[1:], 100.0).mean())
+
+
+def test_rolling_mean_resum_keeps_exact_mean(samples):
+    rolling = RollingMean(16)
+    for value in np.tile(samples, 2):  # Crosses RESUM_INTERVAL more than once
+        rolling.update(value)
+    assert rolling.mean == pytest.approx(np.tile(samples, 2)[-16:].mean(), rel=1e-12)
+
+
+@pytest.mark.parametrize("window", [1, 5, 50])
+def test_windowed_min_max_matches_window_slice(samples, window):
+    extremes = WindowedMinMax(window)
+    for i, value in enumerate(samples[:500]):
+        extremes.update(value)
+        expected = samples[max(0, i + 1 - window):i + 1]
+        assert extremes.min == expected.min()
+        assert extremes.max == expected.max()
+
+
+def test_running_stats_matches_numpy(samples):
+    stats = RunningStats()
+    for value in samples:
+        stats.update(value)
+    assert stats.count == len(samples)
+    assert stats.mean == pytest.approx(samples.mean(), rel=1e-12)
+    assert stats.variance == pytest.approx(np.var(samples, ddof=1), rel=1e-9)
+    assert stats.std == pytest.approx(np.std(samples, ddof=1), rel=1e-9)
+    assert (stats.min, stats.max) == (samples.min(), samples.max())
+
+
+def test_running_stats_variance_needs_two_values():
+    stats = RunningStats()
+    assert stats.variance == 0.0
+    stats.update(5.0)
+    assert stats.variance == 0.0
+
+
+@pytest.mark.parametrize("quantile", [0.5, 0.9, 0.99])
+def test_p2_quantile_tracks_numpy(samples, quantile):
+    estimator = P2Quantile(quantile)
+    for value in samples:
+        estimator.update(value)
+    # P-square is an estimate: allow a small fraction of the spread
+    assert estimator.value == pytest.approx(np.quantile(samples, quantile), abs=0.05 * samples.std())
+
+
+def test_p2_quantile_exact_for_first_values():
+    estimator = P2Quantile(0.5)
+    assert estimator.value is None
+    for value in (3.0, 1.0, 2.0):
+        estimator.update(value)
+    assert estimator.value == 2.0